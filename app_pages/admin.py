@@ -0,0 +1,4 @@
+"""Admin page (signed-in users in auth.ADMIN_USERS)."""
+from fnf.admin import admin_dashboard
+
+admin_dashboard()
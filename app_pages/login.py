@@ -0,0 +1,4 @@
+"""Login page (shown until a user signs in)."""
+from fnf.auth import login
+
+login()
@@ -0,0 +1,4 @@
+"""Payroll Team page."""
+from fnf.payroll import payroll_dashboard
+
+payroll_dashboard()
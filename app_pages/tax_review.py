@@ -0,0 +1,4 @@
+"""Tax Team page."""
+from fnf.tax_review import tax_review_dashboard_updated
+
+tax_review_dashboard_updated()
@@ -0,0 +1,119 @@
+"""
+Cold-start budget for the login page.
+
+Starts a fresh interpreter (nothing imported yet), renders the app once with Streamlit's
+AppTest - the same script run a new server does for the first visitor - and reports:
+  - time to first paint of login()
+  - an import-time profile (python -X importtime) of the modules that run imported
+Exits 1 if first paint is over budget or a lazily loaded dependency was imported.
+
+    python benchmarks/cold_start.py [--budget-ms 1000] [--top 15] [--json cold_start.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies that must stay off the login path (imported on first use).
+# numpy/PIL stay off because the logo is an <img> from fnf.assets, not st.image.
+# The check is per module: a bare `import streamlit` already loads plotly and PIL._version, so
+# those are reported as preloaded, and any further plotly / PIL module the app pulls in still fails.
+LAZY_MODULES = ['plotly', 'gspread', 'google.oauth2', 'pandas', 'numpy', 'PIL']
+
+CHILD = r"""
+import json, sys, time
+lazy = json.loads(sys.argv[1])
+import streamlit
+before = set(sys.modules)   # taken before streamlit.testing, which must not hide what the app imports
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("dashboard.py", default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+first_paint_ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({
+    'first_paint_ms': first_paint_ms,
+    'exception': [str(e.value) for e in at.exception],
+    'login_rendered': any(b.label == "🚀 Login to System" for b in at.button),
+    'imported': sorted(set(sys.modules) - before),
+    'preloaded_lazy': sorted(m for m in before for l in lazy if m == l or m.startswith(l + '.')),
+}))
+"""
+
+def parse_importtime(stderr: str) -> dict:
+    """'import time: self | cumulative | name' lines -> {name: (self_us, cumulative_us)}"""
+    profile = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        profile[name] = (int(self_us), int(cumulative_us))
+    return profile
+
+# Data files the app creates on first run; removed again if the measurement created them
+APP_DATA_FILES = ['users.json', 'fnf_submissions.json']
+
+def measure() -> dict:
+    """Run the child once in a fresh interpreter"""
+    created = [f for f in APP_DATA_FILES if not os.path.exists(os.path.join(REPO_ROOT, f))]
+    try:
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD, json.dumps(LAZY_MODULES)],
+                              cwd=REPO_ROOT, capture_output=True, text=True)
+    finally:
+        for f in created:
+            if os.path.exists(os.path.join(REPO_ROOT, f)):
+                os.remove(os.path.join(REPO_ROOT, f))
+    if proc.returncode != 0:
+        raise RuntimeError(f"cold start run failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    profile = parse_importtime(proc.stderr)
+    imported = set(result['imported'])
+    result['profile'] = {name: times for name, times in profile.items() if name in imported}
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=1000.0, help="max time to first paint of login()")
+    parser.add_argument('--top', type=int, default=15, help="imports to list, by cumulative time")
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args()
+
+    result = measure()
+    lazy_loaded = sorted({m for m in result['imported'] for lazy in LAZY_MODULES
+                          if m == lazy or m.startswith(lazy + '.')})
+    top_level = {name: t for name, t in result['profile'].items() if '.' not in name}
+
+    print(f"First paint of login(): {result['first_paint_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"Modules imported by the run: {len(result['imported'])}")
+    if result['preloaded_lazy']:
+        preloaded = sorted({m.split('.')[0] for m in result['preloaded_lazy']})
+        print(f"Already loaded by `import streamlit` (only further submodules are checked): {', '.join(preloaded)}")
+    print(f"\nTop {args.top} top-level imports by cumulative time:")
+    for name, (self_us, cumulative_us) in sorted(top_level.items(), key=lambda kv: -kv[1][1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    failures = []
+    if result['exception']:
+        failures.append(f"app raised: {result['exception']}")
+    if not result['login_rendered']:
+        failures.append("login page did not render")
+    if result['first_paint_ms'] > args.budget_ms:
+        failures.append(f"first paint {result['first_paint_ms']:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    if lazy_loaded:
+        failures.append(f"lazily loaded modules imported on the login path: {', '.join(lazy_loaded[:10])}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({**result, 'budget_ms': args.budget_ms, 'lazy_loaded': lazy_loaded, 'failures': failures}, f, indent=2)
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: within cold-start budget")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Offline stand-in for the Google Sheets client, for benchmarks and load tests.
+
+install(records) makes employees._fetch_employee_data() read `records` (a list of row dicts, as
+gspread's get_all_records() returns) through its normal Sheets path: st.secrets is given a
+service account via .streamlit/secrets.toml in the working directory, and _google_sheets_client()
+returns this module's (gspread, Credentials) pair. install_master(rows) serves a synthetic master
+from workload.py. Each Sheets call can be given a latency to mimic the network. No Google libraries
+are imported.
+"""
+import os
+import time
+
+SECRETS_TOML = """[gcp_service_account]
+type = "service_account"
+project_id = "fnf-offline"
+client_email = "fnf-offline@example.invalid"
+spreadsheet_id = "offline-employee-master"
+worksheet_name = "Employee Master"
+"""
+
+class Credentials:
+    @classmethod
+    def from_service_account_info(cls, info, scopes=None):
+        return cls()
+
+class Worksheet:
+    def __init__(self, sheets, title):
+        self._sheets = sheets
+        self.title = title
+
+    def get_all_records(self):
+        self._sheets.wait()
+        return [dict(r) for r in self._sheets.records]
+
+class Spreadsheet:
+    def __init__(self, sheets):
+        self._sheets = sheets
+
+    def worksheet(self, title):
+        self._sheets.wait()
+        return Worksheet(self._sheets, title)
+
+    def get_worksheet_by_id(self, gid):
+        self._sheets.wait()
+        return Worksheet(self._sheets, f"gid {gid}")
+
+class FakeSheets:
+    """The gspread module surface employees.py uses: authorize(creds).open_by_key(id).worksheet(name)"""
+
+    def __init__(self, records, latency_ms=0.0):
+        self.records = records
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def wait(self):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def authorize(self, creds):
+        self.wait()
+        return self
+
+    def open_by_key(self, key):
+        self.wait()
+        return Spreadsheet(self)
+
+def write_secrets(directory="."):
+    """Service-account secrets for the fake client; call before streamlit is first imported"""
+    os.makedirs(os.path.join(directory, ".streamlit"), exist_ok=True)
+    with open(os.path.join(directory, ".streamlit", "secrets.toml"), "w") as f:
+        f.write(SECRETS_TOML)
+
+def install(records, latency_ms=0.0) -> FakeSheets:
+    """Route Employee Master loads to a FakeSheets over records (clears the cached master)"""
+    from fnf import employees
+
+    sheets = FakeSheets(records, latency_ms)
+    employees._google_sheets_client = lambda: (sheets, Credentials)
+    employees.clear_employee_data_cache()
+    return sheets
+
+def install_master(rows: int, seed: int = None, latency_ms=0.0) -> FakeSheets:
+    """install() a synthetic Employee Master of `rows` employees (workload.employee_master)"""
+    import workload
+
+    frame = workload.employee_master(rows, workload.SEED if seed is None else seed)
+    return install(workload.sheets_records(frame), latency_ms)
@@ -0,0 +1,214 @@
+"""
+Benchmarks of the calculation and persistence hot paths, compared against a stored baseline.
+
+Runs offline in a scratch directory on synthetic data (benchmarks/workload.py): the Employee
+Master comes from the fake Sheets client (benchmarks/fake_sheets.py) and the submission store is
+written there, never to the repo.
+Each case is timed --repeat times and compared on its fastest run, which is the least noisy;
+the run fails (exit 1) if any case is more than --threshold percent slower than the baseline.
+
+Baselines are only comparable on the same machine and Python, so none is committed: record one
+on the commit you compare against, then run the change on the same machine.
+
+    git checkout main && python benchmarks/hot_paths.py --save-baseline    # -> .benchmarks/hot_paths.json
+    git checkout my-branch && python benchmarks/hot_paths.py               # compare against it
+    python benchmarks/hot_paths.py --only 'store.*' --sizes 100,10000 --json hot_paths.json
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import workload
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(REPO_ROOT, ".benchmarks", "hot_paths.json")   # per machine, git-ignored
+STORE_SIZES = [100, 10_000, 100_000]
+CALLS = 2000                # calls per run of the per-call cases
+
+# ====== Cases ======
+
+def calc_cases(rng: random.Random) -> dict:
+    """{name: (run, items)}: each run makes CALLS calls of one per-employee function"""
+    from fnf import calc, employees, tax
+
+    incomes = [rng.uniform(0, 5_000_000) for _ in range(CALLS)]
+    epf_args = [(rng.uniform(8_000, 120_000), rng.randint(0, 22), 22,
+                 rng.choice([None, {'applicable': True, 'capped': True, 'rate': 0.12, 'cap_wage': 15000,
+                                    'wages': None, 'fixed_full_month_epf': None},
+                             {'applicable': True, 'capped': None, 'rate': 0.12, 'cap_wage': 15000,
+                              'wages': None, 'fixed_full_month_epf': 1800.0}]))
+                for _ in range(CALLS)]
+    master = employees.normalize_employee_master(workload.employee_master(CALLS))
+    epf_cols = employees.detect_epf_fixed_columns(master.columns)
+    rows = [row for _, row in master.iterrows()]
+    months = [(rng.choice(workload.MONTH_NAMES), rng.randint(2020, 2026), ["2025-01-26", "2025-08-15", "2025-10-02"])
+              for _ in range(CALLS)]
+    tenures = [(datetime(2000, 1, 1) + timedelta(days=rng.randrange(9000)),
+                datetime(2025, 1, 1) + timedelta(days=rng.randrange(365))) for _ in range(CALLS)]
+    subs = workload.submissions(CALLS)
+    regimes = [rng.choice(["Old Tax Regime", "New Tax Regime"]) for _ in range(CALLS)]
+
+    return {
+        'tds_old_from_total_income': (lambda: [calc.tds_old_from_total_income(x) for x in incomes], CALLS),
+        'tds_new_from_total_income': (lambda: [calc.tds_new_from_total_income(x) for x in incomes], CALLS),
+        'calculate_epf_prorated': (lambda: [calc.calculate_epf_prorated(*a) for a in epf_args], CALLS),
+        'extract_epf_profile': (lambda: [employees.extract_epf_profile(r, all_cols=epf_cols) for r in rows], CALLS),
+        'get_total_working_days': (lambda: [calc.get_total_working_days(*m) for m in months], CALLS),
+        'years_for_gratuity': (lambda: [calc.years_for_gratuity(*t) for t in tenures], CALLS),
+        'recompute_tax_updated': (lambda: [tax.recompute_tax_updated(s, {}, r) for s, r in zip(subs, regimes)], CALLS),
+    }
+
+def store_cases(sizes) -> dict:
+    """save_fnf_data / load_fnf_data over stores of each size (one submission changed per save)"""
+    import streamlit as st
+    from fnf import storage
+
+    fixture = {}
+
+    def store(n):
+        """The n-submission store in session_state (built on first use; one size kept at a time)"""
+        if n not in fixture:
+            fixture.clear()
+            fixture[n] = workload.submissions(n)
+            st.session_state.fnf_submissions = fixture[n]
+            storage.mark_fnf_submissions_changed()
+        return fixture[n]
+
+    def save(n):
+        changed = store(n)[n // 2]
+        changed['status'] = "Payment Processed" if changed['status'] != "Payment Processed" else "Tax Approved"
+        return lambda: storage.save_fnf_data(changed)
+
+    def load(n):
+        save(n)()    # the file must hold this store; the save isn't timed
+        return storage.load_fnf_data
+
+    cases = {}
+    for n in sizes:
+        cases[f'store.save_fnf_data[{n}]'] = (lambda n=n: save(n), n)
+        cases[f'store.load_fnf_data[{n}]'] = (lambda n=n: load(n), n)
+    return cases
+
+def sheets_cases(sizes) -> dict:
+    """Employee Master load through the fake Sheets client (cache cleared before every run)"""
+    import fake_sheets
+    from fnf import employees
+
+    def load(n):
+        fake_sheets.install_master(n)
+        return employees.load_employee_data
+
+    return {f'sheets.load_employee_data[{n}]': (lambda n=n: load(n), n) for n in sizes}
+
+def time_case(run, repeat: int, warmup: bool = True) -> list:
+    """Wall time (ms) of each run; a run returning a callable is setup, and the callable is timed"""
+    times = []
+    for i in range(-1 if warmup else 0, repeat):
+        start = time.perf_counter()
+        timed = run()
+        if callable(timed):
+            start = time.perf_counter()
+            timed()
+        if i >= 0:
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+# ====== Baseline ======
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Cases more than threshold percent slower (fastest run) than the baseline"""
+    failures = []
+    for name, r in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base and r['min_ms'] > base['min_ms'] * (1 + threshold / 100):
+            failures.append(f"{name}: {r['min_ms']:.2f} ms vs baseline {base['min_ms']:.2f} ms "
+                            f"(+{(r['min_ms'] / base['min_ms'] - 1) * 100:.0f}%, limit +{threshold:.0f}%)")
+    return failures
+
+def environment() -> dict:
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'node': platform.node(),
+            'recorded_at': datetime.now().isoformat(timespec='seconds')}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="runs per case (a third of that for 100k+ items)")
+    parser.add_argument('--sizes', default=",".join(map(str, STORE_SIZES)), help="store / master sizes")
+    parser.add_argument('--only', help="glob of case names to run, e.g. 'store.*' or 'tds_*'")
+    parser.add_argument('--threshold', type=float, default=20.0, help="allowed slowdown vs baseline, percent")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON to compare with / save to")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    baseline_path = os.path.abspath(args.baseline)
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    # Scratch directory: the store and secrets live here; streamlit reads secrets from the cwd on import
+    workdir = tempfile.mkdtemp(prefix="fnf_bench_")
+    os.chdir(workdir)
+    sys.path[:0] = [REPO_ROOT, os.path.dirname(os.path.abspath(__file__))]
+    import fake_sheets
+    workload.quiet_bare_streamlit()
+    fake_sheets.write_secrets(workdir)
+
+    cases = {**calc_cases(random.Random(workload.SEED)), **store_cases(sizes), **sheets_cases(sizes)}
+    if args.only:
+        cases = {name: case for name, case in cases.items() if fnmatch.fnmatch(name, args.only)}
+
+    results = {}
+    print(f"{'case':<40} {'items':>8} {'min ms':>10} {'median ms':>10} {'us/item':>9}")
+    try:
+        for name, (run, items) in cases.items():
+            large = items >= 100_000   # one-off runs of seconds each: no warm-up, fewer repeats
+            times = time_case(run, max(1, args.repeat // 3) if large else args.repeat, warmup=not large)
+            results[name] = {'items': items, 'runs': len(times), 'min_ms': round(min(times), 3),
+                             'median_ms': round(statistics.median(times), 3)}
+            print(f"{name:<40} {items:>8} {min(times):>10.2f} {statistics.median(times):>10.2f} "
+                  f"{min(times) * 1000 / items:>9.2f}")
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {'environment': environment(), 'results': results}
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print()
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        saved = {}
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                saved = json.load(f).get('results', {})
+        with open(baseline_path, 'w') as f:
+            json.dump({'environment': report['environment'], 'results': {**saved, **results}}, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        sys.exit(0)
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; record one with --save-baseline (on the commit to compare against)")
+        sys.exit(0)
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    env = baseline.get('environment', {})
+    if (env.get('python'), env.get('machine')) != (report['environment']['python'], report['environment']['machine']):
+        print(f"NOTE: baseline was recorded on Python {env.get('python')} / {env.get('machine')}")
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"OK: no case more than {args.threshold:.0f}% slower than the baseline")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+"""
+Multi-session load test: concurrent Payroll and Tax Team users driving the real app through AppTest.
+
+Each simulated session is its own AppTest of dashboard.py (its own session_state) on its own
+thread, all in one process - as a Streamlit server runs one script thread per browser session and
+shares the process, its imports and caches between them. Sessions alternate between the roles:
+  - Payroll: log in, then per flow: search an employee, select months, calculate, send to tax
+  - Tax Team: log in, then per flow: open a pending submission's review, approve it
+Every step is one rerun through main(), timed end to end. It runs offline in a scratch directory:
+the Employee Master comes from the fake Sheets client (benchmarks/fake_sheets.py) and the
+submission store is seeded from benchmarks/workload.py.
+
+Reported: rerun latency percentiles per step, memory per session (growth of the process RSS over
+the sessions, divided by their number), throughput, and whether every send / approval is still in
+fnf_submissions.json at the end. Exits 1 if a session failed, the store was left unreadable, or
+--compare is given and the median rerun or the throughput is more than --threshold percent worse
+than that earlier run.
+
+    python benchmarks/load_test.py [--sessions 4] [--iterations 3] [--json load_test.json]
+    python benchmarks/load_test.py --sessions 16 --sheets-latency-ms 150 --compare load_test.json
+
+Results are only comparable with the same options on the same machine and Python; the JSON
+records both, and the commit, for that.
+"""
+import argparse
+import gc
+import hashlib
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from datetime import datetime
+
+import workload
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "LoadTest#2026"          # every user's password in the scratch users.json
+MONTHS_LABEL = "🗓️ Select months to include in F&F settlement:"
+SENT_STATUSES = {'Under Tax Review', 'Tax Approved', 'Tax Rejected', 'Payment Processed'}
+APPROVED_STATUSES = {'Tax Approved', 'Payment Processed'}
+SUMMARY_STEPS = ['open', 'login', 'search_employee', 'select_months', 'calculate', 'send_to_tax',
+                 'tax_review', 'approve']
+
+class FlowError(Exception):
+    """A step didn't reach the state the real flow would"""
+
+# ====== Scratch directory ======
+
+def write_users(path="users.json"):
+    """Every REAL_USERS account with PASSWORD already set, so login skips the first-time setup"""
+    from fnf.auth import REAL_USERS
+
+    pw_hash = hashlib.sha256(PASSWORD.encode("utf-8")).hexdigest()
+    users = {name: {"role": role, "password_hash": pw_hash, "must_change_password": False,
+                    "password_updated_at": None, "created_at": datetime.now().isoformat()}
+             for name, role in REAL_USERS.items()}
+    with open(path, "w") as f:
+        json.dump(users, f, indent=2)
+    return {role: [name for name, r in REAL_USERS.items() if r == role] for role in set(REAL_USERS.values())}
+
+# ====== Flows ======
+
+def _button(at, label):
+    for b in at.button:
+        if b.label == label:
+            return b
+    raise FlowError(f"no '{label}' button")
+
+def _submission(at, employee_id):
+    for s in at.session_state['fnf_submissions']:
+        if str(s.get('employee_id')) == str(employee_id):
+            return s
+    return None
+
+def login(at, step, username):
+    step('open', at.run)
+    at.text_input(key="auth_username").input(username)
+    at.text_input(key="auth_password").input(PASSWORD)
+    step('login', _button(at, "🚀 Login to System").click().run)
+    if 'role' not in at.session_state:
+        raise FlowError(f"login as {username} failed")
+
+def payroll_flow(at, step, employee_id: int, months: list):
+    step('search_employee', at.text_input(key="fnf_employee_query").input(str(employee_id)).run)
+    chosen = [s.value for s in at.selectbox if s.label == "Choose Employee"]
+    if not chosen or not str(chosen[0]).startswith(f"{employee_id} - "):
+        raise FlowError(f"employee {employee_id} not found (got {chosen[:1]})")
+    step('select_months', [m for m in at.multiselect if m.label == MONTHS_LABEL][0].set_value(months).run)
+    step('calculate', _button(at, "🧮 Calculate Payroll F&F").click().run)
+    step('send_to_tax', _button(at, "📤 Send to Tax Team").click().run)
+    submission = _submission(at, employee_id)
+    if not submission or submission['status'] != 'Under Tax Review':
+        raise FlowError(f"employee {employee_id} not sent to tax ({submission and submission['status']})")
+
+def tax_flow(at, step, pick: int) -> str:
+    """Approve the pick-th submission (mod the page) of the tax queue; returns its employee ID"""
+    queue = [b for b in at.button if (b.key or '').startswith("tax_open_")]
+    if not queue:
+        raise FlowError("no submission pending tax review")
+    button = queue[pick % len(queue)]
+    sid = button.key[len("tax_open_"):]
+    step('tax_review', button.click().run)
+    at.selectbox(key=f"decision_{sid}").set_value("Approve")
+    step('approve', _button(at, "📋 Submit Tax Review").click().run)
+    submission = _submission(at, sid)
+    if not submission or submission['status'] != 'Tax Approved':
+        raise FlowError(f"submission {sid} not approved ({submission and submission['status']})")
+    return sid
+
+# ====== Sessions ======
+
+def share_apptest_globals():
+    """
+    Let AppTests run on several threads at once. Each run points Runtime._instance at a mock
+    runtime and patches the "global.appTest" option, then puts both back when it ends - under any
+    run still going on another thread. Hold the option on and keep serving the last runtime instead.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+
+    config.set_option("global.appTest", True)
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last['runtime'] = cls._instance
+            return cls._instance
+        if 'runtime' in last:
+            return last['runtime']
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or 'runtime' in last)
+
+def new_session(name: str, role: str, username: str, timeout: float) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    return {'name': name, 'role': role, 'username': username, 'steps': [], 'flows': 0,
+            'sent': [], 'approved': [], 'error': None,
+            'at': AppTest.from_file(os.path.join(REPO_ROOT, "dashboard.py"), default_timeout=timeout)}
+
+def run_session(session: dict, iterations: int, next_employee, pick: int, start: threading.Barrier = None):
+    """Log in and run `iterations` flows; a failure ends the session and is kept in session['error']"""
+    at = session['at']
+
+    def step(name, rerun):
+        began = time.perf_counter()
+        rerun()
+        session['steps'].append((name, (time.perf_counter() - began) * 1000))
+        if at.exception:
+            raise FlowError(f"{name}: {at.exception[0].value}")
+
+    try:
+        if start:
+            start.wait()
+        login(at, step, session['username'])
+        for i in range(iterations):
+            if session['role'] == 'Payroll Team':
+                employee_id = next_employee()
+                payroll_flow(at, step, employee_id, workload.MONTH_NAMES[i % 12:i % 12 + 2])
+                session['sent'].append(employee_id)
+            else:
+                session['approved'].append(tax_flow(at, step, pick))
+            session['flows'] += 1
+    except Exception as e:
+        session['error'] = f"{session['name']}: {e}" if isinstance(e, FlowError) else \
+            f"{session['name']}: {traceback.format_exc(limit=-3)}"
+
+def rss_mb() -> tuple:
+    """(current, peak) resident set size of this process in MB (current is the peak off Linux)"""
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(fields['VmRSS'].split()[0]) / 1024, int(fields['VmHWM'].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+        return peak, peak
+
+# ====== Report ======
+
+def summarize(samples: list) -> dict:
+    from fnf.monitoring import _percentile
+
+    ordered = sorted(samples)
+    return {'count': len(ordered), 'p50': round(_percentile(ordered, 50), 1), 'p90': round(_percentile(ordered, 90), 1),
+            'p99': round(_percentile(ordered, 99), 1), 'max': round(ordered[-1], 1)}
+
+def store_check(sessions: list) -> dict:
+    """Sends and approvals whose effect is missing from the final fnf_submissions.json (overwritten by another session's save)"""
+    sent = [str(e) for s in sessions for e in s['sent']]
+    approved = [str(e) for s in sessions for e in s['approved']]
+    try:
+        with open("fnf_submissions.json") as f:
+            final = {str(s.get('employee_id')): s.get('status') for s in json.load(f).get('submissions', [])}
+    except ValueError as e:
+        return {'corrupt': str(e), 'sent': len(sent), 'sent_lost': len(sent),
+                'approved': len(approved), 'approved_lost': len(approved)}
+    return {'corrupt': None, 'sent': len(sent), 'sent_lost': sum(final.get(e) not in SENT_STATUSES for e in sent),
+            'approved': len(approved), 'approved_lost': sum(final.get(e) not in APPROVED_STATUSES for e in approved)}
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+    except OSError:
+        commit, dirty = None, None
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'node': platform.node(),
+            'commit': commit, 'dirty': dirty, 'recorded_at': datetime.now().isoformat(timespec='seconds')}
+
+def compare(report: dict, previous: dict, threshold: float) -> list:
+    """Median rerun / throughput more than threshold percent worse than the previous run"""
+    failures = []
+    now, before = report['steps']['all'], previous.get('steps', {}).get('all')
+    if before and now['p50'] > before['p50'] * (1 + threshold / 100):
+        failures.append(f"median rerun {now['p50']:.0f} ms vs {before['p50']:.0f} ms "
+                        f"(+{(now['p50'] / before['p50'] - 1) * 100:.0f}%, limit +{threshold:.0f}%)")
+    now, before = report['throughput']['flows_per_s'], previous.get('throughput', {}).get('flows_per_s')
+    if before and now < before / (1 + threshold / 100):
+        failures.append(f"throughput {now:.2f} flows/s vs {before:.2f} flows/s "
+                        f"({(now / before - 1) * 100:.0f}%, limit -{threshold:.0f}%)")
+    return failures
+
+def print_report(report: dict, previous: dict = None):
+    print(f"{'step':<18} {'reruns':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+          + (f" {'prev p50':>9} {'prev p90':>9}" if previous else ""))
+    for name, s in report['steps'].items():
+        line = f"{name:<18} {s['count']:>7} {s['p50']:>9.1f} {s['p90']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.1f}"
+        if previous:
+            p = previous.get('steps', {}).get(name)
+            line += f" {p['p50']:>9.1f} {p['p90']:>9.1f}" if p else f" {'-':>9} {'-':>9}"
+        print(line)
+
+    t, m, p, st = report['throughput'], report['memory'], report['params'], report['store']
+    print(f"\nSessions: {p['sessions']} ({t['payroll_sessions']} payroll, {t['tax_sessions']} tax) x "
+          f"{p['iterations']} flows: {t['flows']} flows, {t['reruns']} reruns in {t['seconds']:.1f} s -> "
+          f"{t['flows_per_s']:.2f} flows/s, {t['reruns_per_s']:.1f} reruns/s")
+    print(f"Memory: {m['warm_mb']:.0f} MB after warm-up, +{m['per_session_mb']:.1f} MB per session "
+          f"(peak {m['peak_mb']:.0f} MB)")
+    print(f"Store: {st['sent'] - st['sent_lost']}/{st['sent']} sends and "
+          f"{st['approved'] - st['approved_lost']}/{st['approved']} approvals still in fnf_submissions.json")
+    if report['app_metrics']:
+        print("\nApp metrics (fnf.monitoring):")
+        for r in report['app_metrics']:
+            print(f"  {r['name']:<32} {r['count']:>6} calls  p50 {r['p50']:.1f} ms  p90 {r['p90']:.1f} ms  "
+                  f"max {r['max']:.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=4, help="concurrent sessions (alternately Payroll and Tax)")
+    parser.add_argument('--iterations', type=int, default=3, help="flows per session after login")
+    parser.add_argument('--employees', type=int, default=5000, help="Employee Master size")
+    parser.add_argument('--store', type=int, default=2000, help="submissions in the seeded store")
+    parser.add_argument('--sheets-latency-ms', type=float, default=0.0, help="delay per fake Sheets call")
+    parser.add_argument('--timeout', type=float, default=120.0, help="max seconds per rerun")
+    parser.add_argument('--no-warmup', action='store_true', help="include first-import costs in the timings")
+    parser.add_argument('--compare', help="earlier --json report to compare with")
+    parser.add_argument('--threshold', type=float, default=25.0, help="allowed regression vs --compare, percent")
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args()
+    if args.employees < args.store + args.sessions * args.iterations + 1:
+        parser.error("--employees must exceed --store by the payroll flows (one new employee per flow)")
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    # Scratch directory: secrets, users, store and logs live here; streamlit reads secrets from the cwd on import
+    workdir = tempfile.mkdtemp(prefix="fnf_load_")
+    os.chdir(workdir)
+    sys.path[:0] = [REPO_ROOT, os.path.dirname(os.path.abspath(__file__))]
+    import fake_sheets
+    fake_sheets.write_secrets(workdir)
+    workload.quiet_bare_streamlit()
+    share_apptest_globals()
+    try:
+        users = write_users()
+        workload.write_submission_store("fnf_submissions.json", args.store)
+        fake_sheets.install_master(args.employees, latency_ms=args.sheets_latency_ms)
+        from fnf import monitoring
+
+        ids = itertools.count(workload.FIRST_EMPLOYEE_ID + args.store)
+        ids_lock = threading.Lock()
+
+        def next_employee():
+            with ids_lock:
+                return next(ids)
+
+        if not args.no_warmup:
+            for role in ['Payroll Team', 'Tax Team']:
+                warm = new_session(f"warm-up {role}", role, users[role][0], args.timeout)
+                run_session(warm, 1, next_employee, 0)
+                if warm['error']:
+                    print(f"Warm-up failed: {warm['error']}")
+                    sys.exit(1)
+            del warm
+        monitoring.reset_metrics()
+        gc.collect()
+        warm_mb, _ = rss_mb()
+
+        roles = [['Payroll Team', 'Tax Team'][i % 2] for i in range(args.sessions)]
+        sessions = [new_session(f"session {i + 1}", role, users[role][i // 2 % len(users[role])], args.timeout)
+                    for i, role in enumerate(roles)]
+        start = threading.Barrier(args.sessions + 1)
+        threads = [threading.Thread(target=run_session, args=(s, args.iterations, next_employee, i // 2, start),
+                                    daemon=True) for i, s in enumerate(sessions)]
+        for t in threads:
+            t.start()
+        start.wait()
+        began = time.perf_counter()
+        for t in threads:
+            t.join()
+        seconds = time.perf_counter() - began
+        gc.collect()
+        end_mb, peak_mb = rss_mb()   # sessions (and their session_state) still alive here
+
+        steps = {}
+        for s in sessions:
+            for name, ms in s['steps']:
+                steps.setdefault(name, []).append(ms)
+        all_ms = [ms for samples in steps.values() for ms in samples]
+        ordered = [n for n in SUMMARY_STEPS if n in steps] + sorted(set(steps) - set(SUMMARY_STEPS))
+        flows = sum(s['flows'] for s in sessions)
+        report = {
+            'environment': environment(),
+            'params': {k: getattr(args, k) for k in ('sessions', 'iterations', 'employees', 'store',
+                                                      'sheets_latency_ms')},
+            'steps': {**{n: summarize(steps[n]) for n in ordered}, **({'all': summarize(all_ms)} if all_ms else {})},
+            'throughput': {'payroll_sessions': sum(s['role'] == 'Payroll Team' for s in sessions),
+                           'tax_sessions': sum(s['role'] == 'Tax Team' for s in sessions),
+                           'flows': flows, 'reruns': len(all_ms), 'seconds': round(seconds, 2),
+                           'flows_per_s': round(flows / seconds, 3), 'reruns_per_s': round(len(all_ms) / seconds, 2)},
+            'memory': {'warm_mb': round(warm_mb, 1), 'end_mb': round(end_mb, 1), 'peak_mb': round(peak_mb, 1),
+                       'per_session_mb': round(max(0.0, end_mb - warm_mb) / args.sessions, 2)},
+            'store': store_check(sessions),
+            'app_metrics': [{k: round(v, 1) if isinstance(v, float) else v for k, v in r.items()}
+                            for r in monitoring.latency_summary()],
+            'errors': [s['error'] for s in sessions if s['error']],
+        }
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if not report['steps']:
+        print("No rerun completed")
+    else:
+        print_report(report, previous)
+    print()
+    failures = [f"session error: {e}" for e in report['errors']]
+    if report['store']['corrupt']:
+        failures.append(f"fnf_submissions.json unreadable after the run: {report['store']['corrupt']}")
+    elif report['store']['sent_lost'] or report['store']['approved_lost']:
+        failures.append(f"concurrent saves lost {report['store']['sent_lost']} sends and "
+                        f"{report['store']['approved_lost']} approvals")
+    if previous:
+        env, prev_env = report['environment'], previous.get('environment', {})
+        if previous.get('params') != report['params'] or \
+                (prev_env.get('python'), prev_env.get('machine')) != (env['python'], env['machine']):
+            print(f"NOTE: compared run ({prev_env.get('commit')}) used {previous.get('params')} on Python "
+                  f"{prev_env.get('python')} / {prev_env.get('machine')}")
+        if report['steps']:
+            failures += compare(report, previous, args.threshold)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: all sessions completed" + (f", within {args.threshold:.0f}% of {prev_env.get('commit') or args.compare}"
+                                              if previous else ""))
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
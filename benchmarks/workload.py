@@ -0,0 +1,443 @@
+"""
+Seeded synthetic workloads at scale: Employee Master frames and F&F submission stores.
+
+The Employee Master comes out raw, as the Google Sheet or an HRMS CSV delivers it (all text), with
+the columns load_employee_data() uses, Date of Joining in mixed formats and a seeded layout of
+the EPF/PF column variants detect_epf_fixed_columns() and extract_epf_profile() read. Submissions
+are the dicts settlement.py saves for those same employees: 1-3 active months up to the last
+working day, a status mix that moves towards "Payment Processed" as exits age, and tax fields
+from tax.recompute_tax_batch() once the Tax Team has reviewed them.
+
+Rows are generated in CHUNK_ROWS blocks, each seeded from (seed, block number), so the same seed
+gives the same rows at any size, and the iter_/write_ functions stream 1M rows without building
+them all in memory.
+
+    python benchmarks/workload.py master --rows 1000000 --out employee_master.csv [--dirty 0.01]
+    python benchmarks/workload.py master --rows 50000 --out master.xlsx --format xlsx
+    python benchmarks/workload.py store --submissions 100000 --out fnf_submissions.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED = 49
+CHUNK_ROWS = 50_000
+FIRST_EMPLOYEE_ID = 10_001
+AS_OF = date(2026, 3, 31)         # default "today" of a workload, so a seed always gives the same data
+DOJ_FIRST = date(1998, 1, 1)
+HISTORY_DAYS = 730                # exits spread over the two years before AS_OF
+
+FIRST_NAMES = np.array([
+    "Aarav", "Aditi", "Akash", "Ananya", "Arjun", "Deepika", "Farhan", "Gaurav", "Ishita", "Karan",
+    "Kavya", "Manish", "Meera", "Neha", "Nikhil", "Pooja", "Rahul", "Riya", "Rohan", "Sanjay",
+    "Shreya", "Sneha", "Suresh", "Tanvi", "Varun", "Vikram", "Yash", "Zoya", "Imran", "Lakshmi",
+])
+LAST_NAMES = np.array([
+    "Sharma", "Verma", "Gupta", "Singh", "Iyer", "Nair", "Reddy", "Patel", "Mehta", "Khan",
+    "Das", "Bose", "Kapoor", "Malhotra", "Chopra", "Joshi", "Kulkarni", "Menon", "Pillai", "Rao",
+])
+DESIGNATIONS = (["Technical Trainer", "Senior Consultant", "Sales Executive", "Account Manager",
+                 "Software Engineer", "HR Executive", "Operations Manager", "Director"],
+                [0.25, 0.15, 0.2, 0.12, 0.12, 0.06, 0.07, 0.03])
+LOCATIONS = (["Delhi", "Gurgaon", "Noida", "Bangalore", "Chennai", "Pune", "Dubai"],
+             [0.3, 0.2, 0.1, 0.15, 0.1, 0.1, 0.05])
+PT_LOCATIONS = {"Bangalore": 200.0, "Chennai": 208.0, "Pune": 200.0}   # professional tax per month
+
+# Date of Joining shapes seen in the master, with their share of rows
+DOJ_FORMATS = (['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%y', '%Y-%m-%d %H:%M:%S'],
+               [0.45, 0.25, 0.1, 0.1, 0.1])
+BAD_DOJ = np.array(['', 'N/A', '31/02/2019', 'TBD', '2019/13/45'])
+
+# Column names a master may use for the full-month EPF (exact names and ones the fuzzy match finds)
+EPF_FIXED_VARIANTS = ['EPF Full Month', 'EPF Fixed', 'EPF Fixed Deduction', 'EPF', 'PF', 'PF Deduction',
+                      'EPF Deduction', 'Employee EPF', 'EPF Employee', 'PF Employee', 'Total EPF', 'EPF Amount',
+                      'EPF Per Month', 'Employee PF Contribution', 'PF Amount', 'PF Per Month',
+                      'Employee PF Amount', 'EPF Monthly', 'PF contribution (employee)', 'Emp EPF deduction']
+TRUE_TEXT = np.array(['Yes', 'Y', 'TRUE', '1', 'yes'])
+FALSE_TEXT = np.array(['No', 'N', 'FALSE', '0', 'no'])
+BASE_COLUMNS = ['Employee ID', 'Employee Name', 'Designation', 'BaseLocation', 'Date of Joining', 'Salary', 'PAN No.']
+
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+STATUSES = ['Draft', 'Pending Tax Review', 'Under Tax Review', 'Tax Approved', 'Tax Rejected', 'Payment Processed']
+RECENT_STATUS_MIX = [0.05, 0.25, 0.3, 0.2, 0.05, 0.15]    # exits in the last 45 days
+SETTLED_STATUS_MIX = [0.01, 0.03, 0.04, 0.07, 0.02, 0.83]  # older exits: mostly paid
+TAXED_STATUSES = {'Tax Approved', 'Tax Rejected', 'Payment Processed'}
+
+def epf_layout(seed: int = SEED) -> dict:
+    """The EPF/PF column names one master uses (fixed by the seed, like one company's sheet)"""
+    rng = np.random.default_rng([seed, 1_000_000])
+    return {
+        'fixed': [str(c) for c in rng.choice(EPF_FIXED_VARIANTS, size=2, replace=False)],
+        'applicable': str(rng.choice(['EPF Applicable', 'PF Applicable'])),
+        'capped': str(rng.choice(['EPF Capped', 'PF Capped'])),
+        'rate': str(rng.choice(['EPF Rate', 'PF Rate'])),
+        'wages': str(rng.choice(['EPF Wages', 'PF Wages'])),
+        'cap': 'PF Wage Cap',
+    }
+
+def master_columns(seed: int = SEED) -> list:
+    layout = epf_layout(seed)
+    return BASE_COLUMNS + layout['fixed'] + [layout[k] for k in ('applicable', 'capped', 'rate', 'wages', 'cap')]
+
+def _with_commas(values: np.ndarray) -> np.ndarray:
+    return np.array([f"{v:,}" for v in values.tolist()], dtype=object)
+
+def _employee_block(seed: int, block: int, as_of: date, dirty: float):
+    """(raw master rows, numeric facts the submissions are derived from) for one whole block"""
+    rng = np.random.default_rng([seed, block])
+    rows = CHUNK_ROWS
+    layout = epf_layout(seed)
+    ids = FIRST_EMPLOYEE_ID + block * CHUNK_ROWS + np.arange(rows)
+
+    doj = (np.datetime64(DOJ_FIRST) + rng.integers(0, (as_of - DOJ_FIRST).days - 120, rows)).astype('datetime64[D]')
+    doj_text = np.empty(rows, dtype=object)
+    fmt = rng.choice(len(DOJ_FORMATS[0]), size=rows, p=DOJ_FORMATS[1])
+    for i, f in enumerate(DOJ_FORMATS[0]):
+        hit = fmt == i
+        doj_text[hit] = pd.DatetimeIndex(doj[hit]).strftime(f).to_numpy()
+    bad = rng.random(rows) < 0.005
+    doj_text[bad] = rng.choice(BAD_DOJ, size=int(bad.sum()))
+
+    salary = np.clip(np.round(rng.lognormal(np.log(65_000), 0.6, rows), -2), 15_000, 1_000_000).astype(np.int64)
+    salary_text = salary.astype(str).astype(object)
+    commas = rng.random(rows) < 0.3
+    salary_text[commas] = _with_commas(salary[commas])
+
+    pan = rng.integers(65, 91, size=(rows, 10), dtype=np.uint8)
+    pan[:, 5:9] = rng.integers(48, 58, size=(rows, 4), dtype=np.uint8)
+    pan_text = pan.view('S10').ravel().astype(str)
+
+    # EPF: a fixed full-month amount in one of the fixed columns, or wage x rate (capped or not), or none
+    basic = salary / 3
+    mode = rng.choice(3, size=rows, p=[0.45, 0.4, 0.15])           # 0 fixed, 1 computed, 2 not applicable
+    capped = rng.random(rows) < 0.7
+    full_epf = np.where(capped, 0.12 * np.minimum(basic, 15_000), 0.12 * basic)
+    fixed_amount = np.where(rng.random(rows) < 0.6, 1800.0, np.round(0.12 * basic))
+    full_epf = np.where(mode == 0, fixed_amount, np.where(mode == 1, full_epf, 0.0))
+
+    frame = pd.DataFrame({
+        'Employee ID': ids.astype(str).astype(object),
+        'Employee Name': np.char.add(np.char.add(rng.choice(FIRST_NAMES, rows), ' '), rng.choice(LAST_NAMES, rows)).astype(object),
+        'Designation': rng.choice(DESIGNATIONS[0], rows, p=DESIGNATIONS[1]).astype(object),
+        'BaseLocation': rng.choice(LOCATIONS[0], rows, p=LOCATIONS[1]).astype(object),
+        'Date of Joining': doj_text,
+        'Salary': salary_text,
+        'PAN No.': pan_text.astype(object),
+    })
+    which_fixed = rng.integers(0, 2, rows)
+    fixed_text = fixed_amount.astype(np.int64).astype(str).astype(object)
+    fixed_commas = rng.random(rows) < 0.3
+    fixed_text[fixed_commas] = _with_commas(fixed_amount[fixed_commas].astype(np.int64))
+    for i, col in enumerate(layout['fixed']):
+        frame[col] = np.where((mode == 0) & (which_fixed == i), fixed_text, '')
+    frame[layout['applicable']] = np.where(mode == 2, rng.choice(FALSE_TEXT, rows), rng.choice(TRUE_TEXT, rows))
+    frame[layout['capped']] = np.where(mode == 1, np.where(capped, rng.choice(TRUE_TEXT, rows), rng.choice(FALSE_TEXT, rows)), '')
+    frame[layout['rate']] = np.where(mode == 1, rng.choice(['12', '0.12', ''], rows), '')
+    wages_text = np.round(basic).astype(np.int64).astype(str).astype(object)
+    frame[layout['wages']] = np.where((mode == 1) & (rng.random(rows) < 0.3), wages_text, '')
+    frame[layout['cap']] = np.where((mode == 1) & capped & (rng.random(rows) < 0.5), '15,000', '')
+
+    if dirty:
+        _add_dirty_rows(frame, rng, dirty)
+    facts = {'ids': ids, 'doj': doj, 'salary': salary.astype(float), 'full_epf': full_epf,
+             'name': frame['Employee Name'].to_numpy(), 'designation': frame['Designation'].to_numpy(),
+             'location': frame['BaseLocation'].to_numpy(), 'doj_text': doj_text}
+    return frame, facts
+
+def _add_dirty_rows(frame: pd.DataFrame, rng, share: float):
+    """Rows a bulk import must reject: blank/text/duplicate IDs, blank names, blank/negative salaries"""
+    rows = rng.choice(len(frame), size=int(len(frame) * share), replace=False)
+    kinds = rng.integers(0, 6, len(rows))
+    for row, kind in zip(rows.tolist(), kinds.tolist()):
+        if kind == 0:
+            frame.iat[row, 0] = ''
+        elif kind == 1:
+            frame.iat[row, 0] = f"EMP-{frame.iat[row, 0]}"
+        elif kind == 2:
+            frame.iat[row, 0] = frame.iat[row - 1, 0] if row else frame.iat[row + 1, 0]
+        elif kind == 3:
+            frame.iat[row, 1] = ''
+        elif kind == 4:
+            frame.iat[row, 5] = ''
+        else:
+            frame.iat[row, 5] = f"-{frame.iat[row, 5]}"
+
+def _blocks(rows: int):
+    """(block number, rows wanted from it); blocks are always generated whole, then cut"""
+    for block in range((rows + CHUNK_ROWS - 1) // CHUNK_ROWS):
+        yield block, min(CHUNK_ROWS, rows - block * CHUNK_ROWS)
+
+def iter_employee_master(rows: int, seed: int = SEED, dirty: float = 0.0, as_of: date = AS_OF):
+    """Employee Master blocks of up to CHUNK_ROWS rows (raw text columns)"""
+    for block, n in _blocks(rows):
+        yield _employee_block(seed, block, as_of, dirty)[0].iloc[:n]
+
+def employee_master(rows: int, seed: int = SEED, dirty: float = 0.0, as_of: date = AS_OF) -> pd.DataFrame:
+    """
+    Raw Employee Master of `rows` employees (IDs from FIRST_EMPLOYEE_ID); dirty: share of rows an
+    import should reject. load_employee_data() / normalize_employee_master() turn it into the app's frame.
+    """
+    return pd.concat(list(iter_employee_master(rows, seed, dirty, as_of)), ignore_index=True)
+
+def sheets_records(frame: pd.DataFrame) -> list:
+    """Rows as gspread's get_all_records() returns them: digit-only cells become ints, the rest stay text"""
+    out = {}
+    for col in frame.columns:
+        values = frame[col].to_numpy(dtype=object).copy()
+        digits = frame[col].astype(str).str.fullmatch(r'-?\d+').to_numpy(dtype=bool)
+        if digits.any():
+            values[digits] = values[digits].astype(np.int64).astype(object)
+        out[col] = values
+    columns = list(out)
+    return [dict(zip(columns, row)) for row in zip(*out.values())]
+
+# ====== Submissions ======
+
+def _r2(a) -> list:
+    return np.round(a, 2).tolist()
+
+def _submission_block(seed: int, block: int, wanted: int, as_of: date) -> list:
+    _, f = _employee_block(seed, block, as_of, 0.0)
+    rng = np.random.default_rng([seed, block, 1])
+    rows = CHUNK_ROWS
+    as_of_d = np.datetime64(as_of)
+    lwd = np.maximum(as_of_d - rng.integers(0, HISTORY_DAYS, rows), f['doj'] + 90)
+    resignation = lwd - rng.choice([30, 60, 90], rows, p=[0.5, 0.3, 0.2])
+    n_months = rng.choice([1, 2, 3], rows, p=[0.5, 0.35, 0.15])
+    salary, basic = f['salary'], f['salary'] / 3
+    hra, special = basic * 0.5, f['salary'] - basic * 1.5
+
+    # Month records, newest (the LWD month) first; a tenth of months have one holiday
+    lwd_month = lwd.astype('datetime64[M]')
+    months = []
+    for j in range(3):
+        start = (lwd_month - j).astype('datetime64[D]')
+        end = (lwd_month - j + 1).astype('datetime64[D]')
+        working = np.busday_count(start, end)
+        present = np.busday_count(start, lwd + 1) if j == 0 else working - rng.integers(0, 3, rows)
+        holiday = np.busday_offset(start, rng.integers(0, 15, rows), roll='forward')
+        has_holiday = rng.random(rows) < 0.1
+        working = working - has_holiday
+        present = np.clip(present - (has_holiday & (holiday <= lwd)), 0, working)
+        ratio = np.where(working > 0, present / np.maximum(working, 1), 0.0)
+        prorated = salary * ratio
+        epf = f['full_epf'] * ratio
+        months.append({
+            'name': [MONTH_NAMES[m] for m in (lwd_month - j).astype(np.int64) % 12],
+            'active': j < n_months, 'present': present.tolist(), 'working': working.tolist(),
+            'holiday': np.where(has_holiday, np.datetime_as_string(holiday), '').tolist(),
+            'ratio': ratio, 'prorated': prorated, 'epf': epf,
+            'esi': np.where(salary <= 21_000, prorated * 0.0075, 0.0),
+        })
+
+    active = np.array([m['active'] for m in months])                       # (3, rows)
+    total = {k: (np.array([m[k] for m in months]) * active).sum(axis=0) for k in ('prorated', 'epf', 'esi')}
+    tenure_days = (lwd - f['doj']).astype(np.int64)
+    tenure = tenure_days // 365 + ((tenure_days % 365) > 182)
+    gratuity = np.where(tenure >= 5, np.minimum(tenure * np.round(basic, 2) * 15 / 26, 20_00_000), 0.0)
+    leave = np.where(rng.random(rows) < 0.6, salary / 30 * rng.integers(1, 31, rows), 0.0)
+    bonus = np.where(rng.random(rows) < 0.2, np.round(salary * rng.uniform(0.1, 0.5, rows), -2), 0.0)
+    pt = np.array([PT_LOCATIONS.get(loc, 0.0) for loc in f['location']]) * n_months
+    advance = np.where(rng.random(rows) < 0.05, np.round(rng.uniform(5_000, 50_000, rows), -2), 0.0)
+    tada = np.where(rng.random(rows) < 0.03, np.round(rng.uniform(500, 8_000, rows)), 0.0)
+    notice = np.where(rng.random(rows) < 0.1, salary / 30 * rng.integers(5, 45, rows), 0.0)
+    earnings = np.round(total['prorated'], 2) + np.round(gratuity, 2) + bonus + np.round(leave, 2)
+    payroll_ded = np.round(total['epf'], 2) + np.round(total['esi'], 2) + advance + tada + np.round(notice, 2)
+
+    age = (as_of_d - lwd).astype(np.int64)
+    status = np.where(age < 45, rng.choice(len(STATUSES), rows, p=RECENT_STATUS_MIX),
+                      rng.choice(len(STATUSES), rows, p=SETTLED_STATUS_MIX))
+    regime = np.where(rng.random(rows) < 0.6, "New Tax Regime", "Old Tax Regime")
+
+    cols = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in {
+        'id': f['ids'], 'name': f['name'], 'designation': f['designation'], 'location': f['location'],
+        'doj': f['doj_text'], 'salary': salary, 'n_months': n_months, 'tenure': tenure, 'status': status,
+        'regime': regime, 'resignation': pd.DatetimeIndex(resignation).strftime('%d/%m/%Y').to_numpy(),
+        'lwd': pd.DatetimeIndex(lwd).strftime('%d/%m/%Y').to_numpy(), 'gratuity': _r2(gratuity),
+        'bonus': _r2(bonus), 'leave': _r2(leave), 'pt': _r2(pt), 'advance': _r2(advance), 'tada': _r2(tada),
+        'notice': _r2(notice), 'earnings': _r2(earnings), 'payroll_ded': _r2(payroll_ded),
+        'net': _r2(earnings - payroll_ded - pt), 'basic_da': _r2(basic), 'full_epf': _r2(f['full_epf']),
+    }.items()}
+    month_cols = [{k: (_r2(m[k]) if isinstance(m[k], np.ndarray) and m[k].dtype == float else m[k])
+                   for k in m} for m in months]
+    for m, raw in zip(month_cols, months):
+        m['basic'], m['hra'], m['special'] = _r2(basic), _r2(hra), _r2(special)
+        m['prorated_basic'], m['prorated_hra'], m['prorated_special'] = (
+            _r2(basic * raw['ratio']), _r2(hra * raw['ratio']), _r2(special * raw['ratio']))
+        m['ratio'] = np.round(raw['ratio'], 4).tolist()
+    totals = {k: _r2(v) for k, v in total.items()}
+
+    investments = _investments(rng, regime)
+
+    submissions = []
+    for i in range(wanted):
+        active_months = {}
+        for m in reversed(month_cols[:cols['n_months'][i]]):
+            active_months[m['name'][i]] = {
+                'total_salary': cols['salary'][i], 'basic': m['basic'][i], 'hra': m['hra'][i],
+                'special_allowances': m['special'][i], 'present_days': m['present'][i],
+                'epf': m['epf'][i], 'esi': m['esi'][i], 'holidays': [m['holiday'][i]] if m['holiday'][i] else [],
+                'total_working_days': m['working'][i], 'prorated_salary': m['prorated'][i],
+                'prorated_basic': m['prorated_basic'][i], 'prorated_hra': m['prorated_hra'][i],
+                'prorated_special': m['prorated_special'][i], 'attendance_ratio': m['ratio'][i],
+                'epf_full_month': cols['full_epf'][i],
+            }
+        submissions.append({
+            'employee_id': cols['id'][i], 'employee_name': cols['name'][i], 'designation': cols['designation'][i],
+            'base_location': cols['location'][i], 'doj': cols['doj'][i],
+            'resignation_date': cols['resignation'][i], 'last_working_day': cols['lwd'][i],
+            'active_months': active_months,
+            'salary_totals': {
+                'total_salary': round(cols['salary'][i] * cols['n_months'][i], 2),
+                'prorated_total': totals['prorated'][i],
+                'prorated_basic': round(sum(a['prorated_basic'] for a in active_months.values()), 2),
+                'prorated_hra': round(sum(a['prorated_hra'] for a in active_months.values()), 2),
+                'prorated_special': round(sum(a['prorated_special'] for a in active_months.values()), 2),
+                'total_epf': totals['epf'][i], 'total_esi': totals['esi'][i],
+            },
+            'gratuity': cols['gratuity'][i], 'bonus': cols['bonus'][i], 'leave_encashment': cols['leave'][i],
+            'total_earnings': cols['earnings'][i], 'pt_total': cols['pt'][i],
+            'salary_advance': cols['advance'][i], 'tada_recovery': cols['tada'][i], 'wfh_recovery': 0.0,
+            'notice_period_recovery': cols['notice'][i], 'other_deductions': 0.0,
+            'payroll_deductions': cols['payroll_ded'][i], 'net_before_tax': cols['net'][i],
+            'status': STATUSES[cols['status'][i]], 'tenure_years': cols['tenure'][i],
+            'last_basic_da': cols['basic_da'][i], 'payroll_calculated': True, 'tax_calculated': False,
+            'tax_regime': None, 'investments_data': {}, 'tds_amount': 0.0, 'total_deductions': 0.0,
+            'net_payable': 0.0, 'taxable_income': 0.0,
+        })
+    _review_tax(submissions, investments)
+    return submissions
+
+# Declared investments of Old Regime employees: (head, share of employees, low, high)
+DECLARED_INVESTMENTS = [('ppf', 0.4, 10_000, 150_000), ('elss', 0.2, 5_000, 50_000),
+                        ('life_insurance', 0.3, 5_000, 40_000), ('health_insurance_self', 0.5, 5_000, 25_000),
+                        ('home_loan_interest', 0.1, 50_000, 200_000), ('hra_exemption', 0.4, 20_000, 150_000)]
+
+def _investments(rng, regime: np.ndarray) -> pd.DataFrame:
+    """Tax review grid inputs (Regime + investment heads) for a whole block"""
+    from fnf.tax import INVESTMENT_KEYS
+
+    rows = len(regime)
+    inputs = pd.DataFrame(0.0, index=range(rows), columns=INVESTMENT_KEYS)
+    inputs['Regime'] = regime
+    old = regime == "Old Tax Regime"
+    for key, share, low, high in DECLARED_INVESTMENTS:
+        inputs[key] = np.where(old & (rng.random(rows) < share), np.round(rng.uniform(low, high, rows), -2), 0.0)
+    inputs['nps_80ccd_2'] = np.where(rng.random(rows) < 0.1, np.round(rng.uniform(10_000, 60_000, rows), -2), 0.0)
+    return inputs
+
+def _review_tax(submissions: list, investments: pd.DataFrame):
+    """Tax Team fields, as the bulk review saves them, on submissions past tax review"""
+    from fnf.tax import INVESTMENT_KEYS, recompute_tax_batch
+
+    taxed = [i for i, s in enumerate(submissions) if s['status'] in TAXED_STATUSES]
+    if not taxed:
+        return
+    inputs = investments.iloc[taxed].reset_index(drop=True)
+    inputs['PT'] = [submissions[i]['pt_total'] for i in taxed]
+    results = recompute_tax_batch([submissions[i] for i in taxed], inputs)
+
+    for i, r, row in zip(taxed, results.to_dict('records'), inputs.to_dict('records')):
+        s = submissions[i]
+        new = row['Regime'] == "New Tax Regime"
+        breakdown = ({key: 0.0 for key in INVESTMENT_KEYS} | {'nps_80ccd_2': float(row['nps_80ccd_2'])} if new
+                     else {key: float(row[key]) for key in INVESTMENT_KEYS})
+        reviewed = f"{s['last_working_day']} 11:30"
+        s.update({
+            'tax_regime': row['Regime'],
+            'investments_data': {'80c_total': float(r['inv_80c']), '80d_total': float(r['inv_80d']),
+                                 'other_deductions': float(r['inv_other']),
+                                 'exempt_allowances': float(r['exempt_allowances']),
+                                 'total_deductions': float(r['inv_total_for_tax']), 'breakdown': breakdown},
+            'taxable_income': float(r['taxable_income']), 'tds_amount': float(r['tds_amount']),
+            'total_deductions': float(r['total_deductions']), 'net_payable': float(r['net_payable']),
+            'tax_comments': '', 'tax_reviewed_by': 'Tax Team', 'tax_review_date': reviewed, 'tax_calculated': True,
+        })
+        if s['status'] == 'Payment Processed':
+            s['payment_processed_date'] = reviewed.replace('11:30', '16:00')
+
+def iter_submissions(count: int, seed: int = SEED, as_of: date = AS_OF):
+    """Submission blocks (lists of up to CHUNK_ROWS dicts) for the first `count` master employees"""
+    for block, n in _blocks(count):
+        yield _submission_block(seed, block, n, as_of)
+
+def submissions(count: int, seed: int = SEED, as_of: date = AS_OF) -> list:
+    """F&F submissions of employees FIRST_EMPLOYEE_ID.. of employee_master(seed), as settlement.py saves them"""
+    return [s for block in iter_submissions(count, seed, as_of) for s in block]
+
+# ====== Files ======
+
+def write_employee_master(path: str, rows: int, seed: int = SEED, dirty: float = 0.0,
+                          file_type: str = 'csv', as_of: date = AS_OF):
+    """Employee Master as an HRMS dump (CSV, or XLSX through openpyxl's write-only mode)"""
+    blocks = iter_employee_master(rows, seed, dirty, as_of)
+    if file_type == 'xlsx':
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Employee Master")
+        ws.append(master_columns(seed))
+        for frame in blocks:
+            for values in frame.itertuples(index=False):
+                ws.append(list(values))
+        wb.save(path)
+        return
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for block, frame in enumerate(blocks):
+            frame.to_csv(f, header=block == 0, index=False)
+
+def write_submission_store(path: str, count: int, seed: int = SEED, as_of: date = AS_OF):
+    """fnf_submissions.json (the file load_fnf_data() reads), written block by block"""
+    with open(path, 'w') as f:
+        f.write('{"submissions": [')
+        first = True
+        for block in iter_submissions(count, seed, as_of):
+            for s in block:
+                f.write(('' if first else ',\n') + json.dumps(s))
+                first = False
+        f.write(f'], "last_updated": "{datetime.now().isoformat()}"}}')
+
+def quiet_bare_streamlit():
+    """Silence Streamlit's warnings about session_state / caches used without a server"""
+    import streamlit.logger
+    from streamlit import config
+    config.get_config_options()                # parsing config resets the log level, so parse it first
+    streamlit.logger.set_log_level("error")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--as-of', type=date.fromisoformat, default=AS_OF, help="workload 'today' (YYYY-MM-DD)")
+    sub = parser.add_subparsers(dest='what', required=True)
+    m = sub.add_parser('master', help="Employee Master CSV/XLSX")
+    m.add_argument('--rows', type=int, required=True)
+    m.add_argument('--dirty', type=float, default=0.0, help="share of rows an import should reject")
+    m.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+    m.add_argument('--out', required=True)
+    s = sub.add_parser('store', help="fnf_submissions.json")
+    s.add_argument('--submissions', type=int, required=True)
+    s.add_argument('--out', required=True)
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    quiet_bare_streamlit()
+    start = time.perf_counter()
+    if args.what == 'master':
+        write_employee_master(args.out, args.rows, args.seed, args.dirty, args.format, args.as_of)
+        made = f"{args.rows:,} employees"
+    else:
+        write_submission_store(args.out, args.submissions, args.seed, args.as_of)
+        made = f"{args.submissions:,} submissions"
+    print(f"Wrote {made} to {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - start:.1f} s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""F&F Settlement System core package shared by the app pages (see dashboard.py)."""
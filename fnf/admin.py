@@ -0,0 +1,271 @@
+"""Admin page: user accounts, data file status, the BI snapshot export, and logs & performance."""
+import streamlit as st
+import pandas as pd
+import os
+import json
+from datetime import date, datetime
+
+from .auth import USERS_FILE, is_admin, load_users
+from .employees import EMPLOYEE_MASTER_SNAPSHOT
+from .monitoring import LATENCY_SAMPLES, LOG_FILE, LOG_RECORDS, counters, latency_summary, read_log_file, reset_metrics
+from .snapshot import BI_COLUMNS, BI_SNAPSHOT_DIR, PARQUET_AVAILABLE, export_bi_snapshot, zip_bi_snapshot
+from .ui import metric, pagination_controls, render_metric_grid
+from .tracing import TRACE_RERUNS, chrome_trace_json, set_tracing_enabled, tracing_enabled
+
+FNF_DATA_FILES = ['fnf_submissions.json', USERS_FILE, EMPLOYEE_MASTER_SNAPSHOT]
+
+def admin_dashboard():
+    """
+    Admin page (ADMIN_USERS only): user accounts, data file status, BI snapshot export, and the
+    logs & performance panel, whose metrics reset and tracing toggle apply to every session.
+    """
+    if not is_admin():
+        st.error("🔒 The Admin page is only available to administrators.")
+        return
+    st.markdown("""
+    <div class="main-header">
+        <h1>🛠️ Admin</h1>
+        <p>User accounts and system data</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    tab1, tab2, tab3, tab4 = st.tabs(["👥 Users", "🗄️ Data Files", "📤 BI Export", "📋 Logs & Performance"])
+
+    with tab1:
+        users = load_users()
+        st.dataframe(pd.DataFrame([{
+            'Username': uname,
+            'Role': u.get('role'),
+            'Password Set': bool(u.get('password_hash')),
+            'Must Change Password': bool(u.get('must_change_password')),
+            'Password Updated': u.get('password_updated_at') or '—',
+        } for uname, u in users.items()]), use_container_width=True, hide_index=True)
+
+    with tab2:
+        rows = []
+        for path in FNF_DATA_FILES:
+            exists = os.path.exists(path)
+            rows.append({
+                'File': path,
+                'Exists': exists,
+                'Size (KB)': round(os.path.getsize(path) / 1024, 1) if exists else 0.0,
+                'Modified': datetime.fromtimestamp(os.path.getmtime(path)).strftime('%d/%m/%Y %H:%M') if exists else '—',
+            })
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+        submissions = st.session_state.get('fnf_submissions', [])
+        if submissions:
+            st.markdown("### 📊 Submissions by Status")
+            counts = pd.Series([s.get('status', 'Unknown') for s in submissions]).value_counts()
+            st.dataframe(counts.rename_axis('Status').reset_index(name='Count'), use_container_width=True, hide_index=True)
+
+    with tab3:
+        bi_export_panel()
+
+    with tab4:
+        logs_and_performance_panel()
+
+def bi_export_panel():
+    """On-demand BI snapshot: column projection, exit-month range and format"""
+    st.markdown(f"""
+    <div class="info-card">
+        📤 Writes submissions to <strong>{BI_SNAPSHOT_DIR}/</strong> partitioned by exit month and status.
+        Only partitions that changed since the last export are rewritten.
+    </div>
+    """, unsafe_allow_html=True)
+
+    columns = st.multiselect("Columns", list(BI_COLUMNS), default=list(BI_COLUMNS), key="bi_columns")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        limit = st.checkbox("Limit exit months", key="bi_limit_range")
+    with c2:
+        start = st.date_input("From", value=date.today().replace(day=1), key="bi_start", disabled=not limit)
+    with c3:
+        end = st.date_input("To", value=date.today(), key="bi_end", disabled=not limit)
+    formats = ["Parquet", "CSV"] if PARQUET_AVAILABLE else ["CSV"]
+    fmt = st.radio("Format", formats, horizontal=True, key="bi_format")
+    if not PARQUET_AVAILABLE:
+        st.caption("Install pyarrow for Parquet output")
+
+    if st.button("📤 Export Snapshot", use_container_width=True):
+        if not columns:
+            st.warning("Select at least one column")
+        else:
+            try:
+                summary = export_bi_snapshot(
+                    st.session_state.get('fnf_submissions', []), BI_SNAPSHOT_DIR, columns,
+                    start if limit else None, end if limit else None, fmt.lower(),
+                )
+                st.success(f"✅ {summary['rows']} rows: {summary['written']} partitions written, "
+                           f"{summary['unchanged']} unchanged, {summary['deleted']} removed")
+                st.session_state.bi_snapshot_zip = zip_bi_snapshot(BI_SNAPSHOT_DIR)
+            except Exception as e:
+                st.error(f"Snapshot export failed: {e}")
+
+    zip_path = st.session_state.get('bi_snapshot_zip')
+    if zip_path and os.path.exists(zip_path):
+        with open(zip_path, 'rb') as f:
+            st.download_button("📥 Download Snapshot (ZIP)", data=f, file_name=os.path.basename(zip_path),
+                               mime="application/zip", use_container_width=True)
+
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+LOG_COLUMNS = ('time', 'level', 'logger', 'message')
+# (label, counter prefix) for cache hit ratios: '<prefix>.calls' and '<prefix>.misses'
+CACHE_COUNTERS = [("Employee Master", "cache.employee_master"), ("Regime comparison (tax)", "cache.regime_comparison")]
+STORE_WRITE_METRIC = "store.save_fnf_data"
+
+def logs_and_performance_panel():
+    """Application logs, runtime metrics and rerun traces (Admin page and Payroll "View Logs"; admins only)"""
+    if not is_admin():
+        st.error("🔒 Logs & Performance is only available to administrators.")
+        return
+    t1, t2, t3 = st.tabs(["📜 Logs", "📈 Metrics", "⏱️ Rerun Traces"])
+    with t1:
+        logs_panel()
+    with t2:
+        metrics_panel()
+    with t3:
+        performance_panel()
+
+def logs_panel():
+    """Newest-first application logs from memory or the log file, filtered by level and text"""
+    c1, c2, c3 = st.columns([1, 2, 2])
+    with c1:
+        source = st.radio("Source", ["Memory", "Log file"], horizontal=True, key="logs_source")
+    with c2:
+        levels = st.multiselect("Level", LOG_LEVELS, default=LOG_LEVELS[1:], key="logs_levels")
+    with c3:
+        query = st.text_input("Search", key="logs_query", placeholder="Text in message, logger or fields").strip().lower()
+
+    records = LOG_RECORDS.copy() if source == "Memory" else read_log_file()
+    records = [r for r in reversed(records)
+               if r.get('level') in levels and (not query or query in json.dumps(r, default=str).lower())]
+    if source == "Log file":
+        st.caption(f"Last records of {LOG_FILE} (older ones are in the rotated files next to it)")
+    if not records:
+        st.info("No log records match")
+        return
+
+    start, end = pagination_controls(len(records), key="logs", page_sizes=(25, 50, 100))
+    st.dataframe(pd.DataFrame([{
+        'Time': r.get('time'),
+        'Level': r.get('level'),
+        'Logger': r.get('logger'),
+        'Message': r.get('message'),
+        'Fields': json.dumps({k: v for k, v in r.items() if k not in LOG_COLUMNS}, default=str),
+    } for r in records[start:end]]), use_container_width=True, hide_index=True)
+    st.download_button("📥 Download Matching Logs (JSON lines)",
+                       data="\n".join(json.dumps(r, default=str) for r in records),
+                       file_name=f"fnf_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+                       mime="application/json", use_container_width=True)
+
+def _ratio(part: int, whole: int) -> str:
+    return f"{100 * part / whole:.1f}%" if whole else "—"
+
+def metrics_panel():
+    """Latency percentiles, cache hit ratios, Sheets API calls and store write latency (all sessions)"""
+    counts = counters()
+    latency = {row['name']: row for row in latency_summary()}
+
+    store = latency.get(STORE_WRITE_METRIC)
+    writes, write_errors = counts.get(f"{STORE_WRITE_METRIC}.calls", 0), counts.get(f"{STORE_WRITE_METRIC}.errors", 0)
+    cards = [
+        metric("Store Writes", writes, delta=f"{write_errors} failed", delta_color="inverse" if write_errors else "off", icon="💾"),
+        metric("Write p50", f"{store['p50']:.1f} ms" if store else "—", icon="⏱️"),
+        metric("Write p99", f"{store['p99']:.1f} ms" if store else "—", icon="🐢"),
+    ]
+    for label, prefix in CACHE_COUNTERS:
+        calls, misses = counts.get(f"{prefix}.calls", 0), counts.get(f"{prefix}.misses", 0)
+        cards.append(metric(f"{label} Hit Ratio", _ratio(calls - misses, calls),
+                            delta=f"{calls} lookups, {misses} misses", delta_color="off", icon="🎯"))
+    render_metric_grid(cards, columns=5)
+
+    st.markdown("**Google Sheets API**")
+    sheets = []
+    for name in sorted(counts):
+        if not (name.startswith("sheets.") and name.endswith(".calls")):
+            continue
+        metric_name = name[:-len(".calls")]
+        calls, errors = counts[name], counts.get(f"{metric_name}.errors", 0)
+        timing = latency.get(metric_name, {})
+        sheets.append({
+            'Call': metric_name[len("sheets."):], 'Calls': calls, 'Errors': errors,
+            'Error Rate': _ratio(errors, calls),
+            'p50 (ms)': round(timing.get('p50', 0.0), 1), 'p99 (ms)': round(timing.get('p99', 0.0), 1),
+        })
+    if sheets:
+        st.dataframe(pd.DataFrame(sheets), use_container_width=True, hide_index=True)
+    else:
+        st.caption("No Sheets calls since the server started (the master is cached, or imported)")
+
+    st.markdown("**Latency percentiles**")
+    name_filter = st.text_input("Filter", key="metrics_filter", placeholder="Function or metric name").strip().lower()
+    rows = [{
+        'Name': row['name'], 'Samples': row['count'], 'p50 (ms)': round(row['p50'], 2),
+        'p90 (ms)': round(row['p90'], 2), 'p99 (ms)': round(row['p99'], 2), 'Max (ms)': round(row['max'], 2),
+    } for row in latency.values() if name_filter in row['name'].lower()]
+    if rows:
+        st.dataframe(pd.DataFrame(rows).sort_values('p99 (ms)', ascending=False),
+                     use_container_width=True, hide_index=True)
+    st.caption("Store writes and Sheets calls are always measured; function and page timings are collected "
+               f"while rerun tracing is on (⏱️ Rerun Traces). Percentiles cover the last {LATENCY_SAMPLES:,} samples per name.")
+    if st.button("♻️ Reset Metrics", key="metrics_reset"):
+        reset_metrics()
+        st.rerun()
+
+def _span_rows(span, total_ns, depth=0, rows=None, limit=500):
+    """Span tree flattened depth-first, names indented by depth"""
+    rows = [] if rows is None else rows
+    if len(rows) < limit:
+        rows.append({
+            'Span': "\u2003" * depth + span['name'],
+            'Time (ms)': round(span['dur'] / 1e6, 2),
+            '% of Rerun': round(100 * span['dur'] / total_ns, 1) if total_ns else 0.0,
+            'Children': len(span['children']),
+        })
+        for child in span['children']:
+            _span_rows(child, total_ns, depth + 1, rows, limit)
+    return rows
+
+def performance_panel():
+    """This session's last reruns as span trees, per-function totals and a Chrome trace download"""
+    enabled = st.toggle("Trace reruns (all sessions)", value=tracing_enabled(), key="trace_enabled")
+    if enabled != tracing_enabled():
+        set_tracing_enabled(enabled)
+    st.caption(f"Times load_employee_data, recompute_tax_updated, save_fnf_data, load_users and page rendering. "
+               f"The last {TRACE_RERUNS} reruns of this session are kept; start the app with FNF_TRACE=1 to trace from launch.")
+
+    reruns = list(st.session_state.get('trace_reruns', []))
+    if not reruns:
+        st.info("No traced reruns yet: turn tracing on and use the app")
+        return
+
+    summary = pd.DataFrame([{
+        'Rerun': n,
+        'Started': datetime.fromtimestamp(r['started_at']).strftime('%H:%M:%S'),
+        'Total (ms)': round(r['root']['dur'] / 1e6, 1),
+        'Spans': r['spans'],
+        'Slowest Function': max(r['calls'], key=lambda name: r['calls'][name][1]) if r['calls'] else '—',
+    } for n, r in enumerate(reruns, 1)])
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    n = st.selectbox("Rerun", list(range(len(reruns), 0, -1)), key="trace_rerun_pick")
+    rerun = reruns[n - 1]
+    c1, c2 = st.columns([3, 2])
+    with c1:
+        st.markdown("**Span tree**")
+        st.dataframe(pd.DataFrame(_span_rows(rerun['root'], rerun['root']['dur'])),
+                     use_container_width=True, hide_index=True)
+    with c2:
+        st.markdown("**Calls**")
+        calls = pd.DataFrame([{'Function': name, 'Calls': count, 'Total (ms)': round(total / 1e6, 2),
+                               'Mean (ms)': round(total / count / 1e6, 3)}
+                              for name, (count, total) in rerun['calls'].items()])
+        if not calls.empty:
+            calls = calls.sort_values('Total (ms)', ascending=False)
+        st.dataframe(calls, use_container_width=True, hide_index=True)
+
+    st.download_button("📥 Download Chrome Trace (JSON)", data=chrome_trace_json(reruns),
+                       file_name=f"fnf_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                       mime="application/json", use_container_width=True)
+    st.caption("Open in chrome://tracing or ui.perfetto.dev")
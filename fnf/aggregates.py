@@ -0,0 +1,88 @@
+"""
+Liability aggregates over the F&F submission store, behind the month-end report. Each submission
+adds its amounts (integer paise) to one cell keyed by status, location, exit month and tax regime,
+and unsettled ones also to an ageing cell keyed by exit date. The store passes in the submissions
+that changed, so an update costs O(changed) however many years of data are stored.
+Standard library only: the store is loaded on the login path.
+"""
+import functools
+from datetime import datetime
+
+# Cell values, in order; everything after the count is paise
+AGGREGATE_FIELDS = ('count', 'gratuity', 'leave_encashment', 'epf', 'tds', 'net_payable')
+SETTLED_STATUSES = ('Payment Processed',)
+UNKNOWN = 'Unknown'
+
+def _paise(value) -> int:
+    """Rupees -> int paise, half away from zero (as calc.to_paise, without numpy)"""
+    try:
+        a = round(float(value or 0.0) * 100, 6)
+    except (TypeError, ValueError):
+        return 0
+    p = int(abs(a) + 0.5)
+    return p if a >= 0 else -p
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(text: str):
+    """dd/mm/yyyy -> date (None if unreadable); memoized, exit dates repeat across submissions"""
+    try:
+        return datetime.strptime(text, '%d/%m/%Y').date()
+    except ValueError:
+        return None
+
+def submission_contribution(submission: dict) -> tuple:
+    """(cell key, values, ageing key or None) one submission adds to the aggregates"""
+    s = submission
+    exit_date = _parse_date(str(s.get('last_working_day')))
+    status = s.get('status') or UNKNOWN
+    key = (status, s.get('base_location') or UNKNOWN,
+           exit_date.strftime('%Y-%m') if exit_date else UNKNOWN, s.get('tax_regime') or UNKNOWN)
+    # Until the Tax Team has calculated TDS, the payable is the payroll figure before tax
+    tax_done = bool(s.get('tax_calculated'))
+    values = (
+        1,
+        _paise(s.get('gratuity')),
+        _paise(s.get('leave_encashment')),
+        _paise((s.get('salary_totals') or {}).get('total_epf')),
+        _paise(s.get('tds_amount')) if tax_done else 0,
+        _paise(s.get('net_payable') if tax_done else s.get('net_before_tax')),
+    )
+    ageing = None if status in SETTLED_STATUSES else (status, exit_date.isoformat() if exit_date else None)
+    return key, values, ageing
+
+def _add(table: dict, key, values, sign: int):
+    cell = table.get(key)
+    if cell is None:
+        cell = table[key] = [0] * len(values)
+    for i, v in enumerate(values):
+        cell[i] += sign * v
+    if cell[0] == 0:
+        del table[key]
+
+def _apply(aggregates: dict, contribution: tuple, sign: int):
+    key, values, ageing = contribution
+    _add(aggregates['cells'], key, values, sign)
+    if ageing is not None:
+        _add(aggregates['ageing'], ageing, (1, values[-1]), sign)
+
+def update_fnf_aggregates(aggregates: dict, changed):
+    """Move each changed submission's contribution from its previous cells to its current ones"""
+    index = aggregates['index']
+    for s in changed:
+        new = submission_contribution(s)
+        old = index.get(s.get('employee_id'))
+        if old == new:
+            continue
+        if old is not None:
+            _apply(aggregates, old, -1)
+        _apply(aggregates, new, 1)
+        index[s.get('employee_id')] = new
+
+def build_fnf_aggregates(submissions) -> dict:
+    """
+    {'cells': {(status, location, exit month, regime): [count, gratuity, leave, epf, tds, net]},
+     'ageing': {(status, exit date ISO or None): [count, net]}, 'index': {employee_id: contribution}}
+    """
+    aggregates = {'cells': {}, 'ageing': {}, 'index': {}}
+    update_fnf_aggregates(aggregates, submissions)
+    return aggregates
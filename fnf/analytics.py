@@ -0,0 +1,82 @@
+"""Analytics tab: submission aggregates and Plotly figures, built once per submission-store version."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+NET_PAYABLE_BINS = 20   # fixed bin count, so the histogram payload doesn't grow with the store
+
+def _style(fig):
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def submission_aggregates(version: str, _submissions: list) -> dict:
+    """
+    Aggregates for one store version: 'by_status' and 'by_regime' frames (count, total net payable,
+    in order of first appearance) and a pre-binned net payable histogram (counts, edges).
+    """
+    frame = pd.DataFrame({
+        'status': [s['status'] for s in _submissions],
+        'tax_regime': [s.get('tax_regime') or 'Unknown' for s in _submissions],
+        'net_payable': pd.to_numeric(pd.Series([s.get('net_payable', 0) for s in _submissions], dtype=object),
+                                     errors='coerce').fillna(0.0).astype(float),
+    })
+
+    def summarize(key):
+        grouped = frame.groupby(key, sort=False)['net_payable']
+        return pd.DataFrame({'count': grouped.size(), 'total': grouped.sum()})
+
+    amounts = frame['net_payable'].to_numpy()
+    amounts = amounts[amounts > 0]
+    counts, edges = np.histogram(amounts, bins=NET_PAYABLE_BINS) if len(amounts) else (np.empty(0), np.empty(0))
+    return {
+        'by_status': summarize('status'),
+        'by_regime': summarize('tax_regime'),
+        'net_payable_hist': (counts, edges),
+    }
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def analytics_figures(version: str, _submissions: list) -> dict:
+    """Plotly figures for one store version (None where a chart has no data)"""
+    import plotly.express as px  # imported on first use: the login and tax pages never need it
+
+    agg = submission_aggregates(version, _submissions)
+    by_status, by_regime = agg['by_status'], agg['by_regime']
+    counts, edges = agg['net_payable_hist']
+
+    figures = {'status': None, 'net_payable': None, 'regime_count': None, 'regime_total': None}
+    if len(by_status):
+        figures['status'] = _style(px.pie(
+            values=by_status['count'].tolist(),
+            names=by_status.index.tolist(),
+            title="📊 F&F Status Distribution",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        ))
+    if len(counts):
+        fig_hist = px.bar(
+            x=((edges[:-1] + edges[1:]) / 2).tolist(),
+            y=counts.tolist(),
+            title="💰 Net Payable Distribution",
+            labels={'x': 'Net Payable (₹)', 'y': 'Count'},
+            color_discrete_sequence=['#667eea']
+        )
+        fig_hist.update_traces(width=float(edges[1] - edges[0]))
+        figures['net_payable'] = _style(fig_hist.update_layout(bargap=0))
+    if len(by_regime) > 1:
+        figures['regime_count'] = _style(px.bar(
+            x=by_regime.index.tolist(),
+            y=by_regime['count'].tolist(),
+            title="🏛️ Tax Regime Preference",
+            labels={'x': 'Tax Regime', 'y': 'Count'},
+            color=by_regime['count'].tolist(),
+            color_continuous_scale='Blues'
+        ))
+        figures['regime_total'] = _style(px.bar(
+            x=by_regime.index.tolist(),
+            y=by_regime['total'].tolist(),
+            title="💸 Total Amounts by Tax Regime",
+            labels={'x': 'Tax Regime', 'y': 'Total Amount (₹)'},
+            color=by_regime['total'].tolist(),
+            color_continuous_scale='Greens'
+        ))
+    return figures
@@ -0,0 +1,63 @@
+"""Static assets: the logo and CSS are read, hashed and encoded once per process, not on every rerun."""
+import base64
+import functools
+import hashlib
+import os
+import re
+
+import streamlit as st
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+LOGO_FILE = "koenig-logo.png"
+
+@functools.lru_cache(maxsize=16)
+def _load_asset(path, mtime_ns):
+    """(bytes, content hash) for a file version; mtime is in the key so an edited file is re-read"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, hashlib.sha256(data).hexdigest()[:12]
+
+def asset_bytes(name):
+    """Bytes of a file in static/ (memoized)"""
+    path = os.path.join(STATIC_DIR, name)
+    return _load_asset(path, os.stat(path).st_mtime_ns)[0]
+
+def asset_hash(name):
+    """Short content hash of a file in static/, used to version its URL"""
+    path = os.path.join(STATIC_DIR, name)
+    return _load_asset(path, os.stat(path).st_mtime_ns)[1]
+
+@functools.lru_cache(maxsize=16)
+def _data_uri(name, content_hash):
+    mime = {".png": "image/png", ".svg": "image/svg+xml", ".css": "text/css"}.get(os.path.splitext(name)[1], "application/octet-stream")
+    return f"data:{mime};base64,{base64.b64encode(asset_bytes(name)).decode('ascii')}"
+
+def asset_url(name):
+    """
+    URL for a file in static/. With server.enableStaticServing the browser fetches app/static/<name>
+    once and the ?v=<hash> suffix changes only when the file does; otherwise a memoized data URI.
+    """
+    content_hash = asset_hash(name)
+    if st.get_option("server.enableStaticServing"):
+        return f"app/static/{name}?v={content_hash}"
+    return _data_uri(name, content_hash)
+
+def logo_html(width=200):
+    """<img> tag for the company logo, or the text fallback if the file is missing"""
+    try:
+        src = asset_url(LOGO_FILE)
+    except OSError:
+        return """
+            <div style="text-align: center;">
+                <h1 style="color: #667eea; font-size: 3rem;">🏢</h1>
+                <h2 style="color: #667eea; margin: 0;">Koenig Solutions</h2>
+            </div>
+        """
+    return f'<img src="{src}" width="{width}" alt="Koenig Solutions">'
+
+@functools.lru_cache(maxsize=8)
+def style_tag(*css_blocks):
+    """One minified <style> element for the given CSS strings (built once per combination)"""
+    css = re.sub(r"/\*.*?\*/", "", "".join(css_blocks), flags=re.S)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+    return f"<style>{css}</style>"
@@ -0,0 +1,651 @@
+"""Users, passwords, the login page and the signed-in sidebar."""
+import streamlit as st
+import os
+import json
+from datetime import datetime
+import hashlib
+import functools
+import logging
+
+from .assets import logo_html, style_tag
+from .storage import load_fnf_data
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# ====== Real Users Configuration ======
+USERS_FILE = "users.json"
+
+# 👇 Replace these with your actual users and roles
+REAL_USERS = {
+    "Payroll.fnf": "Payroll Team",
+    "tax.fnf": "Tax Team", 
+    "alice.johnson": "Payroll Team",
+    "bob.wilson": "Tax Team",
+    "sarah.davis": "Payroll Team",
+    "mike.brown": "Tax Team",
+    "emma.jones": "Payroll Team",
+    "david.miller": "Tax Team",
+    # Add more real users here
+}
+
+# Users who get the Admin page (accounts, BI export, logs, metrics reset, tracing for all sessions)
+ADMIN_USERS = {"Payroll.fnf", "tax.fnf"}
+
+def is_admin(username: str = None) -> bool:
+    """True if username (default: the signed-in user) is in ADMIN_USERS"""
+    if username is None:
+        username = st.session_state.get("username")
+    return username in ADMIN_USERS
+
+def _hash_pw(pw: str) -> str:
+    """Hash password using SHA256"""
+    try:
+        return hashlib.sha256(pw.encode("utf-8")).hexdigest()
+    except Exception:
+        return pw  # fallback
+
+def _default_users_real():
+    """
+    Seed users.json with real users from REAL_USERS:
+    - No initial password (password_hash=None)
+    - must_change_password=True (they must set it on first login)
+    """
+    base = {}
+    for uname, role in REAL_USERS.items():
+        base[uname] = {
+            "role": role,
+            "password_hash": None,           # set after first login
+            "must_change_password": True,    # forced on first login
+            "password_updated_at": None,
+            "created_at": datetime.now().isoformat(),
+        }
+    return base
+
+@traced()
+def load_users():
+    """Load users from JSON file"""
+    try:
+        if os.path.exists(USERS_FILE):
+            with open(USERS_FILE, "r") as f:
+                data = json.load(f)
+            # ensure schema for all REAL_USERS
+            changed = False
+            if not isinstance(data, dict):
+                data = {}
+                changed = True
+            for uname, role in REAL_USERS.items():
+                if uname not in data:
+                    data[uname] = {
+                        "role": role,
+                        "password_hash": None,
+                        "must_change_password": True,
+                        "password_updated_at": None,
+                        "created_at": datetime.now().isoformat(),
+                    }
+                    changed = True
+                else:
+                    u = data[uname]
+                    # backfill any missing keys
+                    if "role" not in u: u["role"] = role; changed = True
+                    if "password_hash" not in u: u["password_hash"] = None; changed = True
+                    if "must_change_password" not in u: u["must_change_password"] = True; changed = True
+                    if "password_updated_at" not in u: u["password_updated_at"] = None; changed = True
+                    if "created_at" not in u: u["created_at"] = datetime.now().isoformat(); changed = True
+            
+            # Remove any users not in REAL_USERS (optional; comment out if you want to keep)
+            for uname in list(data.keys()):
+                if uname not in REAL_USERS:
+                    del data[uname]
+                    changed = True
+            
+            if changed:
+                save_users(data)
+            return data
+        else:
+            data = _default_users_real()
+            save_users(data)
+            return data
+    except Exception:
+        data = _default_users_real()
+        save_users(data)
+        return data
+
+def save_users(users):
+    """Save users to JSON file"""
+    try:
+        with open(USERS_FILE, "w") as f:
+            json.dump(users, f, indent=2)
+    except Exception as e:
+        st.warning(f"Could not save users: {e}")
+
+def verify_user(username: str, password: str) -> bool:
+    """Verify user credentials"""
+    users = load_users()
+    u = users.get(username)
+    if not u:
+        return False
+    if not u.get("password_hash"):
+        # No password set yet → first login required
+        return False
+    return u["password_hash"] == _hash_pw(password)
+
+def set_password(username: str, new_password: str):
+    """Set new password for user"""
+    users = load_users()
+    if username in users:
+        users[username]["password_hash"] = _hash_pw(new_password)
+        users[username]["must_change_password"] = False  # Clear the flag
+        users[username]["password_updated_at"] = datetime.now().isoformat()
+        save_users(users)
+        return True
+    return False
+
+def change_password_ui(location="sidebar", require_current: bool = True):
+    """Debug version to see what's happening"""
+    
+    # 🔍 DEBUG INFO - Remove this after testing
+    if location == "main":
+        st.write("🔍 DEBUG INFO:")
+        st.write(f"require_current: {require_current}")
+        st.write(f"first_login: {st.session_state.get('first_login', False)}")
+        st.write(f"must_change_password: {st.session_state.get('must_change_password', False)}")
+        st.write("---")
+
+    container = st.sidebar if location == "sidebar" else st
+    form_key = f"change_password_form_{location}"
+
+    with container:
+        with st.form(form_key, clear_on_submit=False):
+            if require_current:
+                st.markdown("### 🔐 **Change Password**")
+                
+                # Show current password field ONLY when require_current=True
+                current = st.text_input(
+                    "Current Password",
+                    type="password",
+                    key=f"cp_current_{location}",
+                    help="Enter your existing password"
+                )
+            else:
+                st.markdown("### 🔐 **Set Up Your Password**")
+                st.markdown("Create a secure password for your account.")
+                current = None  # No current password needed
+
+            # New password field
+            new = st.text_input(
+                "New Password" if require_current else "Create Password",
+                type="password",
+                help="Use 8+ chars with upper, lower, digit & special character.",
+                key=f"cp_new_{location}"
+            )
+            
+            # Confirm password field
+            confirm = st.text_input(
+                "Confirm New Password" if require_current else "Confirm Password",
+                type="password",
+                key=f"cp_confirm_{location}"
+            )
+
+            # Submit button
+            submit_text = "🔄 Update Password" if require_current else "✅ Set Password"
+            submit_pw = st.form_submit_button(submit_text, use_container_width=True)
+
+        # Handle form submission
+        if submit_pw:
+            uname = st.session_state.get("username")
+            if not uname:
+                st.error("No logged-in user found.")
+                return
+
+            # Step 1: Validate current password ONLY if require_current=True
+            if require_current:
+                if not current or current.strip() == "":
+                    st.error("Please enter your current password.")
+                    return
+                    
+                if not verify_user(uname, current):
+                    st.error("Current password is incorrect.")
+                    return
+            # If require_current=False, skip current password validation entirely
+
+            # Step 2: Validate new password
+            if not new or new.strip() == "":
+                st.error("Please enter a new password.")
+                return
+
+            # Step 3: Password strength validation
+            password_errors = []
+            
+            if len(new) < 8:
+                password_errors.append("at least 8 characters")
+            if not any(c.islower() for c in new):
+                password_errors.append("one lowercase letter")
+            if not any(c.isupper() for c in new):
+                password_errors.append("one uppercase letter") 
+            if not any(c.isdigit() for c in new):
+                password_errors.append("one digit")
+            if not any(not c.isalnum() for c in new):
+                password_errors.append("one special character")
+                
+            if password_errors:
+                st.error(f"Password must contain: {', '.join(password_errors)}")
+                return
+
+            # Step 4: Confirm password match
+            if new != confirm:
+                st.error("New password and confirmation do not match.")
+                return
+
+            # Step 5: Set the password
+            if set_password(uname, new):
+                success_msg = "✅ Password set successfully!" if not require_current else "✅ Password updated successfully!"
+                st.success(success_msg)
+                
+                # Clear password-related session flags
+                st.session_state.pop("must_change_password", None)
+                st.session_state.pop("first_login", None)
+                
+                # For first-time setup, ensure user is properly logged in
+                if not require_current:
+                    users = load_users()
+                    user_data = users.get(uname, {})
+                    st.session_state["role"] = user_data.get("role", "Unknown")
+                    st.session_state["username"] = uname
+                    st.success(f"🎉 Welcome to the F&F Settlement System!")
+                    st.balloons()
+                
+                # Force page reload to show main dashboard
+                st.rerun()
+            else:
+                st.error("Failed to set password. Please try again.")
+
+SIDEBAR_BRAND_HTML = """
+        <div style='text-align: center; padding: 1rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; color: white; margin-bottom: 1rem;'>
+            <h2 style='margin: 0; font-size: 1.5rem;'>🏢 Koenig Solutions</h2>
+            <p style='margin: 0.5rem 0 0 0; font-size: 0.9rem; opacity: 0.9;'>F&F Settlement System</p>
+        </div>
+"""
+
+SIDEBAR_FEATURES_HTML = """
+            <div class="sidebar-content">
+                <h4 style="margin: 0 0 1rem 0;">🚀 System Features</h4>
+                <div style="font-size: 0.9rem; line-height: 1.6;">
+                    ✅ Multi-month processing<br>
+                    ✅ Tax regime support<br>
+                    ✅ Investment deductions<br>
+                    ✅ EPF & ESI calculations<br>
+                    ✅ Real-time previews<br>
+                    ✅ Professional reports
+                </div>
+            </div>
+"""
+
+@functools.lru_cache(maxsize=64)
+def _sidebar_html(username, role, stats):
+    """Brand, user card, F&F statistics and features as one HTML block (memoized by its inputs)"""
+    if username is None:
+        return SIDEBAR_BRAND_HTML
+    html = SIDEBAR_BRAND_HTML + f"""
+            <div class="sidebar-content">
+                <div style="text-align: center;">
+                    <h3 style="margin: 0 0 1rem 0;">👤 {username}</h3>
+                    <p style="margin: 0; opacity: 0.9;">🔧 {role}</p>
+                </div>
+            </div>
+            """
+    if stats is not None:
+        html += '<h3>📊 F&F Statistics</h3><div class="sidebar-metric-grid">' + "".join(f"""
+                    <div class="sidebar-metric">
+                        <div style="font-size: 1.5rem; font-weight: bold;">{count}</div>
+                        <div style="font-size: 0.9rem; opacity: 0.9;">{label}</div>
+                    </div>
+                    """ for label, count in stats) + '</div>'
+    return html + '<hr>' + SIDEBAR_FEATURES_HTML
+
+def add_sidebar_logo():
+    """Add enhanced logo to sidebar with better styling"""
+    with st.sidebar:
+        # Brand, user info, statistics and features go out as a single element
+        stats = None
+        if 'fnf_submissions' in st.session_state:
+            counts = {}
+            for s in st.session_state.fnf_submissions:
+                counts[s['status']] = counts.get(s['status'], 0) + 1
+            stats = (
+                ("Total", len(st.session_state.fnf_submissions)),
+                ("Pending", counts.get('Under Tax Review', 0) + counts.get('Pending Tax Review', 0)),
+                ("Approved", counts.get('Tax Approved', 0)),
+                ("Processed", counts.get('Payment Processed', 0)),
+            )
+        st.markdown(_sidebar_html(st.session_state.get('username'), st.session_state.get('role'), stats),
+                    unsafe_allow_html=True)
+        
+        if 'username' in st.session_state:
+            st.markdown("---")
+
+            # Change password (available anytime)
+            change_password_ui(location="sidebar")
+
+            st.markdown("---")
+            
+            if st.button("🚪 Logout", use_container_width=True):
+                # Clear session state
+                for key in list(st.session_state.keys()):
+                    del st.session_state[key]
+                st.rerun()
+
+# Login and password-setup screen styles
+LOGIN_CSS = """
+        .login-container {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 3rem;
+            border-radius: 20px;
+            color: white;
+            text-align: center;
+            box-shadow: 0 10px 20px rgba(0, 0, 0, 0.2);
+            margin: 2rem 0;
+        }
+        
+        .logo-section {
+            display: grid;
+            place-items: center;
+            width: 100%;
+            margin-bottom: 2rem;
+        }
+        
+        .main-title {
+            color: #1f4e79;
+            font-size: 2.2rem;
+            font-weight: 600;
+            margin: 0;
+            text-align: center;
+        }
+        
+        .production-tag {
+            background: #28a745;
+            color: white;
+            padding: 8px 20px;
+            border-radius: 25px;
+            font-size: 0.9rem;
+            font-weight: 500;
+            text-align: center;
+            margin: 1rem 0;
+        }
+        
+        .feature-highlight {
+            background: rgba(255, 255, 255, 0.1);
+            border-radius: 10px;
+            padding: 1rem;
+            margin: 0.5rem 0;
+            backdrop-filter: blur(10px);
+            text-align: left;
+        }
+        
+        .perfect-center {
+            display: grid;
+            place-items: center;
+            width: 100%;
+            gap: 20px;
+            text-align: center;
+        }
+"""
+
+def login():
+    """Enhanced login page with professional styling for real users"""
+    
+    # Load custom CSS for login page
+    st.markdown(style_tag(LOGIN_CSS), unsafe_allow_html=True)
+
+    users = load_users()
+
+    # 🔹 CHECK: If user needs to set password for the first time (NO current password required)
+    if st.session_state.get("needs_password_setup"):
+        username = st.session_state.get("username")
+        
+        st.markdown('<div class="perfect-center">', unsafe_allow_html=True)
+        
+        # Logo section
+        st.markdown(f'<div class="logo-section">{logo_html()}</div>', unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.markdown(f"""
+            <div class="login-container">
+                <h1 class="main-title" style="color: white;">Welcome, {username}!</h1>
+                <div class="production-tag">First Time Setup - Create Your Password</div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            st.markdown("""
+            <div class="employee-card">
+                <h3>🔐 Create Your Password</h3>
+                <p>Please create a secure password for your account.</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # 🔥 DIRECT PASSWORD SETUP FORM (No function call that might have bugs)
+            with st.form("first_time_password_setup", clear_on_submit=False):
+                st.markdown("### ✅ **Set Up Your Password**")
+                
+                new_password = st.text_input(
+                    "Create Password",
+                    type="password",
+                    help="Use 8+ chars with upper, lower, digit & special character.",
+                    key="new_password_setup"
+                )
+                
+                confirm_password = st.text_input(
+                    "Confirm Password",
+                    type="password",
+                    key="confirm_password_setup"
+                )
+                
+                setup_submit = st.form_submit_button("✅ Create Password", use_container_width=True)
+                
+                if setup_submit:
+                    # Validate password
+                    if not new_password:
+                        st.error("Please enter a password.")
+                    elif len(new_password) < 8:
+                        st.error("Password must be at least 8 characters long.")
+                    elif not any(c.islower() for c in new_password):
+                        st.error("Password must contain at least one lowercase letter.")
+                    elif not any(c.isupper() for c in new_password):
+                        st.error("Password must contain at least one uppercase letter.")
+                    elif not any(c.isdigit() for c in new_password):
+                        st.error("Password must contain at least one digit.")
+                    elif not any(not c.isalnum() for c in new_password):
+                        st.error("Password must contain at least one special character.")
+                    elif new_password != confirm_password:
+                        st.error("Passwords do not match.")
+                    else:
+                        # Set password
+                        if set_password(username, new_password):
+                            # Clear setup flags
+                            st.session_state.pop("needs_password_setup", None)
+                            
+                            # Set user as logged in
+                            user_data = users[username]
+                            st.session_state["role"] = user_data["role"]
+                            st.session_state["username"] = username
+                            
+                            # Load F&F data
+                            try:
+                                load_fnf_data()
+                            except Exception:
+                                pass
+                            
+                            st.success(f"🎉 Password created! Welcome to the F&F Settlement System!")
+                            st.balloons()
+                            st.rerun()
+                        else:
+                            st.error("Failed to set password. Please try again.")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    # 🔹 CHECK: If user needs to change existing password (current password required)
+    if st.session_state.get("must_change_password") and st.session_state.get("username"):
+        st.markdown('<div class="perfect-center">', unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.markdown("""
+            <div class="warning-card">
+                🔄 <strong>Password Change Required</strong><br>
+                Your password must be updated before continuing.
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Call function with current password required
+            change_password_ui(location="main", require_current=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    # 🔹 REGULAR LOGIN FORM
+    st.markdown('<div class="perfect-center">', unsafe_allow_html=True)
+
+    # Logo Section
+    st.markdown(f'<div class="logo-section">{logo_html()}</div>', unsafe_allow_html=True)
+
+    # Header
+    st.markdown("""
+        <div class="login-container">
+            <h1 class="main-title" style="color: white;">F&F Settlement System - Production</h1>
+            <div class="production-tag">Real User Authentication System</div>
+        </div>
+    """, unsafe_allow_html=True)
+
+    # Main login content
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown("""
+        <div class="employee-card">
+            <h2 style="text-align: center;">🔐 System Login</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # System capabilities
+        st.markdown("### ✨ Production System Features")
+        features = [
+            "Real user authentication with secure password hashing",
+            "First-time login password setup for new users", 
+            "Multi-month salary processing with prorated calculations",
+            "Automatic salary breakdown (Basic/HRA/Special Allowances)", 
+            "Investment deductions for Old Tax Regime",
+            "EPF calculation with Employee Master policy",
+            "Auto-gratuity calculation using (n × b × 15) ÷ 26 formula",
+            "Dual tax regime support (Old/New)",
+            "Comprehensive tax calculations with TDS",
+            "Role-based dashboards (Payroll + Tax Team)",
+            "Real-time data persistence between user sessions",
+            "Professional UI with enhanced analytics"
+        ]
+        
+        for feature in features:
+            st.markdown(f"""
+            <div class="feature-highlight">
+                ✅ {feature}
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("---")
+        st.markdown("### 🔑 Access System")
+
+        # Login form
+        with st.form("login_form", clear_on_submit=False):
+            username = st.text_input(
+                "👤 Username", 
+                placeholder="Enter your username", 
+                key="auth_username"
+            )
+            password = st.text_input(
+                "🔒 Password", 
+                type="password", 
+                placeholder="Enter your password (leave blank for first-time setup)", 
+                key="auth_password"
+            )
+            submit_login = st.form_submit_button(
+                "🚀 Login to System", 
+                use_container_width=True
+            )
+
+        if submit_login:
+            if not username:
+                st.error("Please enter your username.")
+                return
+                
+            # Check if user exists
+            if username not in users:
+                st.error("❌ User not found. Please contact administrator.")
+                return
+            
+            user_data = users[username]
+            
+            # 🔥 FIRST TIME USER (no password set)
+            if not user_data.get("password_hash"):
+                st.session_state["username"] = username
+                st.session_state["needs_password_setup"] = True  # Use different flag
+                st.success("👋 Welcome! Please create your password.")
+                st.rerun()
+                return
+            
+            # 🔥 EXISTING USER - need password
+            if not password:
+                st.error("❌ Please enter your password.")
+                return
+            
+            # Verify password
+            if verify_user(username, password):
+                logger.info("Login: %s", username, extra={'user': username, 'role': user_data["role"]})
+                st.session_state["role"] = user_data["role"]
+                st.session_state["username"] = username
+                st.session_state["must_change_password"] = bool(user_data.get("must_change_password", False))
+                
+                # Clear any setup flags
+                st.session_state.pop("needs_password_setup", None)
+                
+                try:
+                    load_fnf_data()
+                except Exception:
+                    pass
+                
+                if st.session_state["must_change_password"]:
+                    st.warning("⚠️ You must change your password before continuing.")
+                    st.rerun()
+                else:
+                    st.success(f"✅ Login successful! Welcome, {user_data['role']}")
+                    st.balloons()
+                    st.rerun()
+            else:
+                logger.warning("Failed login: %s", username, extra={'user': username})
+                st.error("❌ Invalid password. Please try again.")
+
+        # User info
+        st.markdown("---")
+        st.markdown("### 👥 **For New Users**")
+        st.markdown("""
+        <div class="info-card">
+            🔐 <strong>New User?</strong><br>
+            Enter your username and leave password blank for first-time setup.
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Current users
+        with st.expander("👥 **Authorized Users**", expanded=False):
+            st.markdown("### Current System Users:")
+            for user, role in REAL_USERS.items():
+                st.markdown(f"• **{user}** - {role}")
+        
+        # Footer
+        st.markdown("---")
+        st.markdown("""
+            <div style='text-align: center; color: #666; font-size: 0.9em; padding: 20px;'>
+                © 2024 Koenig Solutions - F&F Settlement System (Production)<br>
+                <em>Secure Real User Authentication System</em>
+            </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
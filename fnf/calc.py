@@ -0,0 +1,384 @@
+"""Settlement arithmetic: integer paise, working days, TDS slabs, gratuity and EPF."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime, date
+import calendar
+import math
+from dateutil.relativedelta import relativedelta
+
+from .employees import DOJ_PARSED_COL, parse_doj_series
+
+def get_total_working_days(month_name, year=None, holidays=None):
+    """
+    Calculate working days considering:
+    - 5-day work week (Monday-Friday only)
+    - Exclude holidays if provided
+    """
+    month_map = {'January':1,'February':2,'March':3,'April':4,'May':5,'June':6,
+                 'July':7,'August':8,'September':9,'October':10,'November':11,'December':12}
+    m = month_map.get(month_name)
+    if year is None:
+        reference = st.session_state.get('last_working_day', date.today())
+        year = reference.year if hasattr(reference, 'year') else date.today().year
+
+    total_days = calendar.monthrange(year, m)[1]
+    
+    # Count only Monday-Friday (weekday 0-4), exclude Saturday(5) and Sunday(6)
+    working_days = sum(1 for d in range(1, total_days+1) 
+                      if calendar.weekday(year, m, d) < 5)  # 0-4 are Mon-Fri
+    
+    # Deduct holidays if provided
+    if holidays:
+        holiday_count = 0
+        for holiday_date in holidays:
+            try:
+                if isinstance(holiday_date, str):
+                    holiday_dt = datetime.strptime(holiday_date, '%Y-%m-%d').date()
+                else:
+                    holiday_dt = holiday_date
+                
+                # Check if holiday falls in this month and is a working day
+                if (holiday_dt.year == year and holiday_dt.month == m and 
+                    calendar.weekday(year, m, holiday_dt.day) < 5):
+                    holiday_count += 1
+            except Exception:
+                continue
+        
+        working_days -= holiday_count
+    
+    return max(working_days, 0)  # Ensure non-negative
+
+def _fy_start_year_from_session() -> int:
+    """Return 2025 for FY 2025-26, etc., based on last_working_day (or today)."""
+    try:
+        d = st.session_state.get("last_working_day", date.today())
+        if isinstance(d, datetime):
+            d = d.date()
+    except Exception:
+        d = date.today()
+    return d.year if d.month >= 4 else d.year - 1
+
+# ====== Money: integer paise (fixed-point) ======
+# The calculation path converts rupee amounts to int64 paise once (to_paise), adds and
+# subtracts them exactly, and converts back to rupees (from_paise) only for storage/display.
+
+def to_paise(amount):
+    """Rupees (scalar or array-like) -> int64 paise, rounding half away from zero"""
+    a = np.round(np.asarray(amount, dtype=float) * 100, 6)  # drop float noise like 267.49999999999997
+    p = np.sign(a) * np.floor(np.abs(a) + 0.5)
+    return p.astype(np.int64) if p.ndim else int(p)
+
+def paise(amount: float) -> int:
+    """to_paise() of one amount in plain Python (same rounding, without a numpy round trip per value)"""
+    a = round(float(amount) * 100 * 1e6) / 1e6    # what np.round(x, 6) computes
+    p = int(abs(a) + 0.5)
+    return p if a >= 0 else -p
+
+def from_paise(paise):
+    """int64 paise (scalar or array-like) -> rupees as float"""
+    p = np.asarray(paise, dtype=np.int64)
+    return p / 100.0 if p.ndim else float(p) / 100.0
+
+def prorate_paise(full_paise, present_days, total_working_days):
+    """full × present/working rounded half-up to the paisa; exact integer maths for whole days"""
+    full = np.asarray(full_paise, dtype=np.int64)
+    days = np.asarray(present_days)
+    working = np.asarray(total_working_days)
+    safe = np.where(working > 0, working, 1)
+    if np.issubdtype(days.dtype, np.integer) and np.issubdtype(working.dtype, np.integer):
+        p = np.where(working > 0, (2 * full * days + safe) // (2 * safe), 0)
+    else:
+        p = to_paise(np.where(working > 0, full / 100.0 * days / safe, 0.0))
+    p = np.asarray(p, dtype=np.int64)
+    return p if p.ndim else int(p)
+
+def sum_money(amounts) -> float:
+    """Exact sum of rupee amounts (summed in paise)"""
+    return from_paise(int(np.sum(to_paise(list(amounts)), dtype=np.int64)))
+
+# Slabs as (lower bound, rate); each rate applies from its bound up to the next one
+OLD_REGIME_SLABS = [(250_000.0, 0.05), (500_000.0, 0.20), (1_000_000.0, 0.30)]
+OLD_REGIME_REBATE_LIMIT = 500_000.0    # 87A: no tax if income <= 5 lakh
+
+NEW_REGIME_SLABS = {
+    # FY 2025-26+
+    2025: [(400_000.0, 0.05), (800_000.0, 0.10), (1_200_000.0, 0.15),
+           (1_600_000.0, 0.20), (2_000_000.0, 0.25), (2_400_000.0, 0.30)],
+    # FY 2024-25
+    2024: [(300_000.0, 0.05), (600_000.0, 0.10), (900_000.0, 0.15),
+           (1_200_000.0, 0.20), (1_500_000.0, 0.30)],
+}
+NEW_REGIME_REBATE_LIMIT = {2025: 1_200_000.0, 2024: 700_000.0}   # 87A
+
+def _slab_tax(total_income: np.ndarray, slabs) -> np.ndarray:
+    tax = np.zeros_like(total_income)
+    for i, (lower, rate) in enumerate(slabs):
+        upper = slabs[i + 1][0] if i + 1 < len(slabs) else np.inf
+        tax += np.clip(total_income - lower, 0.0, upper - lower) * rate
+    return tax
+
+def _slab_tax_scalar(total_income: float, slabs) -> float:
+    """_slab_tax() of one income (same operations in the same order, so the same float result)"""
+    tax = 0.0
+    for i, (lower, rate) in enumerate(slabs):
+        upper = slabs[i + 1][0] if i + 1 < len(slabs) else math.inf
+        tax += min(max(total_income - lower, 0.0), upper - lower) * rate
+    return tax
+
+def tds_old_vectorized(total_income) -> np.ndarray:
+    """Old Regime TDS for an array of TOTAL INCOME (after std. deduction & investments), incl. 4% cess"""
+    ti = np.maximum(0.0, np.asarray(total_income, dtype=float))
+    tax = np.where(ti <= OLD_REGIME_REBATE_LIMIT, 0.0, _slab_tax(ti, OLD_REGIME_SLABS) * 1.04)
+    return from_paise(to_paise(tax))
+
+def tds_new_vectorized(total_income, fy_start: int) -> np.ndarray:
+    """New Regime TDS (FY-aware) for an array of TOTAL INCOME after std. deduction, incl. 4% cess"""
+    regime_year = 2025 if fy_start >= 2025 else 2024
+    ti = np.maximum(0.0, np.asarray(total_income, dtype=float))
+    rebate = np.asarray(total_income, dtype=float) <= NEW_REGIME_REBATE_LIMIT[regime_year]
+    tax = np.where(rebate, 0.0, _slab_tax(ti, NEW_REGIME_SLABS[regime_year]) * 1.04)
+    return from_paise(to_paise(tax))
+
+def tds_old_from_total_income(total_income: float) -> float:
+    """Old Regime: expects TOTAL INCOME already after std. deduction & investments."""
+    ti = max(0.0, float(total_income))
+    tax = 0.0 if ti <= OLD_REGIME_REBATE_LIMIT else _slab_tax_scalar(ti, OLD_REGIME_SLABS) * 1.04
+    return paise(tax) / 100.0
+
+def tds_new_from_total_income(total_income: float, fy_start: int = None) -> float:
+    """New Regime (FY-aware): expects TOTAL INCOME already after std. deduction."""
+    if fy_start is None:
+        fy_start = _fy_start_year_from_session()
+    regime_year = 2025 if fy_start >= 2025 else 2024
+    total_income = float(total_income)
+    if total_income <= NEW_REGIME_REBATE_LIMIT[regime_year]:
+        return 0.0
+    return paise(_slab_tax_scalar(max(0.0, total_income), NEW_REGIME_SLABS[regime_year]) * 1.04) / 100.0
+
+def calculate_years_of_service(doj, last_working_day):
+    """Calculate years of service from DOJ (typed 'DOJ Parsed' value or raw string) to last working day"""
+    try:
+        if isinstance(doj, str):
+            doj = parse_doj_series(pd.Series([doj])).iloc[0]
+        if pd.isna(doj):
+            raise ValueError("Date of Joining could not be parsed")
+        doj = pd.Timestamp(doj).to_pydatetime()
+        
+        # Parse last working day
+        if isinstance(last_working_day, str):
+            lwd = datetime.strptime(last_working_day, '%Y-%m-%d')
+        else:
+            lwd = last_working_day
+        
+        # Calculate difference
+        diff = relativedelta(lwd, doj)
+        
+        # Convert to years (including months and days as decimal)
+        years = diff.years + (diff.months / 12) + (diff.days / 365)
+        
+        return years
+    except Exception as e:
+        st.error(f"Error calculating service years: {e}")
+        return 0
+
+def years_for_gratuity(doj, lwd):
+    diff = relativedelta(lwd, doj)
+    # > 6 months counts as a full year
+    years = diff.years + (1 if (diff.months > 6 or (diff.months == 6 and diff.days > 0)) else 0)
+    return max(0, years)
+
+def calculate_gratuity(tenure_years, last_basic_da):
+    if tenure_years < 5:
+        return 0.0
+    raw = (tenure_years * last_basic_da * 15) / 26
+    return round(min(raw, 20_00_000), 2)   # ₹20 lakh cap for private sector
+
+# ====== Company-wide Gratuity Liability (vectorized) ======
+def _add_months_clamped(start_days, start_months, months):
+    """start + n months with the day clamped to month end (relativedelta semantics)"""
+    target_month = start_months + months.astype('timedelta64[M]')
+    target_first = target_month.astype('datetime64[D]')
+    month_len = ((target_month + np.timedelta64(1, 'M')).astype('datetime64[D]') - target_first).astype(np.int64)
+    day_offset = (start_days - start_months.astype('datetime64[D]')).astype(np.int64)
+    return target_first + np.minimum(day_offset, month_len - 1).astype('timedelta64[D]')
+
+def gratuity_years_vectorized(doj, lwd) -> np.ndarray:
+    """
+    Vectorized years_for_gratuity(): completed years, +1 when the remainder is > 6 months.
+    doj/lwd are datetime64 arrays (or a scalar lwd); NaT DOJ gives 0 years.
+    """
+    doj_d = np.asarray(doj, dtype='datetime64[D]')
+    lwd_d = np.broadcast_to(np.asarray(lwd, dtype='datetime64[D]'), doj_d.shape)
+    valid = ~np.isnat(doj_d)
+    doj_d = np.where(valid, doj_d, lwd_d)
+
+    doj_m = doj_d.astype('datetime64[M]')
+    months = (lwd_d.astype('datetime64[M]') - doj_m).astype(np.int64)
+    # Step back one month where the anniversary day hasn't been reached yet
+    months -= (_add_months_clamped(doj_d, doj_m, months) > lwd_d).astype(np.int64)
+    has_days = lwd_d > _add_months_clamped(doj_d, doj_m, months)
+
+    years, rem = np.divmod(months, 12)
+    years = years + ((rem > 6) | ((rem == 6) & has_days))
+    return np.where(valid, np.maximum(years, 0), 0)
+
+def gratuity_amount_vectorized(tenure_years, last_basic_da) -> np.ndarray:
+    """Vectorized calculate_gratuity(): 5-year eligibility and the ₹20 lakh cap"""
+    tenure_years = np.asarray(tenure_years, dtype=float)
+    raw = (tenure_years * np.asarray(last_basic_da, dtype=float) * 15) / 26
+    return np.round(np.where(tenure_years >= 5, np.minimum(raw, 20_00_000), 0.0), 2)
+
+def compute_gratuity_liability(employee_df: pd.DataFrame, as_of: date, projection_date: date) -> pd.DataFrame:
+    """Current and projected gratuity for every employee in one pass (Last Basic = Salary ÷ 3)"""
+    if DOJ_PARSED_COL in employee_df.columns:
+        doj = employee_df[DOJ_PARSED_COL]
+    elif 'Date of Joining' in employee_df.columns:
+        doj = parse_doj_series(employee_df['Date of Joining'])
+    else:
+        doj = pd.Series(pd.NaT, index=employee_df.index, dtype='datetime64[ns]')
+    salary = pd.to_numeric(employee_df.get('Salary', 0.0), errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    last_basic = np.round(salary / 3.0, 2)
+    doj_values = doj.to_numpy(dtype='datetime64[D]')
+
+    current_years = gratuity_years_vectorized(doj_values, np.datetime64(as_of, 'D'))
+    projected_years = gratuity_years_vectorized(doj_values, np.datetime64(projection_date, 'D'))
+
+    report = pd.DataFrame({
+        'Employee ID': employee_df['Employee ID'].to_numpy() if 'Employee ID' in employee_df.columns else None,
+        'Employee Name': employee_df['Employee Name'].to_numpy() if 'Employee Name' in employee_df.columns else '',
+        'BaseLocation': employee_df['BaseLocation'].to_numpy() if 'BaseLocation' in employee_df.columns else '',
+        'Designation': employee_df['Designation'].to_numpy() if 'Designation' in employee_df.columns else '',
+        'DOJ': doj.to_numpy(),
+        'Last Basic': last_basic,
+        'Service Years': current_years,
+        'Current Gratuity': gratuity_amount_vectorized(current_years, last_basic),
+        'Projected Service Years': projected_years,
+        'Projected Gratuity': gratuity_amount_vectorized(projected_years, last_basic),
+    })
+    report['DOJ Missing'] = report['DOJ'].isna()
+    return report
+
+def summarize_gratuity_liability(liability_df: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Group liability by a master column (BaseLocation / Designation)"""
+    summary = liability_df.groupby(by, dropna=False).agg(
+        Employees=('Current Gratuity', 'size'),
+        Eligible=('Service Years', lambda y: int((y >= 5).sum())),
+        Current_Liability=('Current Gratuity', 'sum'),
+        Projected_Liability=('Projected Gratuity', 'sum'),
+    ).rename(columns={'Current_Liability': 'Current Liability', 'Projected_Liability': 'Projected Liability'})
+    summary['Increase'] = summary['Projected Liability'] - summary['Current Liability']
+    return summary.sort_values('Current Liability', ascending=False).reset_index()
+
+def calculate_epf_with_limit(basic_salary, is_reduced=False):
+    """
+    Calculate EPF with company-specific rules:
+    - Max EPF deduction limit is ₹1,800 (₹15,000 * 12%)
+    - If salary reduced due to leave/absent, basic reduced proportionally
+    - If basic < ₹15,000: EPF = actual_basic * 12%
+    - If basic >= ₹15,000: EPF = ₹1,800 (max limit)
+    """
+    max_epf_basic = 15000
+    epf_rate = 0.12
+    max_epf_deduction = max_epf_basic * epf_rate  # ₹1,800
+    
+    if basic_salary <= max_epf_basic:
+        # If basic is less than ₹15,000, calculate 12% of actual basic
+        epf = basic_salary * epf_rate
+    else:
+        # If basic is ₹15,000 or more, EPF is capped at ₹1,800
+        epf = max_epf_deduction
+    
+    return round(epf, 2)
+
+# NEW: EPF computed from Employee Master profile (fixed or formula) then prorated
+def calculate_epf_prorated(full_month_basic, present_days, total_working_days, epf_profile=None):
+    """
+    Compute full-month EPF from Employee Master policy, then prorate by attendance.
+    - If 'fixed_full_month_epf' given: use it directly (can be 0, 1800, 10248, etc.)
+    - Else if 'applicable' is False: full EPF = 0.
+    - Else:
+        - If 'capped' True: EPF = rate * min(wage_base, cap_wage)
+        - If 'capped' False or None: EPF = rate * wage_base
+      where wage_base = epf_profile['wages'] if provided else full_month_basic
+    Finally, prorate: EPF * (present_days / total_working_days)
+    """
+    ratio = (present_days / total_working_days) if total_working_days else 0.0
+
+    if not epf_profile:
+        epf_profile = {'applicable': True, 'capped': None, 'rate': 0.12, 'cap_wage': 15000, 'wages': None, 'fixed_full_month_epf': None}
+
+    # Not applicable
+    if epf_profile.get('applicable') is False:
+        return 0.0, 0.0, ratio, "EPF not applicable"
+
+    # Fixed full-month EPF provided (our priority path)
+    if epf_profile.get('fixed_full_month_epf') is not None:
+        full_paise = to_paise(float(epf_profile['fixed_full_month_epf']))
+        epf_paise = prorate_paise(full_paise, present_days, total_working_days)
+        return from_paise(epf_paise), from_paise(full_paise), ratio, "Fixed full-month EPF from Employee Master"
+
+    rate = float(epf_profile.get('rate', 0.12))
+    cap_wage = float(epf_profile.get('cap_wage', 15000))
+    wages_base = epf_profile.get('wages')
+    if wages_base is None or wages_base <= 0:
+        wages_base = full_month_basic
+
+    if epf_profile.get('capped') is True:
+        full_epf = rate * min(wages_base, cap_wage)
+        reason = f"rate {rate*100:.1f}% × min(wage {wages_base:.0f}, cap {cap_wage:.0f})"
+    else:
+        full_epf = rate * wages_base
+        reason = f"rate {rate*100:.1f}% × wage {wages_base:.0f} (no cap)"
+
+    full_paise = to_paise(full_epf)
+    epf_paise = prorate_paise(full_paise, present_days, total_working_days)
+    return from_paise(epf_paise), from_paise(full_paise), ratio, reason
+
+def calculate_epf_prorated_vectorized(full_month_basic, present_days, total_working_days, epf_profile=None):
+    """calculate_epf_prorated() over arrays of months sharing one EPF profile -> (epf, full_epf, ratio) arrays"""
+    basic = np.asarray(full_month_basic, dtype=float)
+    days = np.asarray(present_days, dtype=np.int64)
+    working = np.asarray(total_working_days, dtype=np.int64)
+    ratio = np.where(working > 0, days / np.where(working > 0, working, 1), 0.0)
+
+    if not epf_profile:
+        epf_profile = {'applicable': True, 'capped': None, 'rate': 0.12, 'cap_wage': 15000, 'wages': None, 'fixed_full_month_epf': None}
+
+    if epf_profile.get('applicable') is False:
+        full_paise = np.zeros(basic.shape, dtype=np.int64)
+    elif epf_profile.get('fixed_full_month_epf') is not None:
+        full_paise = np.full(basic.shape, to_paise(float(epf_profile['fixed_full_month_epf'])), dtype=np.int64)
+    else:
+        rate = float(epf_profile.get('rate', 0.12))
+        cap_wage = float(epf_profile.get('cap_wage', 15000))
+        wages_base = epf_profile.get('wages')
+        wages = basic if wages_base is None or wages_base <= 0 else np.full(basic.shape, float(wages_base))
+        full_epf = rate * np.minimum(wages, cap_wage) if epf_profile.get('capped') is True else rate * wages
+        full_paise = to_paise(full_epf).reshape(basic.shape)
+
+    epf_paise = np.asarray(prorate_paise(full_paise, days, working), dtype=np.int64).reshape(basic.shape)
+    return from_paise(epf_paise), from_paise(full_paise), ratio
+
+def parse_holiday_text(text: str):
+    """'YYYY-MM-DD' dates separated by commas/newlines -> (dates, invalid entries)"""
+    holidays, invalid = [], []
+    for part in str(text or '').replace('\n', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            holidays.append(datetime.strptime(part, '%Y-%m-%d').date())
+        except ValueError:
+            invalid.append(part)
+    return holidays, invalid
+
+def working_days_vectorized(months, year, holidays_per_month):
+    """get_total_working_days() for many months of one year in a single numpy busday_count call"""
+    month_numbers = np.array([list(calendar.month_name).index(m) for m in months])
+    starts = np.array([f"{year}-{m:02d}" for m in month_numbers], dtype='datetime64[M]')
+    in_range = np.array(sorted({
+        h.isoformat() for month_number, hols in zip(month_numbers, holidays_per_month)
+        for h in hols if h.year == year and h.month == month_number
+    }), dtype='datetime64[D]')
+    return np.busday_count(starts.astype('datetime64[D]'), (starts + 1).astype('datetime64[D]'), holidays=in_range)
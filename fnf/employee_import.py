@@ -0,0 +1,228 @@
+"""
+Bulk Employee Master import from HRMS dumps (CSV or XLSX). Files are read in chunks, so a 50k-row
+dump never sits in memory as one frame; each chunk is validated and normalized like the Sheets load,
+and unusable rows are rejected with a reason. Valid rows become the local master snapshot
+(EMPLOYEE_MASTER_SNAPSHOT), which load_employee_data() reads in place of Google Sheets.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+import streamlit as st
+
+from .employees import EMPLOYEE_MASTER_SNAPSHOT, clear_employee_data_cache, infer_doj_formats, normalize_employee_master
+from .ui import st_fragment
+
+IMPORT_CHUNK_ROWS = 5000
+REQUIRED_COLUMNS = ['Employee ID', 'Employee Name', 'Salary']
+REJECT_REASON_COL = 'Reject Reason'
+_IMPORT_LOCK = threading.Lock()   # one import writes the snapshot at a time
+logger = logging.getLogger(__name__)
+
+def _cell_text(value) -> str:
+    """XLSX cell as the text a CSV export would hold (dates ISO, whole floats without .0)"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d') if value.time() == datetime.min.time() else value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _csv_chunks(path, chunk_rows):
+    yield from pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows,
+                           encoding='utf-8-sig', encoding_errors='replace')
+
+def _xlsx_chunks(path, chunk_rows):
+    """First worksheet, streamed with openpyxl read_only; the first row is the header"""
+    from openpyxl import load_workbook  # imported on first XLSX import
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [_cell_text(h) for h in header]
+        width = len(columns)
+        batch = []
+        for row in rows:
+            values = [_cell_text(v) for v in row[:width]]
+            if not any(values):
+                continue
+            batch.append(values + [''] * (width - len(values)))
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        wb.close()
+
+def reject_reasons(chunk: pd.DataFrame, seen_ids: set) -> pd.Series:
+    """Why each row can't be imported ('' if it can); first failing check wins. seen_ids: IDs already imported"""
+    raw_id = chunk['Employee ID'].str.strip()
+    ids = pd.to_numeric(raw_id, errors='coerce')
+    salary = pd.to_numeric(chunk['Salary'].str.replace(',', '').str.strip(), errors='coerce')
+    checks = [
+        (raw_id == '', "Employee ID missing"),
+        (ids.isna(), "Employee ID is not a number"),
+        ((ids <= 0) | (ids % 1 != 0), "Employee ID is not a valid ID"),
+        (chunk['Employee Name'].str.strip() == '', "Employee Name missing"),
+        (salary.isna(), "Salary missing or not a number"),
+        (salary < 0, "Salary is negative"),
+    ]
+    reasons = pd.Series('', index=chunk.index, dtype=object)
+    for failed, reason in checks:
+        reasons = reasons.mask((reasons == '') & failed.fillna(False), reason)
+
+    ok = reasons == ''
+    duplicate = ok & (ids.where(ok).duplicated() | ids.isin(seen_ids))
+    return reasons.mask(duplicate, "Duplicate Employee ID")
+
+def import_employee_master(path, file_type='csv', target=EMPLOYEE_MASTER_SNAPSHOT, rejects_path=None,
+                           chunk_rows=IMPORT_CHUNK_ROWS, progress: dict = None) -> dict:
+    """
+    Import an HRMS dump into the master snapshot at target (replaced only when the whole file is read).
+    Rejected rows go to rejects_path as CSV with a Reject Reason column. progress, if given, gets the
+    running row count under 'rows'. Returns {'rows', 'imported', 'rejected', 'doj_unparsed', 'reasons'}.
+    """
+    chunks = _xlsx_chunks(path, chunk_rows) if file_type == 'xlsx' else _csv_chunks(path, chunk_rows)
+    summary = {'rows': 0, 'imported': 0, 'rejected': 0, 'doj_unparsed': 0, 'reasons': {}}
+    seen_ids = set()
+    tmp = target + ".tmp"
+    with _IMPORT_LOCK:
+        try:
+            with open(tmp, "w", newline="", encoding="utf-8") as out, \
+                    open(rejects_path or os.devnull, "w", newline="", encoding="utf-8") as rejects:
+                for chunk in chunks:
+                    chunk.columns = [str(c).strip() for c in chunk.columns]
+                    if summary['rows'] == 0:
+                        missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+                        if missing:
+                            raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+                    reasons = reject_reasons(chunk, seen_ids)
+                    ok = reasons == ''
+                    bad = chunk[~ok].assign(**{REJECT_REASON_COL: reasons[~ok]})
+                    if len(bad):
+                        bad.to_csv(rejects, header=rejects.tell() == 0, index=False)
+
+                    good = normalize_employee_master(chunk[ok].copy())
+                    good.to_csv(out, header=summary['rows'] == 0, index=False)
+                    seen_ids.update(good['Employee ID'].astype(int))
+                    if 'Date of Joining' in good.columns:
+                        summary['doj_unparsed'] += int(infer_doj_formats(good['Date of Joining']).isna().sum())
+
+                    summary['rows'] += len(chunk)
+                    summary['imported'] += len(good)
+                    summary['rejected'] += len(bad)
+                    for reason, count in bad[REJECT_REASON_COL].value_counts().items():
+                        summary['reasons'][reason] = summary['reasons'].get(reason, 0) + int(count)
+                    if progress is not None:
+                        progress['rows'] = summary['rows']
+
+            if summary['imported'] == 0:
+                raise ValueError("No valid employee rows in the file")
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return summary
+
+def _run_import(job, path, file_type):
+    fd, rejects_path = tempfile.mkstemp(prefix="employee_import_rejects_", suffix=".csv")
+    os.close(fd)
+    try:
+        job['summary'] = import_employee_master(path, file_type, rejects_path=rejects_path, progress=job)
+        job['rejects_path'] = rejects_path
+        job['state'] = 'done'
+        logger.info("Employee Master imported from %s", job['file_name'],
+                    extra={k: job['summary'][k] for k in ('rows', 'imported', 'rejected')})
+    except Exception as e:
+        os.remove(rejects_path)
+        job['error'] = str(e)
+        job['state'] = 'failed'
+        logger.warning("Employee Master import of %s failed: %s", job['file_name'], e)
+    finally:
+        os.remove(path)
+
+def start_employee_import(uploaded_file) -> dict:
+    """Spool the upload to disk and import it on a worker thread; returns the job dict the UI polls"""
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+    fd, path = tempfile.mkstemp(prefix="employee_import_", suffix=ext)
+    uploaded_file.seek(0)
+    with os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(uploaded_file, f)
+    job = {'file_name': uploaded_file.name, 'state': 'running', 'rows': 0, 'summary': None, 'error': None,
+           'rejects_path': None, 'applied': False}
+    threading.Thread(target=_run_import, args=(job, path, 'xlsx' if ext == '.xlsx' else 'csv'),
+                     daemon=True).start()
+    return job
+
+def _import_status():
+    job = st.session_state.get('employee_import')
+    if not job:
+        return
+    if job['state'] == 'running':
+        st.info(f"⏳ Importing {job['file_name']}: {job['rows']:,} rows read...")
+        return
+    if job['state'] == 'failed':
+        st.error(f"Import of {job['file_name']} failed: {job['error']}")
+        return
+
+    if not job['applied']:
+        # New master on disk: drop the cached one and rerun the whole page so every tab picks it up
+        job['applied'] = True
+        clear_employee_data_cache()
+        st.rerun()
+
+    summary = job['summary']
+    st.success(f"✅ Imported {summary['imported']:,} of {summary['rows']:,} rows from {job['file_name']}")
+    if summary['doj_unparsed']:
+        st.warning(f"⚠️ {summary['doj_unparsed']:,} imported employee(s) have an unreadable Date of Joining")
+    if summary['rejected']:
+        st.warning(f"{summary['rejected']:,} row(s) rejected")
+        st.dataframe(pd.DataFrame(summary['reasons'].items(), columns=['Reason', 'Rows']),
+                     use_container_width=True, hide_index=True)
+        if job['rejects_path'] and os.path.exists(job['rejects_path']):
+            with open(job['rejects_path'], 'rb') as f:
+                st.download_button("📥 Download Rejected Rows (CSV)", data=f, mime="text/csv",
+                                   file_name=f"rejected_{os.path.splitext(job['file_name'])[0]}.csv")
+
+def employee_import_panel():
+    """Upload an HRMS dump and follow the import, which runs off the script thread"""
+    st.markdown("#### 📥 Import Employee Master")
+    st.caption(f"CSV or XLSX with at least these columns: {', '.join(REQUIRED_COLUMNS)}. "
+               "The imported master is used instead of the Google Sheet until it is removed.")
+
+    job = st.session_state.get('employee_import')
+    running = bool(job) and job['state'] == 'running'
+    if not running:
+        uploaded = st.file_uploader("Employee Master file", type=['csv', 'xlsx'], key="employee_import_file")
+        if uploaded is not None and st.button("🚀 Start Import", key="employee_import_start"):
+            previous = st.session_state.pop('employee_import', None)
+            if previous and previous['rejects_path'] and os.path.exists(previous['rejects_path']):
+                os.remove(previous['rejects_path'])
+            st.session_state.employee_import = start_employee_import(uploaded)
+            running = True
+
+    if running:
+        st_fragment(run_every=1)(_import_status)()
+    else:
+        _import_status()
+
+    if os.path.exists(EMPLOYEE_MASTER_SNAPSHOT):
+        modified = datetime.fromtimestamp(os.path.getmtime(EMPLOYEE_MASTER_SNAPSHOT)).strftime('%d/%m/%Y %H:%M')
+        st.caption(f"Imported master in use (imported {modified})")
+        if st.button("🗑️ Remove Imported Master (use Google Sheets)", key="employee_import_remove"):
+            os.remove(EMPLOYEE_MASTER_SNAPSHOT)
+            clear_employee_data_cache()
+            st.session_state.pop('employee_import', None)
+            st.rerun()
@@ -0,0 +1,480 @@
+"""Employee Master: Google Sheets (or imported snapshot) loading, Date of Joining parsing, search index and EPF profile."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import re
+import hashlib
+import importlib.util
+import logging
+import weakref
+
+from .monitoring import count, timed_call
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Google Sheets client libraries are slow to import and only needed when the master is
+# actually fetched (cache miss), so they're imported on first use; this is just a lookup.
+GOOGLE_SHEETS_AVAILABLE = importlib.util.find_spec("gspread") is not None
+
+def _google_sheets_client():
+    """(gspread, Credentials), imported on first use"""
+    import gspread
+    from google.oauth2.service_account import Credentials
+    return gspread, Credentials
+
+# ====== Date of Joining parsing (once per master load) ======
+DOJ_PARSED_COL = 'DOJ Parsed'
+DOJ_FORMAT_COL = 'DOJ Format'
+
+# Shape of the raw string -> strptime format; checked in order, first match wins
+DOJ_FORMAT_PATTERNS = [
+    (r'^\d{1,2}/\d{1,2}/\d{2}$', '%d/%m/%y'),
+    (r'^\d{1,2}/\d{1,2}/\d{4}$', '%d/%m/%Y'),
+    (r'^\d{4}-\d{1,2}-\d{1,2}$', '%Y-%m-%d'),
+    (r'^\d{4}-\d{1,2}-\d{1,2}[ T]\d{1,2}:\d{2}(:\d{2})?$', '%Y-%m-%d %H:%M:%S'),
+    (r'^\d{1,2}-\d{1,2}-\d{4}$', '%d-%m-%Y'),
+]
+
+def infer_doj_formats(values: pd.Series) -> pd.Series:
+    """Classify every DOJ string by shape; rows that match no pattern get None"""
+    s = values.fillna('').astype(str).str.strip()
+    formats = pd.Series(None, index=s.index, dtype=object)
+    for pattern, fmt in DOJ_FORMAT_PATTERNS:
+        hit = formats.isna() & s.str.match(pattern)
+        formats[hit] = fmt
+    return formats
+
+def parse_doj_series(values: pd.Series, formats: pd.Series = None) -> pd.Series:
+    """Parse a whole Date of Joining column, one to_datetime call per inferred format"""
+    s = values.fillna('').astype(str).str.strip()
+    if formats is None:
+        formats = infer_doj_formats(s)
+    parsed = pd.Series(pd.NaT, index=s.index, dtype='datetime64[ns]')
+    for fmt in formats.dropna().unique():
+        rows = formats == fmt
+        if fmt == '%Y-%m-%d %H:%M:%S':
+            parsed[rows] = pd.to_datetime(s[rows], format='ISO8601', errors='coerce').dt.normalize()
+        else:
+            parsed[rows] = pd.to_datetime(s[rows], format=fmt, errors='coerce')
+    return parsed
+
+def add_parsed_doj(df: pd.DataFrame) -> pd.DataFrame:
+    """Attach typed DOJ (datetime64) and the inferred format; unparsed rows are NaT / 'unparsed'"""
+    if 'Date of Joining' not in df.columns:
+        return df
+    formats = infer_doj_formats(df['Date of Joining'])
+    df[DOJ_PARSED_COL] = parse_doj_series(df['Date of Joining'], formats)
+    df[DOJ_FORMAT_COL] = formats.where(df[DOJ_PARSED_COL].notna(), 'unparsed')
+    return df
+
+def employee_doj(employee):
+    """Typed DOJ for one Employee Master row (None if missing or unparsed)"""
+    if DOJ_PARSED_COL in employee.index and pd.notna(employee[DOJ_PARSED_COL]):
+        return employee[DOJ_PARSED_COL].to_pydatetime()
+    if 'Date of Joining' in employee.index:
+        parsed = parse_doj_series(pd.Series([employee['Date of Joining']])).iloc[0]
+        if pd.notna(parsed):
+            return parsed.to_pydatetime()
+    return None
+
+def doj_parse_report(df: pd.DataFrame):
+    """Warn about Employee Master rows whose Date of Joining could not be parsed"""
+    if DOJ_FORMAT_COL not in df.columns:
+        return
+    failed = df[df[DOJ_FORMAT_COL] == 'unparsed']
+    if failed.empty:
+        return
+    st.markdown(f"""
+    <div class="warning-card">
+        ⚠️ {len(failed)} employee(s) have an unreadable Date of Joining — gratuity/tenure for them is treated as 0
+    </div>
+    """, unsafe_allow_html=True)
+    with st.expander("📅 Unparsed Date of Joining", expanded=False):
+        cols = [c for c in ['Employee ID', 'Employee Name', 'Date of Joining'] if c in failed.columns]
+        st.dataframe(failed[cols], use_container_width=True, hide_index=True)
+
+EMPLOYEE_MASTER_SNAPSHOT = "employee_master.csv"   # written by the bulk importer; used instead of Sheets when present
+
+def normalize_employee_master(df: pd.DataFrame) -> pd.DataFrame:
+    """Employee Master column types and row filters (Sheets load, imported snapshot and importer chunks)"""
+    if 'Employee ID' in df.columns:
+        df = df[(df['Employee ID'] != 0) & (df['Employee ID'] != '')]
+        try:
+            df['Employee ID'] = pd.to_numeric(df['Employee ID'], errors='coerce').astype('Int64')
+        except Exception:
+            pass
+
+    if 'Salary' in df.columns:
+        df['Salary'] = pd.to_numeric(df['Salary'].astype(str).str.replace(',', ''), errors='coerce')
+        df = df.dropna(subset=['Salary'])
+
+    for col in ['Employee Name', 'Designation', 'BaseLocation', 'PAN No.']:
+        if col in df.columns:
+            df[col] = df[col].fillna('').astype(str)
+
+    maybe_numeric_cols = [
+        'EPF Rate','PF Rate','EPF Wages','PF Wages','EPF Full Month',
+        'EPF Fixed','EPF Fixed Deduction','PF Wage Cap','EPF','PF',
+        'PF Deduction','EPF Deduction','Employee EPF','EPF Employee',
+        'PF Employee','Total EPF','EPF Amount','EPF Per Month','Employee PF Contribution',
+        'PF Amount','PF Per Month'
+    ]
+    for cname in maybe_numeric_cols:
+        if cname in df.columns:
+            df[cname] = pd.to_numeric(df[cname].astype(str).str.replace(',', ''), errors='coerce')
+
+    for cname in ['EPF Applicable','PF Applicable','EPF Capped','PF Capped']:
+        if cname in df.columns:
+            df[cname] = df[cname].astype(str)
+
+    return df
+
+def load_employee_data():
+    """Employee Master, cached for 5 minutes (calls and actual loads are counted for the cache hit ratio)"""
+    count("cache.employee_master.calls")
+    return _claim_master_version(_fetch_employee_data())
+
+def clear_employee_data_cache():
+    _fetch_employee_data.clear()
+
+@st.cache_data(ttl=300)
+@traced("load_employee_data")   # inside the cache: spans are actual loads, not cache hits
+def _fetch_employee_data():
+    """Load employee data from the imported master snapshot if there is one, else Google Sheets (no demo fallback)."""
+    count("cache.employee_master.misses")
+    if os.path.exists(EMPLOYEE_MASTER_SNAPSHOT):
+        df = pd.read_csv(EMPLOYEE_MASTER_SNAPSHOT, dtype=str, keep_default_na=False)
+        df = add_parsed_doj(normalize_employee_master(df))
+        logger.info("Employee Master loaded from %s", EMPLOYEE_MASTER_SNAPSHOT,
+                    extra={'source': 'snapshot', 'rows': len(df)})
+        return _stamp_master_version(df)
+
+    SCOPES = [
+        "https://www.googleapis.com/auth/spreadsheets.readonly",
+        "https://www.googleapis.com/auth/drive.readonly",
+    ]
+    try:
+        # Use secrets-only (recommended)
+        if "gcp_service_account" not in st.secrets:
+            st.error("Missing st.secrets['gcp_service_account']. Add your service-account JSON + spreadsheet_id (+ optional worksheet_name or worksheet_gid).")
+            st.stop()
+
+        s = st.secrets["gcp_service_account"]
+        gspread, Credentials = _google_sheets_client()
+        creds = Credentials.from_service_account_info(s, scopes=SCOPES)
+        gc = timed_call("sheets.authorize", gspread.authorize, creds)
+
+        spreadsheet_id = s.get("spreadsheet_id")
+        worksheet_name = s.get("worksheet_name", "Employee Master")
+        worksheet_gid = s.get("worksheet_gid")
+
+        if not spreadsheet_id:
+            st.error("st.secrets['gcp_service_account']['spreadsheet_id'] is required.")
+            st.stop()
+
+        ss = timed_call("sheets.open_by_key", gc.open_by_key, spreadsheet_id)
+        if worksheet_gid:
+            ws = timed_call("sheets.worksheet", ss.get_worksheet_by_id, int(worksheet_gid))
+        else:
+            ws = timed_call("sheets.worksheet", ss.worksheet, worksheet_name)
+
+        data = timed_call("sheets.get_all_records", ws.get_all_records)
+        if not data:
+            st.error("Google Sheet is empty or unreadable.")
+            st.stop()
+
+        df = pd.DataFrame(data)
+
+        df = add_parsed_doj(normalize_employee_master(df))
+        logger.info("Employee Master loaded from Google Sheets", extra={'source': 'sheets', 'rows': len(df)})
+
+        return _stamp_master_version(df)
+
+    except Exception as e:
+        logger.error("Google Sheets error: %s", e)
+        st.error(f"Google Sheets error: {e}")
+        st.stop()
+
+def get_employee_by_id(employee_id, df):
+    """Get employee details by ID"""
+    try:
+        # cast both to numeric safely
+        df_ids = pd.to_numeric(df['Employee ID'], errors='coerce')
+        employee_id = int(employee_id)
+        employee = df[df_ids == employee_id]
+        if not employee.empty:
+            return employee.iloc[0]
+    except Exception:
+        pass
+    return None
+
+# ====== Employee search index ======
+# Built once per Employee Master version: IDs as a sorted prefix index (a flattened trie:
+# every ID with a given prefix is one contiguous slice), names as token + trigram postings.
+
+EMPLOYEE_SEARCH_MIN_TRIGRAM_SHARE = 0.6   # fuzzy match needs most of the query's trigrams
+EMPLOYEE_PICKER_TOP_K = 25                # options offered by the 'Choose Employee' picker
+
+MASTER_VERSION_ATTR = 'employee_master_version'   # df.attrs entry set once per load by _fetch_employee_data
+_MASTER_VERSIONS = {}   # id(frame returned by load_employee_data) -> version, dropped when the frame is freed
+
+def employee_master_version(df: pd.DataFrame) -> str:
+    """
+    Content hash of the searchable columns; changes whenever IDs or names change. The frames
+    load_employee_data() returns are hashed once per load; any other frame is hashed here.
+    """
+    version = _MASTER_VERSIONS.get(id(df))
+    if version is not None:
+        return version
+    cols = [c for c in ('Employee ID', 'Employee Name') if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+def _stamp_master_version(df: pd.DataFrame) -> pd.DataFrame:
+    df.attrs[MASTER_VERSION_ATTR] = employee_master_version(df)
+    return df
+
+def _claim_master_version(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tie the load-time version (in df.attrs, which survives the cache's copy) to this frame object.
+    pandas copies attrs onto filtered or edited frames, so the version must not stay there.
+    """
+    version = df.attrs.pop(MASTER_VERSION_ATTR, None)
+    if version is not None:
+        _MASTER_VERSIONS[id(df)] = version
+        weakref.finalize(df, _MASTER_VERSIONS.pop, id(df), None)
+    return df
+
+def _name_tokens(name: str) -> list:
+    return re.findall(r"[a-z0-9]+", str(name).lower())
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _postings(pairs, n_keys: int) -> list:
+    """[(key_idx, row)] -> one sorted unique int32 row array per key"""
+    if not pairs:
+        return [np.empty(0, dtype=np.int32)] * n_keys
+    arr = np.unique(np.array(pairs, dtype=np.int64), axis=0)
+    bounds = np.searchsorted(arr[:, 0], np.arange(n_keys + 1))
+    rows = arr[:, 1].astype(np.int32)
+    return [rows[bounds[i]:bounds[i + 1]] for i in range(n_keys)]
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def build_employee_search_index(version: str, _df: pd.DataFrame) -> dict:
+    """Search index for one master version (cached as a shared read-only resource)"""
+    ids = pd.to_numeric(_df['Employee ID'], errors='coerce') if 'Employee ID' in _df.columns else pd.Series(dtype=float)
+    names = _df['Employee Name'].fillna('').astype(str).to_numpy() if 'Employee Name' in _df.columns else np.array([''] * len(_df))
+    id_strs = np.array([str(int(i)) if pd.notna(i) else '' for i in ids], dtype=object)
+
+    id_order = np.argsort(id_strs, kind='stable')
+    token_pairs, trigram_pairs = {}, {}
+    for row, name in enumerate(names):
+        for tok in _name_tokens(name):
+            token_pairs.setdefault(tok, []).append(row)
+            for tri in _trigrams(f" {tok} "):
+                trigram_pairs.setdefault(tri, []).append(row)
+
+    tokens = sorted(token_pairs)
+    trigrams = sorted(trigram_pairs)
+    return {
+        'version': version,
+        'size': len(_df),
+        'id_values': ids.fillna(-1).to_numpy(dtype=np.int64),
+        'id_sorted': id_strs[id_order].astype(str),
+        'id_order': id_order,
+        'tokens': np.array(tokens, dtype=str),
+        'token_rows': _postings([(i, r) for i, t in enumerate(tokens) for r in token_pairs[t]], len(tokens)),
+        'trigram_pos': {t: i for i, t in enumerate(trigrams)},
+        'trigram_rows': _postings([(i, r) for i, t in enumerate(trigrams) for r in trigram_pairs[t]], len(trigrams)),
+    }
+
+def employee_search_index(df: pd.DataFrame) -> dict:
+    """The search index for the current Employee Master"""
+    return build_employee_search_index(employee_master_version(df), df)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def build_employee_picker(version: str, _df: pd.DataFrame) -> dict:
+    """
+    The 'Choose Employee' picker for one master version: rows with a usable ID (typed Int64) plus
+    their "ID - Name" label in ID_Name, each ID's row position, and the search index over them.
+    """
+    frame = _df.copy()
+    frame['Employee ID'] = pd.to_numeric(frame['Employee ID'], errors='coerce').astype('Int64')
+    frame = frame.dropna(subset=['Employee ID']).reset_index(drop=True)
+    frame.attrs = {}
+    frame['ID_Name'] = frame['Employee ID'].astype(int).astype(str) + " - " + frame['Employee Name']
+    positions = {}
+    for pos, emp_id in enumerate(frame['Employee ID'].astype(int).tolist()):
+        positions.setdefault(emp_id, pos)
+    return {'frame': frame, 'positions': positions,
+            'index': build_employee_search_index(f"{version}:picker", frame)}
+
+def employee_picker(df: pd.DataFrame) -> dict:
+    """The picker for the current Employee Master (built once per master version)"""
+    return build_employee_picker(employee_master_version(df), df)
+
+def search_employees(index: dict, query: str, k: int = None) -> np.ndarray:
+    """
+    Row positions matching the query, best first (ties by Employee ID).
+    Scores: exact ID > ID prefix > every name token prefix-matched > fuzzy name (trigram overlap).
+    """
+    n = index['size']
+    query = str(query or '').strip().lower()
+    if not query or n == 0:
+        return np.empty(0, dtype=np.int64)
+    score = np.zeros(n, dtype=float)
+
+    if query.isdigit():
+        lo = np.searchsorted(index['id_sorted'], query, side='left')
+        hi = np.searchsorted(index['id_sorted'], query + '\x7f', side='left')
+        rows = index['id_order'][lo:hi]
+        score[rows] = np.where(index['id_sorted'][lo:hi] == query, 100.0, 50.0)
+
+    q_tokens = _name_tokens(query)
+    if q_tokens:
+        hits = np.zeros(n, dtype=np.int32)
+        for tok in q_tokens:
+            lo = np.searchsorted(index['tokens'], tok, side='left')
+            hi = np.searchsorted(index['tokens'], tok + '\uffff', side='left')
+            if hi - lo == 1:
+                hits[index['token_rows'][lo]] += 1
+            elif hi > lo:
+                hits[np.unique(np.concatenate(index['token_rows'][lo:hi]))] += 1
+        all_tokens = hits == len(q_tokens)
+        score[all_tokens] = np.maximum(score[all_tokens], 10.0 + len(q_tokens))
+
+    # fuzzy matches rank below token matches, so skip them when the top k is already full
+    if q_tokens and not (k and np.count_nonzero(score) >= k):
+        q_trigrams = set().union(*(_trigrams(tok) for tok in q_tokens))
+        postings = [index['trigram_rows'][index['trigram_pos'][t]] for t in q_trigrams if t in index['trigram_pos']]
+        if postings:
+            share = np.bincount(np.concatenate(postings), minlength=n) / len(q_trigrams)
+            fuzzy = share >= EMPLOYEE_SEARCH_MIN_TRIGRAM_SHARE
+            score[fuzzy] = np.maximum(score[fuzzy], 5.0 * share[fuzzy])
+
+    matches = np.flatnonzero(score > 0)
+    if k and len(matches) > k:
+        # only the best k need ordering: keep everything scoring at least the k-th best
+        kth = np.partition(score[matches], len(matches) - k)[len(matches) - k]
+        matches = matches[score[matches] >= kth]
+    ranked = matches[np.lexsort((index['id_values'][matches], -score[matches]))]
+    return ranked[:k] if k else ranked
+
+def parse_bool(val, default=None):
+    """Parse Yes/No/True/False/1/0 -> bool, else default"""
+    if pd.isna(val):
+        return default
+    s = str(val).strip().lower()
+    if s in {'yes','y','true','t','1'}:
+        return True
+    if s in {'no','n','false','f','0'}:
+        return False
+    return default
+
+def detect_epf_fixed_columns(df_columns):
+    """
+    Detect likely columns in Employee Master that hold the FULL-MONTH EPF
+    (employee contribution). We exclude 'employer' words.
+    """
+    candidates_exact = [
+        'EPF Full Month','EPF Fixed','EPF Fixed Deduction',
+        'EPF','PF','PF Deduction','EPF Deduction','Employee EPF',
+        'EPF Employee','PF Employee','Total EPF','EPF Amount','EPF Per Month',
+        'Employee PF Contribution','PF Amount','PF Per Month'
+    ]
+    found = [c for c in candidates_exact if c in df_columns]
+
+    # Fuzzy: any column containing EPF/PF + (amount|deduction|contribution|per month|monthly)
+    pattern = re.compile(r'(?:^|\s)(?!employer)(epf|pf).*(amount|deduction|contribution|per\s*month|monthly)', re.I)
+    for c in df_columns:
+        if c not in found and pattern.search(c or ''):
+            found.append(c)
+    # De-dup preserving order
+    seen = set()
+    uniq = []
+    for c in found:
+        if c not in seen:
+            uniq.append(c)
+            seen.add(c)
+    return uniq
+
+def extract_epf_profile(emp_row, preferred_epf_col=None, all_cols=None):
+    """
+    Extract EPF policy for this employee from Employee Master if present.
+    PRIORITY:
+      1) If preferred_epf_col chosen and has value -> fixed_full_month_epf = that value
+      2) Else scan detected EPF fixed columns -> first non-null numeric used
+      3) Else compute from wages/rate/cap flags (no default cap unless flagged)
+    """
+    profile = {
+        'applicable': True,                 # default: EPF applies
+        'capped': None,                     # default: no cap UNLESS column says so
+        'rate': 0.12,                       # default 12%
+        'cap_wage': 15000,                  # default wage cap if capped==True
+        'wages': None,                      # if provided (EPF Wages)
+        'fixed_full_month_epf': None        # if provided, use this exact value
+    }
+
+    # applicable
+    for c in ['EPF Applicable','PF Applicable']:
+        if c in emp_row.index:
+            profile['applicable'] = parse_bool(emp_row[c], default=profile['applicable'])
+
+    # capped (only when explicitly set)
+    for c in ['EPF Capped','PF Capped']:
+        if c in emp_row.index:
+            profile['capped'] = parse_bool(emp_row[c], default=profile['capped'])
+
+    # rate
+    for c in ['EPF Rate','PF Rate']:
+        if c in emp_row.index and pd.notna(emp_row[c]):
+            try:
+                r = float(str(emp_row[c]).replace(',', ''))
+                profile['rate'] = r/100.0 if r > 1.0 else r
+            except:
+                pass
+
+    # cap wage (if provided)
+    if 'PF Wage Cap' in emp_row.index and pd.notna(emp_row['PF Wage Cap']):
+        try:
+            cap = float(str(emp_row['PF Wage Cap']).replace(',', ''))
+            if cap > 0:
+                profile['cap_wage'] = cap
+        except:
+            pass
+
+    # wages base
+    for c in ['EPF Wages','PF Wages']:
+        if c in emp_row.index and pd.notna(emp_row[c]):
+            try:
+                w = float(str(emp_row[c]).replace(',', ''))
+                if w >= 0:
+                    profile['wages'] = w
+            except:
+                pass
+
+    # 1) Preferred fixed EPF column
+    if preferred_epf_col and preferred_epf_col in emp_row.index and pd.notna(emp_row[preferred_epf_col]):
+        try:
+            profile['fixed_full_month_epf'] = float(str(emp_row[preferred_epf_col]).replace(',', ''))
+            return profile
+        except:
+            pass
+
+    # 2) Scan detected fixed EPF columns
+    fixed_candidates = detect_epf_fixed_columns(all_cols or [])
+    for c in fixed_candidates:
+        if c in emp_row.index and pd.notna(emp_row[c]):
+            try:
+                val = float(str(emp_row[c]).replace(',', ''))
+                if val >= 0:
+                    profile['fixed_full_month_epf'] = val
+                    return profile
+            except:
+                continue
+
+    # 3) No fixed value found; compute later via wages/rate/cap
+    return profile
@@ -0,0 +1,152 @@
+"""Excel export of the F&F submission store, streamed row by row (xlsxwriter constant_memory mode)."""
+import numbers
+import os
+import tempfile
+from datetime import datetime
+
+# (header, submission key or getter, money column)
+SETTLEMENT_EXPORT_COLUMNS = [
+    ("Employee ID", 'employee_id', False),
+    ("Employee Name", 'employee_name', False),
+    ("Designation", 'designation', False),
+    ("Location", 'base_location', False),
+    ("Date of Joining", 'doj', False),
+    ("Resignation Date", 'resignation_date', False),
+    ("Last Working Day", 'last_working_day', False),
+    ("Status", 'status', False),
+    ("Tax Regime", 'tax_regime', False),
+    ("Service (years)", 'tenure_years', False),
+    ("Last Basic", 'last_basic_da', True),
+    ("Prorated Salary", lambda s: (s.get('salary_totals') or {}).get('prorated_total'), True),
+    ("Gratuity", 'gratuity', True),
+    ("Bonus", 'bonus', True),
+    ("Leave Encashment", 'leave_encashment', True),
+    ("Total Earnings", 'total_earnings', True),
+    ("EPF", lambda s: (s.get('salary_totals') or {}).get('total_epf'), True),
+    ("ESI", lambda s: (s.get('salary_totals') or {}).get('total_esi'), True),
+    ("PT", 'pt_total', True),
+    ("Salary Advance", 'salary_advance', True),
+    ("TADA Recovery", 'tada_recovery', True),
+    ("WFH Recovery", 'wfh_recovery', True),
+    ("Notice Period Recovery", 'notice_period_recovery', True),
+    ("Other Deductions", 'other_deductions', True),
+    ("Payroll Deductions", 'payroll_deductions', True),
+    ("Net Before Tax", 'net_before_tax', True),
+    ("Taxable Income", 'taxable_income', True),
+    ("TDS", 'tds_amount', True),
+    ("Total Deductions", 'total_deductions', True),
+    ("Net Payable", 'net_payable', True),
+    ("Reviewed By", 'tax_reviewed_by', False),
+    ("Review Date", 'tax_review_date', False),
+    ("Tax Comments", 'tax_comments', False),
+]
+
+# (header, month record key, money column)
+LEDGER_EXPORT_COLUMNS = [
+    ("Working Days", 'total_working_days', False),
+    ("Present Days", 'present_days', False),
+    ("Monthly Salary", 'total_salary', True),
+    ("Prorated Salary", 'prorated_salary', True),
+    ("Basic", 'prorated_basic', True),
+    ("HRA", 'prorated_hra', True),
+    ("Special Allowances", 'prorated_special', True),
+    ("EPF", 'epf', True),
+    ("ESI", 'esi', True),
+]
+
+# investments_data summary fields, written before the per-head breakdown
+TAX_SUMMARY_FIELDS = [
+    ('80c_total', "80C (eligible)"),
+    ('80d_total', "80D"),
+    ('other_deductions', "Other Deductions"),
+    ('exempt_allowances', "Exempt Allowances"),
+    ('total_deductions', "Total Tax Deductions"),
+]
+
+def _write_row(ws, row, values, money, money_fmt):
+    """Numbers as numbers, everything else as plain strings (never parsed as formulas)"""
+    for col, value in enumerate(values):
+        if value is None or value == '':
+            continue
+        if isinstance(value, bool):
+            ws.write_string(row, col, str(value))
+        elif isinstance(value, numbers.Real):
+            ws.write_number(row, col, value, money_fmt if money[col] else None)
+        else:
+            ws.write_string(row, col, str(value))
+
+def _add_sheet(wb, name, headers, widths, header_fmt):
+    ws = wb.add_worksheet(name)
+    for col, width in enumerate(widths):
+        ws.set_column(col, col, width)
+    ws.freeze_panes(1, 0)
+    for col, header in enumerate(headers):
+        ws.write_string(0, col, header, header_fmt)
+    return ws
+
+def write_submissions_xlsx(submissions, target) -> dict:
+    """
+    Write every submission to target (a path or binary file object) as three sheets:
+    Settlements (one row each), Monthly Ledger (one row per month) and Tax Breakdown (one row per
+    deduction head). Rows go straight from the store to the sheet files, so memory stays flat
+    however many settlements there are. Returns the row count per sheet.
+    """
+    import xlsxwriter  # imported on first export
+
+    wb = xlsxwriter.Workbook(target, {'constant_memory': True, 'nan_inf_to_errors': True,
+                                      'tmpdir': tempfile.gettempdir()})
+    header_fmt = wb.add_format({'bold': True, 'bg_color': '#667eea', 'font_color': 'white'})
+    money_fmt = wb.add_format({'num_format': '#,##0.00'})
+
+    ws_main = _add_sheet(wb, "Settlements", [h for h, _, _ in SETTLEMENT_EXPORT_COLUMNS],
+                         [14 if money else 18 for _, _, money in SETTLEMENT_EXPORT_COLUMNS], header_fmt)
+    ws_ledger = _add_sheet(wb, "Monthly Ledger",
+                           ["Employee ID", "Employee Name", "Month"] + [h for h, _, _ in LEDGER_EXPORT_COLUMNS],
+                           [12, 24, 12] + [14] * len(LEDGER_EXPORT_COLUMNS), header_fmt)
+    ws_tax = _add_sheet(wb, "Tax Breakdown",
+                        ["Employee ID", "Employee Name", "Tax Regime", "Item", "Amount"],
+                        [12, 24, 18, 24, 14], header_fmt)
+
+    main_money = [money for _, _, money in SETTLEMENT_EXPORT_COLUMNS]
+    ledger_money = [False, False, False] + [money for _, _, money in LEDGER_EXPORT_COLUMNS]
+    tax_money = [False, False, False, False, True]
+    counts = {'Settlements': 0, 'Monthly Ledger': 0, 'Tax Breakdown': 0}
+
+    for s in submissions:
+        counts['Settlements'] += 1
+        _write_row(ws_main, counts['Settlements'],
+                   [key(s) if callable(key) else s.get(key) for _, key, _ in SETTLEMENT_EXPORT_COLUMNS],
+                   main_money, money_fmt)
+
+        emp = [s.get('employee_id'), s.get('employee_name')]
+        for month, record in (s.get('active_months') or {}).items():
+            counts['Monthly Ledger'] += 1
+            _write_row(ws_ledger, counts['Monthly Ledger'],
+                       emp + [month] + [record.get(key) for _, key, _ in LEDGER_EXPORT_COLUMNS],
+                       ledger_money, money_fmt)
+
+        inv = s.get('investments_data') or {}
+        items = [(label, inv.get(key)) for key, label in TAX_SUMMARY_FIELDS if key in inv]
+        items += list((inv.get('breakdown') or {}).items())
+        for item, amount in items:
+            counts['Tax Breakdown'] += 1
+            _write_row(ws_tax, counts['Tax Breakdown'], emp + [s.get('tax_regime'), item, amount],
+                       tax_money, money_fmt)
+
+    for ws, name, width in ((ws_main, 'Settlements', len(SETTLEMENT_EXPORT_COLUMNS)),
+                            (ws_ledger, 'Monthly Ledger', 3 + len(LEDGER_EXPORT_COLUMNS)),
+                            (ws_tax, 'Tax Breakdown', 5)):
+        ws.autofilter(0, 0, max(counts[name], 1), width - 1)
+    wb.close()
+    return counts
+
+def export_submissions_to_tempfile(submissions) -> dict:
+    """Write the workbook to a temp file; returns {'path', 'file_name', 'counts'} for the download button"""
+    fd, path = tempfile.mkstemp(prefix="fnf_export_", suffix=".xlsx")
+    os.close(fd)
+    counts = write_submissions_xlsx(submissions, path)
+    return {
+        'path': path,
+        'file_name': f"fnf_export_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+        'counts': counts,
+    }
@@ -0,0 +1,215 @@
+"""
+F&F settlement letters: per-employee HTML statements from a precompiled template, and bulk ZIP batches.
+Standard library only, so the module is cheap to load in process-pool workers.
+"""
+import functools
+import html
+import os
+import re
+import string
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from multiprocessing import get_context
+
+COMPANY_NAME = "Koenig Solutions"
+LETTER_POOL_MIN_BATCH = 500   # ~0.1 ms per letter inline; smaller batches aren't worth the pickling
+LETTER_POOL_CHUNKSIZE = 50
+
+LETTER_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>F&amp;F Statement - $employee_name</title>
+<style>
+  body { font-family: Arial, Helvetica, sans-serif; color: #2d3436; margin: 2rem auto; max-width: 820px; }
+  h1 { color: #667eea; margin: 0; font-size: 1.6rem; }
+  h2 { color: #1f4e79; font-size: 1.1rem; border-bottom: 2px solid #667eea; padding-bottom: 0.3rem; margin-top: 1.8rem; }
+  table { width: 100%; border-collapse: collapse; margin-top: 0.5rem; }
+  th, td { padding: 0.35rem 0.5rem; border-bottom: 1px solid #e9ecef; text-align: left; }
+  td.amt, th.amt { text-align: right; white-space: nowrap; }
+  tr.total td { font-weight: bold; border-top: 2px solid #2d3436; }
+  .meta td { border: none; padding: 0.15rem 0.5rem; }
+  .net { background: #f8f9fa; border-left: 5px solid #667eea; padding: 1rem; font-size: 1.2rem; margin-top: 1.5rem; }
+  .note { color: #6c757d; font-size: 0.85rem; }
+  @media print { body { margin: 0; } }
+</style>
+</head>
+<body>
+<h1>$company</h1>
+<p class="note">Full &amp; Final Settlement Statement &middot; issued $issue_date &middot; status: $status</p>
+
+<table class="meta">
+  <tr><td>Employee</td><td><strong>$employee_name</strong> (ID $employee_id)</td><td>Designation</td><td>$designation</td></tr>
+  <tr><td>Location</td><td>$base_location</td><td>Date of Joining</td><td>$doj</td></tr>
+  <tr><td>Resignation Date</td><td>$resignation_date</td><td>Last Working Day</td><td>$last_working_day</td></tr>
+</table>
+
+<h2>Earnings</h2>
+<table>$earnings_rows</table>
+
+<h2>Monthly Salary Ledger</h2>
+<table>
+  <tr><th>Month</th><th class="amt">Present / Working Days</th><th class="amt">Monthly Salary</th><th class="amt">Prorated</th><th class="amt">EPF</th><th class="amt">ESI</th></tr>
+  $ledger_rows
+</table>
+
+<h2>Deductions</h2>
+<table>$deduction_rows</table>
+
+<h2>Gratuity Working</h2>
+<p>Gratuity = (Years &times; Last Basic &times; 15) &divide; 26, payable after 5 years of service, capped at &#8377;20,00,000.</p>
+<p>($tenure_years &times; &#8377;$last_basic &times; 15) &divide; 26 = &#8377;$raw_gratuity &rarr; $gratuity_note</p>
+
+<h2>TDS Working</h2>
+$tds_section
+
+<div class="net">Net Payable: <strong>&#8377;$net_payable</strong></div>
+<p class="note">This is a system-generated statement from the F&amp;F Settlement System.</p>
+</body>
+</html>
+""")
+
+def _num(value) -> float:
+    try:
+        return float(value if value is not None else 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _money(value) -> str:
+    return f"{_num(value):,.2f}"
+
+def _text(value) -> str:
+    return html.escape(str(value)) if value not in (None, '') else "&ndash;"
+
+def _amount_rows(items, total_label, total) -> str:
+    rows = [f'<tr><td>{html.escape(label)}</td><td class="amt">&#8377;{_money(amount)}</td></tr>'
+            for label, amount in items]
+    rows.append(f'<tr class="total"><td>{html.escape(total_label)}</td><td class="amt">&#8377;{_money(total)}</td></tr>')
+    return "\n  ".join(rows)
+
+def settlement_letter_html(submission: dict, issue_date: str = None) -> str:
+    """The F&F statement for one submission as a standalone HTML page"""
+    s = submission
+    totals = s.get('salary_totals') or {}
+    tax_done = bool(s.get('tax_calculated'))
+
+    earnings = [
+        ("Prorated Salary", totals.get('prorated_total')),
+        ("Gratuity", s.get('gratuity')),
+        ("Bonus", s.get('bonus')),
+        ("Leave Encashment", s.get('leave_encashment')),
+    ]
+    deductions = [
+        ("EPF", totals.get('total_epf')),
+        ("ESI", totals.get('total_esi')),
+        ("Professional Tax", s.get('pt_total')),
+        ("Salary Advance", s.get('salary_advance')),
+        ("TADA Recovery", s.get('tada_recovery')),
+        ("WFH Recovery", s.get('wfh_recovery')),
+        ("Notice Period Recovery", s.get('notice_period_recovery')),
+        ("Other Deductions", s.get('other_deductions')),
+    ]
+    if tax_done:
+        deductions.append(("TDS", s.get('tds_amount')))
+        if _num(s.get('additional_deductions')):
+            deductions.append(("Additional Tax Deductions", s.get('additional_deductions')))
+        total_deductions = s.get('total_deductions')
+    else:
+        total_deductions = _num(s.get('payroll_deductions')) + _num(s.get('pt_total'))
+
+    ledger_rows = "\n  ".join(
+        f'<tr><td>{html.escape(str(month))}</td>'
+        f'<td class="amt">{_num(r.get("present_days")):g} / {_num(r.get("total_working_days")):g}</td>'
+        f'<td class="amt">&#8377;{_money(r.get("total_salary"))}</td>'
+        f'<td class="amt">&#8377;{_money(r.get("prorated_salary"))}</td>'
+        f'<td class="amt">&#8377;{_money(r.get("epf"))}</td>'
+        f'<td class="amt">&#8377;{_money(r.get("esi"))}</td></tr>'
+        for month, r in (s.get('active_months') or {}).items()
+    ) or '<tr><td colspan="6">No monthly records</td></tr>'
+
+    tenure, last_basic = _num(s.get('tenure_years')), _num(s.get('last_basic_da'))
+    raw_gratuity = round(tenure * last_basic * 15 / 26, 2)
+    if tenure < 5:
+        gratuity_note = "not eligible (service under 5 years)"
+    elif raw_gratuity > 20_00_000:
+        gratuity_note = "capped at &#8377;20,00,000"
+    else:
+        gratuity_note = f"&#8377;{_money(raw_gratuity)}"
+    gratuity_note += f"; amount settled &#8377;{_money(s.get('gratuity'))}"
+
+    if tax_done:
+        inv = s.get('investments_data') or {}
+        tds_items = [
+            ("Gross Earnings", s.get('total_earnings')),
+            ("Section 80C (eligible)", inv.get('80c_total')),
+            ("Section 80D", inv.get('80d_total')),
+            ("Other Deductions", inv.get('other_deductions')),
+            ("Exempt Allowances", inv.get('exempt_allowances')),
+            ("Taxable Income", s.get('taxable_income')),
+        ]
+        tds_section = (f"<p>Regime: <strong>{_text(s.get('tax_regime'))}</strong></p>\n<table>"
+                       + _amount_rows(tds_items, "TDS", s.get('tds_amount')) + "</table>")
+        net_payable = s.get('net_payable')
+    else:
+        tds_section = '<p class="note">Pending Tax Team review: TDS is not yet calculated.</p>'
+        net_payable = s.get('net_before_tax')
+
+    return LETTER_TEMPLATE.substitute(
+        company=html.escape(COMPANY_NAME),
+        issue_date=issue_date or date.today().strftime('%d/%m/%Y'),
+        status=_text(s.get('status')),
+        employee_name=_text(s.get('employee_name')),
+        employee_id=_text(s.get('employee_id')),
+        designation=_text(s.get('designation')),
+        base_location=_text(s.get('base_location')),
+        doj=_text(s.get('doj')),
+        resignation_date=_text(s.get('resignation_date')),
+        last_working_day=_text(s.get('last_working_day')),
+        earnings_rows=_amount_rows(earnings, "Total Earnings", s.get('total_earnings')),
+        ledger_rows=ledger_rows,
+        deduction_rows=_amount_rows(deductions, "Total Deductions", total_deductions),
+        tenure_years=f"{tenure:.2f}",
+        last_basic=_money(last_basic),
+        raw_gratuity=_money(raw_gratuity),
+        gratuity_note=gratuity_note,
+        tds_section=tds_section,
+        net_payable=_money(net_payable),
+    )
+
+def letter_file_name(submission: dict) -> str:
+    """e.g. FnF_101_Asha_Sharma.html"""
+    name = re.sub(r"[^A-Za-z0-9]+", "_", str(submission.get('employee_name', ''))).strip("_") or "employee"
+    return f"FnF_{submission.get('employee_id', 'NA')}_{name}.html"
+
+def _render(args):
+    submission, issue_date = args
+    return letter_file_name(submission), settlement_letter_html(submission, issue_date)
+
+@functools.lru_cache(maxsize=1)
+def _letter_pool() -> ProcessPoolExecutor:
+    """One worker pool per server process, started on first use and reused by later batches"""
+    return ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 8), mp_context=get_context("spawn"))
+
+def _write_zip(path, letters):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, body in letters:
+            zf.writestr(name, body)
+
+def build_letters_zip(submissions: list, path) -> int:
+    """
+    Render a letter per submission into a ZIP at path; returns the count.
+    Large batches on multi-core hosts are rendered in the process pool, results streamed into the
+    archive in order; otherwise (or if the pool has died) rendering is inline.
+    """
+    issue_date = date.today().strftime('%d/%m/%Y')
+    jobs = [(s, issue_date) for s in submissions]
+    if len(jobs) >= LETTER_POOL_MIN_BATCH and (os.cpu_count() or 1) > 1:
+        try:
+            _write_zip(path, _letter_pool().map(_render, jobs, chunksize=LETTER_POOL_CHUNKSIZE))
+            return len(jobs)
+        except BrokenProcessPool:
+            _letter_pool.cache_clear()
+    _write_zip(path, map(_render, jobs))
+    return len(jobs)
@@ -0,0 +1,136 @@
+"""
+Application logs and runtime metrics for the Admin "Logs & Performance" panel.
+
+Logs: modules log to logging.getLogger(__name__) under "fnf"; setup_logging() (called by
+dashboard.main) sends those records to an in-memory ring buffer and a rotating JSON-lines file.
+Fields passed with extra={...} are kept as structured fields.
+
+Metrics (process-wide, all sessions): latency samples per name in ring buffers, and counters.
+Store writes and Sheets calls are always measured; hot-function latencies come from tracing
+spans, so they're only collected while rerun tracing is on. Standard library only.
+"""
+import functools
+import json
+import logging
+import logging.handlers
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "fnf.log")
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 5
+LOG_BUFFER_RECORDS = 2000
+LATENCY_SAMPLES = 1000       # most recent samples kept per name
+
+LOG_RECORDS = deque(maxlen=LOG_BUFFER_RECORDS)
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+_latency = {}
+_counters = {}
+_lock = threading.Lock()
+
+def _record_fields(record: logging.LogRecord) -> dict:
+    fields = {
+        'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+        'level': record.levelname,
+        'logger': record.name,
+        'message': record.getMessage(),
+    }
+    fields.update({k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS})
+    if record.exc_info:
+        fields['exception'] = logging.Formatter().formatException(record.exc_info)
+    return fields
+
+class _RingBufferHandler(logging.Handler):
+    def emit(self, record):
+        LOG_RECORDS.append(_record_fields(record))
+
+class _JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(_record_fields(record), default=str)
+
+@functools.lru_cache(maxsize=1)
+def setup_logging(level=logging.INFO) -> logging.Logger:
+    """Attach the ring buffer and rotating file handlers to the "fnf" logger (once per process)"""
+    app_logger = logging.getLogger("fnf")
+    app_logger.setLevel(level)
+    app_logger.addHandler(_RingBufferHandler())
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                                            backupCount=LOG_BACKUPS, encoding="utf-8")
+        file_handler.setFormatter(_JsonLinesFormatter())
+        app_logger.addHandler(file_handler)
+    except OSError as e:
+        app_logger.warning("File logging disabled: %s", e)
+    return app_logger
+
+def read_log_file(path=LOG_FILE, limit=LOG_BUFFER_RECORDS) -> list:
+    """Last `limit` records of the current log file (unparseable lines skipped)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = deque(f, maxlen=limit)
+    except OSError:
+        return []
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+# ====== Metrics ======
+
+def record_latency(name: str, ms: float):
+    samples = _latency.get(name)
+    if samples is None:
+        with _lock:
+            samples = _latency.setdefault(name, deque(maxlen=LATENCY_SAMPLES))
+    samples.append(ms)
+
+def count(name: str, n: int = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def counter(name: str) -> int:
+    return _counters.get(name, 0)
+
+def counters() -> dict:
+    with _lock:
+        return dict(_counters)
+
+def _percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of a non-empty ascending list"""
+    return ordered[max(1, math.ceil(len(ordered) * q / 100)) - 1]
+
+def latency_summary() -> list:
+    """[{'name', 'count', 'p50', 'p90', 'p99', 'max'}] in ms over each name's recent samples"""
+    rows = []
+    for name, samples in list(_latency.items()):
+        ordered = sorted(samples.copy())   # copy: other sessions may be appending
+        if ordered:
+            rows.append({'name': name, 'count': len(ordered), 'p50': _percentile(ordered, 50),
+                         'p90': _percentile(ordered, 90), 'p99': _percentile(ordered, 99), 'max': ordered[-1]})
+    return rows
+
+def timed_call(metric: str, fn, *args, **kwargs):
+    """fn(*args, **kwargs), counting '<metric>.calls' / '<metric>.errors' and recording its latency"""
+    start = time.perf_counter()
+    count(f"{metric}.calls")
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        count(f"{metric}.errors")
+        raise
+    finally:
+        record_latency(metric, (time.perf_counter() - start) * 1000)
+
+def reset_metrics():
+    with _lock:
+        _latency.clear()
+        _counters.clear()
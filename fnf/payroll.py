@@ -0,0 +1,413 @@
+"""Payroll Team dashboard: Employee Master, settlement, status, analytics and quick actions."""
+import streamlit as st
+import pandas as pd
+import os
+import tempfile
+from datetime import datetime, date
+
+from .admin import logs_and_performance_panel
+from .auth import is_admin
+from .ui import create_status_badge, metric, pagination_controls, render_metric_grid
+from .employee_import import employee_import_panel
+from .employees import doj_parse_report, employee_search_index, load_employee_data, search_employees
+from .calc import compute_gratuity_liability, summarize_gratuity_liability
+from .storage import fnf_submissions_version, save_fnf_data
+from .analytics import analytics_figures
+from .export import export_submissions_to_tempfile
+from .letters import build_letters_zip
+from .report import fnf_liability_report
+from .settlement import fnf_settlement_form_payroll_only
+
+def gratuity_liability_report(employee_df: pd.DataFrame):
+    """Company-wide gratuity liability section for the Analytics tab"""
+    st.markdown("### 🏆 Gratuity Liability (Company-wide)")
+
+    today = date.today()
+    fy_end = date(today.year + 1 if today.month >= 4 else today.year, 3, 31)
+    c1, c2 = st.columns(2)
+    with c1:
+        as_of = st.date_input("Liability as of", value=today, key="gratuity_as_of")
+    with c2:
+        projection_date = st.date_input("Project to", value=fy_end, key="gratuity_projection_date")
+
+    liability = compute_gratuity_liability(employee_df, as_of, projection_date)
+
+    render_metric_grid([
+        metric("Current Liability", f"₹{liability['Current Gratuity'].sum():,.0f}", icon="🏆"),
+        metric("Projected Liability", f"₹{liability['Projected Gratuity'].sum():,.0f}",
+               delta=f"as of {projection_date.strftime('%d/%m/%Y')}", icon="📈"),
+        metric("Eligible (5+ yrs)", int((liability['Service Years'] >= 5).sum()), icon="👥"),
+        metric("DOJ Unparsed", int(liability['DOJ Missing'].sum()), icon="⚠️"),
+    ])
+
+    money = {'Current Liability': "₹{:,.2f}", 'Projected Liability': "₹{:,.2f}", 'Increase': "₹{:,.2f}"}
+    g1, g2 = st.columns(2)
+    with g1:
+        st.markdown("#### 🌍 By Location")
+        st.dataframe(summarize_gratuity_liability(liability, 'BaseLocation').style.format(money),
+                     use_container_width=True, hide_index=True)
+    with g2:
+        st.markdown("#### 💼 By Designation")
+        st.dataframe(summarize_gratuity_liability(liability, 'Designation').style.format(money),
+                     use_container_width=True, hide_index=True)
+
+    st.download_button(
+        "📥 Download Gratuity Liability (CSV)",
+        data=liability.to_csv(index=False).encode("utf-8"),
+        file_name=f"gratuity_liability_{as_of.strftime('%Y%m%d')}.csv",
+        mime="text/csv",
+        use_container_width=True,
+    )
+
+def create_analytics_charts():
+    """Create enhanced analytics charts"""
+    if 'fnf_submissions' not in st.session_state or not st.session_state.fnf_submissions:
+        st.markdown("""
+        <div class="info-card">
+            📊 No data available for analytics. Submit some F&F settlements to see charts here.
+        </div>
+        """, unsafe_allow_html=True)
+        return
+
+    figures = analytics_figures(fnf_submissions_version(), st.session_state.fnf_submissions)
+    
+    if figures['status'] is not None:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['status'], use_container_width=True)
+        
+        with col2:
+            # Net Payable Distribution (pre-binned)
+            if figures['net_payable'] is not None:
+                st.plotly_chart(figures['net_payable'], use_container_width=True)
+    
+    # Tax Regime Analysis
+    if figures['regime_count'] is not None:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['regime_count'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['regime_total'], use_container_width=True)
+
+def payroll_dashboard():
+    """Enhanced Payroll Dashboard (no tax-investment inputs on Payroll)"""
+    st.markdown("""
+    <div class="main-header">
+        <h1>💼 Payroll Team Dashboard</h1>
+        <p>Comprehensive payroll management and F&F settlement processing</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Tabs
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "👥 Employee Master",
+        "📋 F&F Settlement",
+        "📊 F&F Status",
+        "📈 Analytics",
+        "🎯 Quick Actions",
+    ])
+
+    # --- Tab 1: Employee Master ---
+    with tab1:
+        st.markdown("""
+        <div class="employee-card">
+            <h3>👥 Employee Master Data</h3>
+            <p>Search and manage employee information</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        employee_df = load_employee_data()
+
+        if not employee_df.empty:
+            doj_parse_report(employee_df)
+
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                search_term = st.text_input("🔍 Search Employee (ID or Name)",
+                                            placeholder="Enter employee ID or name...")
+            with col2:
+                show_all = st.checkbox("Show All Employees", value=False)
+
+            if search_term or show_all:
+                if search_term and not show_all:
+                    matches = search_employees(employee_search_index(employee_df), search_term)
+                    filtered_df = employee_df.iloc[matches]
+                else:
+                    filtered_df = employee_df
+
+                avg_salary = filtered_df['Salary'].mean() if 'Salary' in filtered_df.columns else 0
+                locations = filtered_df['BaseLocation'].nunique() if 'BaseLocation' in filtered_df.columns else 0
+                designations = filtered_df['Designation'].nunique() if 'Designation' in filtered_df.columns else 0
+                render_metric_grid([
+                    metric("Total Employees", len(filtered_df), icon="👥"),
+                    metric("Average Salary", f"₹{avg_salary:,.0f}", icon="💰"),
+                    metric("Locations", locations, icon="🌍"),
+                    metric("Designations", designations, icon="💼"),
+                ])
+
+                start, end = pagination_controls(len(filtered_df), key="employee_search", page_sizes=(25, 50, 100))
+                st.dataframe(filtered_df.iloc[start:end], use_container_width=True, height=400)
+            else:
+                st.markdown("""
+                <div class="info-card">
+                    💡 Enter search terms or check "Show All Employees" to view data
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.error("Could not load employee data")
+
+    # --- Tab 2: F&F Settlement (Payroll flow only; NO tax investments here) ---
+    with tab2:
+        # 🔥 CHANGE THIS LINE:
+        fnf_settlement_form_payroll_only()  # ← Changed from fnf_settlement_form()
+
+    # --- Tab 3: F&F Status ---
+    with tab3:
+        st.markdown("""
+        <div class="employee-card">
+            <h3>📊 F&F Settlement Status</h3>
+            <p>Track and manage all F&F settlement submissions</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        if 'fnf_submissions' in st.session_state and st.session_state.fnf_submissions:
+            # Overview metrics
+            status_counts = {}
+            total_amounts = {}
+            for submission in st.session_state.fnf_submissions:
+                status = submission['status']
+                status_counts[status] = status_counts[status] + 1 if status in status_counts else 1
+                total_amounts[status] = total_amounts.get(status, 0) + submission.get('net_payable', 0)
+
+            st.markdown("### 📈 Status Overview")
+            render_metric_grid([
+                metric(status, count, delta=f"₹{total_amounts[status]:,.0f}", icon="📋")
+                for status, count in status_counts.items()
+            ])
+
+            st.markdown("---")
+
+            # Individual submissions
+            for submission in st.session_state.fnf_submissions:
+                status_badge = create_status_badge(submission['status'])
+
+                with st.expander(f"{submission['employee_name']} - {submission['status']}", expanded=False):
+                    col1, col2, col3 = st.columns(3)
+
+                    # Employee & regime info
+                    with col1:
+                        st.markdown(f"""
+                        <div class="metric-card">
+                            <h4>👤 Employee Info</h4>
+                            <p><strong>Employee:</strong> {submission['employee_name']}</p>
+                            <p><strong>Employee ID:</strong> {submission['employee_id']}</p>
+                            <p><strong>Last Working Day:</strong> {submission['last_working_day']}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                        if 'active_months' in submission:
+                            months_list = list(submission['active_months'].keys())
+                            st.markdown(f"**Months:** {', '.join(months_list)}")
+
+                    # Financial summary (no investment display on Payroll view)
+                    with col2:
+                        # Show different metrics based on calculation status
+                        if submission.get('tax_calculated', False):
+                            net_amount = submission.get('net_payable', 0)
+                            amount_label = "Net Payable"
+                        else:
+                            net_amount = submission.get('net_before_tax', 0)
+                            amount_label = "Net Before Tax"
+                            
+                        st.markdown(f"""
+                        <div class="metric-card">
+                            <h4>💰 Financial Summary</h4>
+                            <p><strong>Status:</strong> {status_badge}</p>
+                            <p><strong>Total Earnings:</strong> ₹{submission['total_earnings']:,.2f}</p>
+                            <p><strong>{amount_label}:</strong> ₹{net_amount:,.2f}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                        if 'salary_totals' in submission:
+                            st.markdown(f"""
+                            <div class="metric-card">
+                                <h4>📊 Salary Details</h4>
+                                <p><strong>Basic Salary:</strong> ₹{submission['salary_totals'].get('prorated_basic', 0):,.2f}</p>
+                                <p><strong>HRA:</strong> ₹{submission['salary_totals'].get('prorated_hra', 0):,.2f}</p>
+                                <p><strong>EPF:</strong> ₹{submission['salary_totals'].get('total_epf', 0):,.2f}</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                    # Actions
+                    with col3:
+                        if submission['status'] == 'Tax Approved':
+                            if st.button(f"💰 Process Payment", key=f"pay_{submission['employee_id']}"):
+                                submission['status'] = 'Payment Processed'
+                                submission['payment_processed_date'] = datetime.now().strftime('%d/%m/%Y %H:%M')
+                                save_fnf_data(submission)
+                                st.success("✅ Payment processed!")
+                                st.rerun()
+                        elif submission['status'] == 'Tax Rejected':
+                            if st.button(f"📝 Edit & Resubmit", key=f"edit_{submission['employee_id']}"):
+                                st.info("Go to F&F Settlement tab to edit and resend to Tax Team")
+
+                    # Show tax comments (read-only in payroll)
+                    if submission.get('tax_comments'):
+                        st.markdown(f"""
+                        <div class="info-card">
+                            <h4>💬 Tax Team Comments</h4>
+                            <p>{submission['tax_comments']}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="info-card">
+                📋 No F&F settlements submitted yet
+            </div>
+            """, unsafe_allow_html=True)
+
+    # --- Tab 4: Analytics & Reports ---
+    with tab4:
+        st.markdown("""
+        <div class="employee-card">
+            <h3>📈 Analytics & Reports</h3>
+            <p>Visual analytics and insights for F&F settlements</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        create_analytics_charts()
+
+        employee_df = load_employee_data()
+        if not employee_df.empty:
+            st.markdown("### 📊 Employee Statistics")
+            avg_salary = employee_df['Salary'].mean() if 'Salary' in employee_df.columns else 0
+            pending_fnf = len([s for s in st.session_state.get('fnf_submissions', [])
+                               if s['status'] != 'Payment Processed'])
+            locations = employee_df['BaseLocation'].nunique() if 'BaseLocation' in employee_df.columns else 0
+            render_metric_grid([
+                metric("Total Employees", len(employee_df), icon="👥"),
+                metric("Average Salary", f"₹{avg_salary:,.0f}", icon="💰"),
+                metric("Pending F&F", pending_fnf, icon="📋"),
+                metric("Locations", locations, icon="🌍"),
+            ])
+
+            st.markdown("---")
+            gratuity_liability_report(employee_df)
+
+    # --- Tab 5: Quick Actions ---
+    with tab5:
+        st.markdown("""
+        <div class="employee-card">
+            <h3>🎯 Quick Actions</h3>
+            <p>Frequently used actions and shortcuts</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        c1, c2, c3 = st.columns(3)
+
+        with c1:
+            st.markdown("""
+            <div class="metric-card">
+                <h4>📊 Bulk Operations</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            if st.button("📤 Export All F&F Data", use_container_width=True):
+                submissions = st.session_state.get('fnf_submissions', [])
+                if not submissions:
+                    st.warning("No F&F submissions to export")
+                else:
+                    previous = st.session_state.pop('fnf_export', None)
+                    if previous and os.path.exists(previous['path']):
+                        os.remove(previous['path'])
+                    try:
+                        with st.spinner("Writing workbook..."):
+                            st.session_state.fnf_export = export_submissions_to_tempfile(submissions)
+                    except Exception as e:
+                        st.error(f"Export failed: {e}")
+            export = st.session_state.get('fnf_export')
+            if export and os.path.exists(export['path']):
+                counts = export['counts']
+                st.caption(f"{counts['Settlements']} settlements · {counts['Monthly Ledger']} ledger rows · "
+                           f"{counts['Tax Breakdown']} tax rows")
+                with open(export['path'], 'rb') as f:
+                    st.download_button(
+                        "📥 Download F&F Export (XLSX)",
+                        data=f,
+                        file_name=export['file_name'],
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True,
+                    )
+            if st.button("📥 Import Employee Data", use_container_width=True):
+                st.session_state.show_employee_import = not st.session_state.get('show_employee_import', False)
+
+        with c2:
+            st.markdown("""
+            <div class="metric-card">
+                <h4>🔄 System Actions</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            if st.button("🔄 Refresh Data", use_container_width=True):
+                st.cache_data.clear()
+                st.success("✅ Data refreshed successfully!")
+                st.rerun()
+            if st.button("📊 Generate Report", use_container_width=True):
+                st.session_state.show_fnf_report = not st.session_state.get('show_fnf_report', False)
+            if st.button("📄 Settlement Letters", use_container_width=True):
+                approved = [s for s in st.session_state.get('fnf_submissions', []) if s['status'] == 'Tax Approved']
+                if not approved:
+                    st.warning("No Tax Approved settlements to generate letters for")
+                else:
+                    previous = st.session_state.pop('fnf_letters', None)
+                    if previous and os.path.exists(previous['path']):
+                        os.remove(previous['path'])
+                    fd, path = tempfile.mkstemp(prefix="fnf_letters_", suffix=".zip")
+                    os.close(fd)
+                    try:
+                        with st.spinner(f"Generating {len(approved)} settlement letters..."):
+                            count = build_letters_zip(approved, path)
+                        st.session_state.fnf_letters = {
+                            'path': path,
+                            'count': count,
+                            'file_name': f"fnf_letters_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+                        }
+                    except Exception as e:
+                        os.remove(path)
+                        st.error(f"Letter generation failed: {e}")
+            letters = st.session_state.get('fnf_letters')
+            if letters and os.path.exists(letters['path']):
+                st.caption(f"{letters['count']} settlement letters (Tax Approved)")
+                with open(letters['path'], 'rb') as f:
+                    st.download_button(
+                        "📥 Download Settlement Letters (ZIP)",
+                        data=f,
+                        file_name=letters['file_name'],
+                        mime="application/zip",
+                        use_container_width=True,
+                    )
+
+        with c3:
+            st.markdown("""
+            <div class="metric-card">
+                <h4>⚙️ Settings</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            if st.button("⚙️ System Settings", use_container_width=True):
+                st.info("⚙️ System settings panel ready for configuration")
+            if is_admin() and st.button("📋 View Logs", use_container_width=True):
+                st.session_state.show_logs_panel = not st.session_state.get('show_logs_panel', False)
+
+        if st.session_state.get('show_fnf_report'):
+            st.markdown("---")
+            fnf_liability_report()
+
+        if st.session_state.get('show_logs_panel') and is_admin():
+            st.markdown("---")
+            st.markdown("#### 📋 Logs & Performance")
+            logs_and_performance_panel()
+
+        if st.session_state.get('show_employee_import'):
+            st.markdown("---")
+            employee_import_panel()
@@ -0,0 +1,111 @@
+"""Month-end F&F liability report (Payroll Quick Actions), read from the submission store's aggregates."""
+import streamlit as st
+import pandas as pd
+from datetime import date, datetime
+
+from .aggregates import AGGREGATE_FIELDS, SETTLED_STATUSES, UNKNOWN
+from .storage import fnf_aggregates
+from .ui import metric, render_metric_grid
+
+REPORT_LABELS = {
+    'count': 'Settlements',
+    'gratuity': 'Gratuity',
+    'leave_encashment': 'Leave Encashment',
+    'epf': 'EPF',
+    'tds': 'TDS',
+    'net_payable': 'Net Payable',
+}
+MONEY_COLUMNS = [REPORT_LABELS[f] for f in AGGREGATE_FIELDS[1:]]
+CELL_DIMENSIONS = ['Status', 'Location', 'Exit Month', 'Regime']
+# (upper bound in days since the last working day, label); checked in order
+AGEING_BUCKETS = [(-1, "Before LWD"), (30, "0-30 days"), (60, "31-60 days"), (90, "61-90 days"), (None, "90+ days")]
+NO_EXIT_DATE = "No exit date"
+
+def liability_cells(aggregates: dict) -> pd.DataFrame:
+    """One row per aggregate cell (status, location, exit month, regime), amounts in rupees"""
+    df = pd.DataFrame([key + tuple(values) for key, values in aggregates['cells'].items()],
+                      columns=CELL_DIMENSIONS + [REPORT_LABELS[f] for f in AGGREGATE_FIELDS])
+    df[MONEY_COLUMNS] = df[MONEY_COLUMNS] / 100
+    return df
+
+def ageing_table(aggregates: dict, as_of: date, month: str = None) -> pd.DataFrame:
+    """Unsettled items by age since the last working day and status: count and net payable"""
+    rows = []
+    for (status, exit_iso), (count, net) in aggregates['ageing'].items():
+        if month and (exit_iso or UNKNOWN)[:7] != month:
+            continue
+        if exit_iso is None:
+            bucket = NO_EXIT_DATE
+        else:
+            days = (as_of - date.fromisoformat(exit_iso)).days
+            bucket = next(label for limit, label in AGEING_BUCKETS if limit is None or days <= limit)
+        rows.append((bucket, status, count, net / 100))
+    df = pd.DataFrame(rows, columns=['Age', 'Status', 'Items', 'Net Payable'])
+    order = [label for _, label in AGEING_BUCKETS] + [NO_EXIT_DATE]
+    df['Age'] = pd.Categorical(df['Age'], categories=order, ordered=True)
+    return df.groupby(['Age', 'Status'], observed=True, sort=True).sum().reset_index()
+
+def _totals_by(cells: pd.DataFrame, by) -> pd.DataFrame:
+    return cells.groupby(by, sort=True)[[REPORT_LABELS['count']] + MONEY_COLUMNS].sum().reset_index()
+
+def _table(df: pd.DataFrame):
+    st.dataframe(df.style.format({c: "₹{:,.2f}" for c in MONEY_COLUMNS if c in df.columns}),
+                 use_container_width=True, hide_index=True)
+
+def fnf_liability_report():
+    """Settlements by status, amounts by location / exit month / regime and ageing of unsettled items"""
+    st.markdown("#### 📊 Month-End F&F Liability Report")
+    aggregates = fnf_aggregates()
+    if not aggregates['cells']:
+        st.info("No F&F submissions to report on yet")
+        return
+
+    cells = liability_cells(aggregates)
+    today = date.today()
+    months = sorted(set(cells['Exit Month']) - {UNKNOWN}, reverse=True)
+    month = st.selectbox("Exit month", ["All months"] + months, key="fnf_report_month")
+    if month != "All months":
+        cells = cells[cells['Exit Month'] == month]
+    outstanding = cells[~cells['Status'].isin(SETTLED_STATUSES)]
+
+    render_metric_grid([
+        metric("Settlements", int(cells['Settlements'].sum()), icon="📋"),
+        metric("Outstanding Net Payable", f"₹{outstanding['Net Payable'].sum():,.0f}",
+               delta=f"{int(outstanding['Settlements'].sum())} not yet paid", icon="💰"),
+        metric("Gratuity", f"₹{cells['Gratuity'].sum():,.0f}", icon="🏆"),
+        metric("Leave Encashment", f"₹{cells['Leave Encashment'].sum():,.0f}", icon="🏖️"),
+        metric("EPF", f"₹{cells['EPF'].sum():,.0f}", icon="🏦"),
+        metric("TDS", f"₹{cells['TDS'].sum():,.0f}", icon="🧾"),
+    ], columns=3)
+    st.caption(f"As of {today.strftime('%d/%m/%Y')}. Net payable is the payroll figure before tax until "
+               "the Tax Team has calculated TDS.")
+
+    st.markdown("##### By Status")
+    _table(_totals_by(cells, 'Status'))
+
+    st.markdown("##### By Location, Month and Regime")
+    t1, t2, t3, t4 = st.tabs(["🌍 Location", "📅 Exit Month", "⚖️ Regime", "🧮 All Dimensions"])
+    with t1:
+        _table(_totals_by(cells, 'Location'))
+    with t2:
+        _table(_totals_by(cells, 'Exit Month'))
+    with t3:
+        _table(_totals_by(cells, 'Regime'))
+    with t4:
+        _table(_totals_by(cells, ['Location', 'Exit Month', 'Regime']))
+
+    st.markdown("##### ⏳ Ageing of Pending Items")
+    ageing = ageing_table(aggregates, today, None if month == "All months" else month)
+    if ageing.empty:
+        st.success("✅ Every settlement in this period has been paid")
+    else:
+        st.caption("Age is counted from the last working day")
+        _table(ageing)
+
+    st.download_button(
+        "📥 Download Report (CSV)",
+        data=_totals_by(cells, CELL_DIMENSIONS).to_csv(index=False),
+        file_name=f"fnf_liability_{month.replace(' ', '_').lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv",
+        use_container_width=True,
+    )
@@ -0,0 +1,1287 @@
+"""Payroll F&F settlement form: multi-month salary input, incremental settlement graph and submission."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime, date
+
+from .ui import create_enhanced_metric_card, metric, render_metric_grid
+from .employees import (
+    EMPLOYEE_PICKER_TOP_K, detect_epf_fixed_columns, employee_doj, employee_picker,
+    extract_epf_profile, load_employee_data, search_employees,
+)
+from .calc import (
+    calculate_epf_prorated, calculate_epf_prorated_vectorized, calculate_gratuity,
+    from_paise, get_total_working_days, parse_holiday_text, to_paise,
+    working_days_vectorized, years_for_gratuity,
+)
+from .tax import ensure_regime_comparison
+from .storage import mark_fnf_submissions_changed, save_fnf_data
+from .letters import letter_file_name, settlement_letter_html
+
+def holiday_input_section(month):
+    """Add holiday input section for each month"""
+    st.markdown("#### 📅 Holidays (Optional)")
+    holidays_text = st.text_area(
+        f"Holidays in {month} (one date per line, format: YYYY-MM-DD)",
+        placeholder="2024-01-26\n2024-01-15",
+        key=f"holidays_{month}",
+        help="Enter holiday dates that should be excluded from working days"
+    )
+    
+    holidays = []
+    if holidays_text.strip():
+        for line in holidays_text.strip().split('\n'):
+            line = line.strip()
+            if line:
+                try:
+                    holiday_date = datetime.strptime(line, '%Y-%m-%d').date()
+                    holidays.append(holiday_date)
+                except ValueError:
+                    st.warning(f"Invalid date format: {line}. Use YYYY-MM-DD format.")
+    
+    return holidays
+
+# ====== Incremental settlement graph ======
+# month inputs -> month derivations -> totals -> net. Inputs are set every rerun from the
+# widgets; only nodes downstream of a changed input are recomputed, everything else is reused.
+
+def new_settlement_graph():
+    """Empty dependency graph (plain dict so it lives in session_state)"""
+    return {
+        'inputs': {},        # node -> value set from widgets
+        'rules': {},         # node -> (fn, deps)
+        'values': {},        # node -> cached derived value
+        'dependents': {},    # node -> set of nodes that read it
+        'recomputed': [],    # nodes recomputed since graph_begin_run()
+    }
+
+def settlement_graph():
+    """The session's settlement graph (created on first use)"""
+    if 'settlement_graph' not in st.session_state:
+        st.session_state.settlement_graph = new_settlement_graph()
+    return st.session_state.settlement_graph
+
+def graph_begin_run(graph):
+    graph['recomputed'] = []
+
+def _graph_invalidate(graph, node):
+    stack = [node]
+    while stack:
+        for dependent in graph['dependents'].get(stack.pop(), ()):
+            if dependent in graph['values']:
+                del graph['values'][dependent]
+                stack.append(dependent)
+
+def graph_set_input(graph, node, value) -> bool:
+    """Set an input value; invalidates downstream nodes only if it actually changed"""
+    if node in graph['inputs'] and graph['inputs'][node] == value:
+        return False
+    graph['inputs'][node] = value
+    _graph_invalidate(graph, node)
+    return True
+
+def graph_define(graph, node, fn, deps):
+    """Register how a derived node is computed; re-wiring its deps invalidates it"""
+    deps = tuple(deps)
+    previous = graph['rules'].get(node)
+    if previous and previous[1] != deps:
+        for dep in previous[1]:
+            graph['dependents'].get(dep, set()).discard(node)
+        graph['values'].pop(node, None)
+        _graph_invalidate(graph, node)
+    graph['rules'][node] = (fn, deps)
+    for dep in deps:
+        graph['dependents'].setdefault(dep, set()).add(node)
+
+def graph_get(graph, node):
+    """Value of a node, recomputing it (and stale deps) only if invalidated"""
+    if node in graph['inputs']:
+        return graph['inputs'][node]
+    if node in graph['values']:
+        return graph['values'][node]
+    fn, deps = graph['rules'][node]
+    value = fn(*[graph_get(graph, dep) for dep in deps])
+    graph['values'][node] = value
+    graph['recomputed'].append(node)
+    return value
+
+def _month_epf(base, split, epf_profile):
+    return calculate_epf_prorated(split['basic'], base['present_days'], base['total_working_days'], epf_profile)
+
+def derive_month_record(base, split, esi, epf, epf_result):
+    """Prorated components + verification table for one month"""
+    total_salary = base['total_salary']
+    present_days = base['present_days']
+    total_working_days = base['total_working_days']
+    basic, hra, special_allowances = split['basic'], split['hra'], split['special_allowances']
+    _, epf_full, ratio, _ = epf_result
+
+    if present_days > 0 and total_working_days > 0:
+        prorated_salary = (total_salary / total_working_days) * present_days
+        prorated_basic = (basic / total_working_days) * present_days
+        prorated_hra = (hra / total_working_days) * present_days
+        prorated_special = (special_allowances / total_working_days) * present_days
+    else:
+        prorated_salary = prorated_basic = prorated_hra = prorated_special = 0
+
+    total_breakdown = basic + hra + special_allowances
+    verification_df = pd.DataFrame({
+        'Component': ['Basic Salary', 'HRA', 'Special Allowances', 'TOTAL', 'EPF'],
+        'Formula': [
+            'Total ÷ 3',
+            '50% of Basic', 
+            'Rest Amount',
+            'Sum of All',
+            'Full-month EPF × (present/working)'
+        ],
+        'Amount': [
+            f"₹{basic:,.2f}",
+            f"₹{hra:,.2f}",
+            f"₹{special_allowances:,.2f}",
+            f"₹{total_breakdown:,.2f}",
+            f"₹{epf:,.2f}"
+        ],
+        'Percentage': [
+            f"{(basic/total_salary*100) if total_salary > 0 else 0:.1f}%",
+            f"{(hra/total_salary*100) if total_salary > 0 else 0:.1f}%",
+            f"{(special_allowances/total_salary*100) if total_salary > 0 else 0:.1f}%",
+            "100.0%",
+            ""
+        ]
+    })
+
+    return {
+        'record': {
+            'total_salary': total_salary,
+            'basic': basic,
+            'hra': hra,
+            'special_allowances': special_allowances,
+            'present_days': present_days,
+            'epf': epf,
+            'esi': esi,
+            'holidays': base['holidays'],
+            'total_working_days': total_working_days,
+            'prorated_salary': prorated_salary,
+            'prorated_basic': prorated_basic,
+            'prorated_hra': prorated_hra,
+            'prorated_special': prorated_special,
+            'attendance_ratio': ratio,
+            'epf_full_month': epf_full,
+        },
+        'month': base['month'],
+        'total_breakdown': total_breakdown,
+        'verification': verification_df,
+    }
+
+# totals key -> month record field
+MONTH_TOTAL_FIELDS = {
+    'total_salary': 'total_salary', 'prorated_total': 'prorated_salary',
+    'prorated_basic': 'prorated_basic', 'prorated_hra': 'prorated_hra',
+    'prorated_special': 'prorated_special', 'total_epf': 'epf', 'total_esi': 'esi',
+}
+
+def summarize_settlement_months(*month_results):
+    """Active months, paise-exact totals and the summary table"""
+    active_months = {
+        r['month']: r['record'] for r in month_results
+        if r['record']['total_salary'] > 0 or r['record']['present_days'] > 0
+    }
+    month_paise = to_paise(
+        [[rec[field] for field in MONTH_TOTAL_FIELDS.values()] for rec in active_months.values()]
+    ).reshape(-1, len(MONTH_TOTAL_FIELDS))
+    totals_paise = dict(zip(MONTH_TOTAL_FIELDS, (int(p) for p in month_paise.sum(axis=0))))
+    totals = {key: from_paise(p) for key, p in totals_paise.items()}
+
+    summary_data = []
+    for month, data in active_months.items():
+        summary_data.append({
+            'Month': month,
+            'Total Salary': f"₹{data['total_salary']:,.0f}",
+            'Days': f"{data['present_days']}/{data['total_working_days']}",
+            'Prorated Basic': f"₹{data['prorated_basic']:,.0f}",
+            'Prorated HRA': f"₹{data['prorated_hra']:,.0f}",
+            'Prorated Special': f"₹{data['prorated_special']:,.0f}",
+            'EPF': f"₹{data['epf']:,.0f} ✅",
+            'ESI': f"₹{data['esi']:,.0f}"
+        })
+    summary_data.append({
+        'Month': '🔢 TOTAL',
+        'Total Salary': f"₹{totals['total_salary']:,.0f}",
+        'Days': '—',
+        'Prorated Basic': f"₹{totals['prorated_basic']:,.0f}",
+        'Prorated HRA': f"₹{totals['prorated_hra']:,.0f}",
+        'Prorated Special': f"₹{totals['prorated_special']:,.0f}",
+        'EPF': f"₹{totals['total_epf']:,.0f}",
+        'ESI': f"₹{totals['total_esi']:,.0f}"
+    })
+
+    full_epf_list = [rec['epf_full_month'] for rec in active_months.values() if 'epf_full_month' in rec]
+    return {
+        'active_months': active_months,
+        'totals': totals,
+        'totals_paise': totals_paise,
+        'summary_df': pd.DataFrame(summary_data),
+        'avg_epf': totals['total_epf'] / len(active_months) if active_months else 0,
+        'avg_full_epf': (sum(full_epf_list) / len(full_epf_list)) if full_epf_list else 0,
+    }
+
+PAYROLL_INPUT_KEYS = [
+    'gratuity', 'bonus', 'leave_encashment', 'pt_total', 'salary_advance',
+    'tada_recovery', 'wfh_recovery', 'notice_period_recovery', 'other_deductions',
+]
+
+def compute_payroll_net(summary, payroll_inputs):
+    """Earnings, payroll deductions and net before tax from month totals + form inputs (paise)"""
+    totals_paise = summary['totals_paise']
+    data_paise = {key: to_paise(payroll_inputs[key]) for key in PAYROLL_INPUT_KEYS}
+
+    total_earnings = (totals_paise['prorated_total'] + data_paise['gratuity']
+                      + data_paise['bonus'] + data_paise['leave_encashment'])
+    payroll_deductions = (
+        totals_paise['total_epf'] + totals_paise['total_esi'] + data_paise['salary_advance']
+        + data_paise['tada_recovery'] + data_paise['wfh_recovery']
+        + data_paise['notice_period_recovery'] + data_paise['other_deductions']
+    )
+    net_before_tax = total_earnings - payroll_deductions - data_paise['pt_total']
+
+    return {
+        'total_earnings': from_paise(total_earnings),
+        'payroll_deductions': from_paise(payroll_deductions),
+        'pt_deduction': from_paise(data_paise['pt_total']),
+        'net_before_tax': from_paise(net_before_tax),
+    }
+
+def salary_breakdown_input_with_epf(month, base_salary=0.0, present_days=0, total_working_days=1, epf_profile=None,
+                                    esi=0.0, holidays=None, graph=None):
+    """Enhanced salary breakdown with EPF calculation (EPF and verification come from the settlement graph)"""
+    if graph is None:
+        graph = new_settlement_graph()
+    graph_set_input(graph, 'epf_profile', epf_profile)
+    graph_set_input(graph, ('base', month), {
+        'month': month, 'total_salary': base_salary, 'present_days': present_days,
+        'total_working_days': total_working_days, 'holidays': list(holidays or []),
+    })
+    graph_set_input(graph, ('esi', month), esi)
+
+    st.markdown(f"""
+    <div class="calculation-box">
+        <h3>💰 Salary Breakdown for {month}</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Calculate salary breakdown using correct formula
+    basic_salary = base_salary / 3  # Basic = Total ÷ 3
+    hra = basic_salary * 0.50       # HRA = 50% of Basic
+    special_allowances = base_salary - basic_salary - hra  # Rest amount
+    
+    # Handle case where salary is reduced due to absences
+    is_salary_reduced = present_days < total_working_days
+    if is_salary_reduced:
+        reduction_ratio = present_days / total_working_days if total_working_days > 0 else 1
+        prorated_basic = basic_salary * reduction_ratio
+    else:
+        prorated_basic = basic_salary
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        basic = st.number_input(
+            f"Basic Salary (₹)", 
+            min_value=0.0, 
+            value=basic_salary,
+            key=f"basic_{month}",
+            step=100.0,
+            help="Basic = Total Salary ÷ 3"
+        )
+        
+        if is_salary_reduced:
+            st.markdown(f"""
+            <div class="warning-card">
+                ⚠️ Prorated Basic: ₹{prorated_basic:,.2f}<br>
+                <small>Ratio: {present_days}/{total_working_days}</small>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with col2:
+        hra = st.number_input(
+            f"HRA (₹)", 
+            min_value=0.0, 
+            value=basic * 0.50,
+            key=f"hra_{month}",
+            step=50.0,
+            help="HRA = 50% of Basic Salary"
+        )
+    
+    with col3:
+        # Calculate rest amount
+        rest_amount = base_salary - basic - hra
+        special_allowances = st.number_input(
+            f"Special Allowances (₹)", 
+            min_value=0.0, 
+            value=rest_amount,
+            key=f"special_{month}",
+            step=50.0,
+            help="Special = Total - Basic - HRA"
+        )
+    
+    graph_set_input(graph, ('split', month), {'basic': basic, 'hra': hra, 'special_allowances': special_allowances})
+
+    # EPF Calculation Section (from Employee Master + proration)
+    st.markdown("### 🏦 EPF Calculation")
+    graph_define(graph, ('epf', month), _month_epf, [('base', month), ('split', month), 'epf_profile'])
+    epf_prorated, epf_full, ratio, reason = graph_get(graph, ('epf', month))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="info-card">
+            <h4>EPF Calculation Logic (Employee Master)</h4>
+            <p>• Full-month EPF (before proration): <strong>₹{epf_full:,.2f}</strong></p>
+            <p>• Basis: {reason}</p>
+            <p>• Attendance ratio: {present_days}/{total_working_days} = {ratio:.2f}</p>
+            <p>• Final EPF = Full EPF × Ratio = ₹{epf_full:,.2f} × {ratio:.2f} = <strong>₹{epf_prorated:,.2f}</strong></p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        epf = st.number_input(
+            f"EPF Deduction (₹)", 
+            min_value=0.0,
+            value=epf_prorated,
+            key=f"epf_{month}",
+            step=10.0,
+            help="Auto from Employee Master policy, prorated by attendance. You may override."
+        )
+        if abs(epf - epf_prorated) > 0.01:
+            st.markdown(f"""
+            <div class="warning-card">
+                ⚠️ Manual override! Calculated: ₹{epf_prorated:,.2f}
+            </div>
+            """, unsafe_allow_html=True)
+    
+    graph_set_input(graph, ('epf_override', month), epf)
+    graph_define(graph, ('month', month), derive_month_record,
+                 [('base', month), ('split', month), ('esi', month), ('epf_override', month), ('epf', month)])
+    result = graph_get(graph, ('month', month))
+    
+    # Enhanced breakdown verification table
+    st.markdown("### 🔍 Breakdown Verification")
+    st.dataframe(result['verification'], hide_index=True, use_container_width=True)
+    
+    return {**result['record'], 'total': result['total_breakdown']}
+
+def investment_deductions_input(epf_auto: float = 0.0):
+    """Enhanced Investment and deduction options for Old Tax Regime"""
+    st.markdown("""
+    <div class="main-header">
+        <h2>💼 Investment & Deductions (Old Tax Regime Only)</h2>
+        <p>Maximize your tax savings with these investment options</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Section 80C Investments
+    st.markdown("### 📊 Section 80C Investments (Max ₹1,50,000)")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        ppf = st.number_input("💰 PPF (₹)", min_value=0.0, max_value=150000.0, value=0.0, step=5000.0)
+
+        # 🔹 EPF auto-filled from F&F month calculation (sum of EPF)
+        epf_employee = st.number_input(
+            "🏦 EPF Employee Contribution (₹)",
+            min_value=0.0,
+            value=float(epf_auto or 0.0),
+            step=100.0,
+            help="Auto-filled from your month-wise EPF in F&F. You can override if needed."
+        )
+        
+        if epf_auto > 0:
+            st.markdown(f"""
+            <div class="success-card">
+                Auto EPF from F&F months: ₹{epf_auto:,.2f}
+            </div>
+            """, unsafe_allow_html=True)
+
+        elss = st.number_input("📈 ELSS Mutual Funds (₹)", min_value=0.0, value=0.0, step=5000.0)
+        life_insurance = st.number_input("🛡️ Life Insurance Premium (₹)", min_value=0.0, value=0.0, step=2000.0)
+    
+    with col2:
+        fd_5year = st.number_input("🏛️ 5-Year Fixed Deposit (₹)", min_value=0.0, value=0.0, step=5000.0)
+        nsc = st.number_input("📜 NSC (₹)", min_value=0.0, value=0.0, step=5000.0)
+        suknya_samriddhi = st.number_input("👧 Sukanya Samriddhi (₹)", min_value=0.0, value=0.0, step=5000.0)
+        tuition_fees = st.number_input("🎓 Children Tuition Fees (₹)", min_value=0.0, value=0.0, step=5000.0)
+    
+    total_80c = ppf + epf_employee + elss + life_insurance + fd_5year + nsc + suknya_samriddhi + tuition_fees
+    eligible_80c = min(total_80c, 150000)
+    
+    if total_80c > 150000:
+        st.markdown(f"""
+        <div class="warning-card">
+            ⚠️ Total 80C (₹{total_80c:,.0f}) exceeds limit. Eligible: ₹{eligible_80c:,.0f}
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="success-card">
+            ✅ Section 80C: ₹{eligible_80c:,.0f}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Other Deductions
+    st.markdown("### 🏥 Health & Other Deductions")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Section 80D (Health Insurance)**")
+        health_insurance_self = st.number_input("👨‍👩‍👧‍👦 Self & Family (₹)", min_value=0.0, max_value=25000.0, value=0.0, step=1000.0)
+        health_insurance_parents = st.number_input("👴👵 Parents (₹)", min_value=0.0, max_value=50000.0, value=0.0, step=1000.0)
+        
+        st.markdown("**Disability & Medical**")
+        section_80dd = st.number_input("♿ 80DD - Disability (₹)", min_value=0.0, max_value=125000.0, value=0.0, step=5000.0)
+        section_80ddb = st.number_input("🏥 80DDB - Medical Treatment (₹)", min_value=0.0, max_value=100000.0, value=0.0, step=5000.0)
+    
+    with col2:
+        st.markdown("**Loan Interest**")
+        home_loan_interest = st.number_input("🏠 Home Loan Interest (₹)", min_value=0.0, max_value=200000.0, value=0.0, step=5000.0)
+        education_loan_interest = st.number_input("📚 Education Loan Interest (₹)", min_value=0.0, value=0.0, step=2000.0)
+        
+        st.markdown("**NPS Deductions**")
+        nps_80ccd_1b = st.number_input("🏦 NPS 80CCD(1B) (₹)", min_value=0.0, max_value=50000.0, value=0.0, step=5000.0)
+        nps_80ccd_2 = st.number_input("🏢 NPS 80CCD(2) Employer (₹)", min_value=0.0, value=0.0, step=5000.0)
+    
+    # Allowances (Exempt under Old Regime)
+    st.markdown("### 🚗 Exempt Allowances (Old Regime)")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        conveyance_allowance = st.number_input("🚗 Conveyance Allowance (₹)", min_value=0.0, max_value=21600.0, value=0.0, step=1000.0)
+        helper_allowance = st.number_input("🏠 Helper Allowance (₹)", min_value=0.0, value=0.0, step=500.0)
+        lta = st.number_input("✈️ LTA (₹)", min_value=0.0, value=0.0, step=5000.0)
+    
+    with col2:
+        tel_broadband = st.number_input("📞 Telephone & Broadband (₹)", min_value=0.0, value=0.0, step=500.0)
+        ld_allowance = st.number_input("📚 L&D Allowance (₹)", min_value=0.0, value=0.0, step=1000.0)
+        hra_exemption = st.number_input("🏠 HRA Exemption (₹)", min_value=0.0, value=0.0, step=2000.0)
+    
+    # Calculate totals
+    total_80d = health_insurance_self + health_insurance_parents
+    total_other_deductions = section_80dd + section_80ddb + home_loan_interest + education_loan_interest + nps_80ccd_1b + nps_80ccd_2
+    total_exempt_allowances = conveyance_allowance + helper_allowance + lta + tel_broadband + ld_allowance + hra_exemption
+    
+    total_deductions = eligible_80c + total_80d + total_other_deductions
+    
+    # Enhanced Summary with visual cards
+    st.markdown("### 📋 Investment & Deduction Summary")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        render_metric_grid([
+            metric("Section 80C", f"₹{eligible_80c:,.0f}", icon="📊"),
+            metric("Section 80D", f"₹{total_80d:,.0f}", icon="🏥"),
+        ], columns=1)
+    
+    with col2:
+        render_metric_grid([
+            metric("Other Deductions", f"₹{total_other_deductions:,.0f}", icon="📋"),
+            metric("Exempt Allowances", f"₹{total_exempt_allowances:,.0f}", icon="🚗"),
+        ], columns=1)
+    
+    with col3:
+        create_enhanced_metric_card("Total Tax Deductions", f"₹{total_deductions:,.0f}", icon="💰")
+        st.markdown("""
+        <div class="info-card">
+            <strong>Note:</strong> Exempt allowances reduce taxable income
+        </div>
+        """, unsafe_allow_html=True)
+    
+    return {
+        '80c_total': eligible_80c,
+        '80d_total': total_80d,
+        'other_deductions': total_other_deductions,
+        'exempt_allowances': total_exempt_allowances,
+        'total_deductions': total_deductions,
+        'breakdown': {
+            'ppf': ppf, 'epf_employee': epf_employee, 'elss': elss, 'life_insurance': life_insurance,
+            'fd_5year': fd_5year, 'nsc': nsc, 'suknya_samriddhi': suknya_samriddhi, 'tuition_fees': tuition_fees,
+            'health_insurance_self': health_insurance_self, 'health_insurance_parents': health_insurance_parents,
+            'section_80dd': section_80dd, 'section_80ddb': section_80ddb,
+            'home_loan_interest': home_loan_interest, 'education_loan_interest': education_loan_interest,
+            'nps_80ccd_1b': nps_80ccd_1b, 'nps_80ccd_2': nps_80ccd_2,
+            'conveyance_allowance': conveyance_allowance, 'helper_allowance': helper_allowance,
+            'lta': lta, 'tel_broadband': tel_broadband, 'ld_allowance': ld_allowance, 'hra_exemption': hra_exemption
+        }
+    }
+
+# ====== Monthly salary grid (alternate input mode) ======
+# All selected months as rows of one editable grid; computed columns come from one vectorized pass.
+
+SALARY_GRID_INPUT_COLUMNS = ['Total Salary', 'Present Days', 'ESI', 'Holidays', 'Basic', 'HRA', 'Special', 'EPF Override']
+
+def compute_salary_grid(grid: pd.DataFrame, year: int, epf_profile=None) -> pd.DataFrame:
+    """
+    Computed columns for the salary grid (one row per month, same maths as the per-month tabs).
+    Blank Present Days = all working days; blank Basic/HRA/Special/EPF Override = formula value.
+    """
+    holidays = [parse_holiday_text(text)[0] for text in grid['Holidays']]
+    working = working_days_vectorized(list(grid.index), year, holidays).astype(np.int64)
+
+    total = pd.to_numeric(grid['Total Salary'], errors='coerce').fillna(0.0).clip(lower=0.0).to_numpy(dtype=float)
+    present = pd.to_numeric(grid['Present Days'], errors='coerce').to_numpy(dtype=float)
+    present = np.clip(np.where(np.isnan(present), working, present), 0, working).astype(np.int64)
+    esi = pd.to_numeric(grid['ESI'], errors='coerce').fillna(0.0).clip(lower=0.0).to_numpy(dtype=float)
+
+    def _override(column, default):
+        values = pd.to_numeric(grid[column], errors='coerce').to_numpy(dtype=float)
+        return np.where(np.isnan(values), default, values)
+
+    basic = _override('Basic', total / 3)                             # Basic = Total ÷ 3
+    hra = _override('HRA', basic * 0.50)                              # HRA = 50% of Basic
+    special = _override('Special', np.maximum(total - basic - hra, 0.0))  # Rest amount
+
+    has_days = (present > 0) & (working > 0)
+    safe_working = np.where(working > 0, working, 1)
+    def _prorate(amount):
+        return np.where(has_days, (amount / safe_working) * present, 0.0)
+
+    epf_auto, epf_full, ratio = calculate_epf_prorated_vectorized(basic, present, working, epf_profile)
+    epf = _override('EPF Override', epf_auto)
+
+    return pd.DataFrame({
+        'Working Days': working,
+        'Present Days': present,
+        'Holidays': [len(h) for h in holidays],
+        'Basic': basic,
+        'HRA': hra,
+        'Special': special,
+        'Prorated Salary': _prorate(total),
+        'Prorated Basic': _prorate(basic),
+        'Prorated HRA': _prorate(hra),
+        'Prorated Special': _prorate(special),
+        'EPF (Full Month)': epf_full,
+        'Attendance Ratio': ratio,
+        'EPF (Auto)': epf_auto,
+        'EPF': epf,
+        'ESI': esi,
+        'Total Salary': total,
+    }, index=grid.index)
+
+def monthly_salary_grid(selected_months, employee_monthly_salary=None, epf_profile=None, graph=None):
+    """
+    Grid input mode for enhanced_multi_month_salary_input(): one editable row per month plus a
+    computed table. Returns the graph nodes holding the month records.
+    """
+    if graph is None:
+        graph = new_settlement_graph()
+    saved = st.session_state.monthly_salaries
+
+    # Base rows are fixed per month selection so the editor's edits stay aligned with its data
+    base_key = (tuple(selected_months), employee_monthly_salary)
+    if st.session_state.get('salary_grid_base', (None,))[0] != base_key:
+        st.session_state.salary_grid_base = (base_key, pd.DataFrame([{
+            'Total Salary': float(saved[m]['total_salary'] or (employee_monthly_salary or 0.0)),
+            'Present Days': saved[m]['present_days'] or None,
+            'ESI': float(saved[m]['esi']),
+            'Holidays': ", ".join(h.strftime('%Y-%m-%d') for h in saved[m]['holidays']),
+            'Basic': None, 'HRA': None, 'Special': None, 'EPF Override': None,
+        } for m in selected_months], index=pd.Index(selected_months, name='Month'),
+            columns=SALARY_GRID_INPUT_COLUMNS))
+        st.session_state.pop('salary_grid', None)
+
+    money = {c: st.column_config.NumberColumn(c, min_value=0.0, step=100.0, format="%.2f")
+             for c in ['Total Salary', 'ESI', 'Basic', 'HRA', 'Special', 'EPF Override']}
+    grid = st.data_editor(
+        st.session_state.salary_grid_base[1],
+        key="salary_grid",
+        use_container_width=True,
+        column_config={
+            **money,
+            'Present Days': st.column_config.NumberColumn("Present Days", min_value=0, max_value=31, step=1,
+                                                          help="Blank = all working days of the month"),
+            'Holidays': st.column_config.TextColumn("Holidays", help="YYYY-MM-DD, comma separated"),
+        },
+    )
+    st.caption("Leave Basic / HRA / Special / EPF Override blank to use the formula values.")
+
+    for month, text in grid['Holidays'].items():
+        invalid = parse_holiday_text(text)[1]
+        if invalid:
+            st.warning(f"{month}: invalid holiday date(s) {', '.join(invalid)}. Use YYYY-MM-DD format.")
+
+    year = graph_get(graph, 'year')
+    computed = compute_salary_grid(grid, year, epf_profile)
+
+    st.markdown("### 🧮 Computed Month Values")
+    st.dataframe(
+        computed.drop(columns=['Total Salary', 'ESI']).style.format(
+            {c: "₹{:,.2f}" for c in computed.columns if c not in ('Working Days', 'Present Days', 'Holidays', 'Attendance Ratio')}
+            | {'Attendance Ratio': "{:.2f}"}
+        ),
+        use_container_width=True,
+    )
+
+    # Month records as graph inputs: totals/net downstream only recompute when a row changes
+    month_nodes = []
+    for month, row in computed.iterrows():
+        if row['Total Salary'] <= 0:
+            continue
+        record = {
+            'total_salary': float(row['Total Salary']),
+            'basic': float(row['Basic']),
+            'hra': float(row['HRA']),
+            'special_allowances': float(row['Special']),
+            'present_days': int(row['Present Days']),
+            'epf': float(row['EPF']),
+            'esi': float(row['ESI']),
+            'holidays': parse_holiday_text(grid.at[month, 'Holidays'])[0],
+            'total_working_days': int(row['Working Days']),
+            'prorated_salary': float(row['Prorated Salary']),
+            'prorated_basic': float(row['Prorated Basic']),
+            'prorated_hra': float(row['Prorated HRA']),
+            'prorated_special': float(row['Prorated Special']),
+            'attendance_ratio': float(row['Attendance Ratio']),
+            'epf_full_month': float(row['EPF (Full Month)']),
+        }
+        graph_set_input(graph, ('grid_month', month), {'month': month, 'record': record})
+        month_nodes.append(('grid_month', month))
+        saved[month].update(record)
+    return month_nodes
+
+def enhanced_multi_month_salary_input(employee_monthly_salary=None, epf_profile=None):
+    """Enhanced multi-month salary input with 5-day week and holiday support"""
+    st.markdown("""
+    <div class="main-header">
+        <h2>💰 Multi-Month Salary Details</h2>
+        <p>Configure salary details for multiple months with 5-day work week and holiday adjustments</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    months = ["January", "February", "March", "April", "May", "June",
+             "July", "August", "September", "October", "November", "December"]
+    
+    # Initialize salary data in session state if not exists
+    if 'monthly_salaries' not in st.session_state:
+        st.session_state.monthly_salaries = {
+            month: {
+                'total_salary': 0.0, 'basic': 0.0, 'hra': 0.0, 'special_allowances': 0.0,
+                'present_days': 0, 'epf': 0.0, 'esi': 0.0, 'holidays': []
+            } for month in months
+        }
+    
+    # Enhanced month selection with better UI
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_months = st.multiselect(
+            "🗓️ Select months to include in F&F settlement:",
+            months,
+            default=[],
+            help="Choose the months for which F&F settlement needs to be calculated"
+        )
+    
+    with col2:
+        if st.button("🔄 Reset All Months", help="Clear all monthly data and start fresh"):
+            st.session_state.monthly_salaries = {
+                month: {
+                    'total_salary': 0.0, 'basic': 0.0, 'hra': 0.0, 'special_allowances': 0.0,
+                    'present_days': 0, 'epf': 0.0, 'esi': 0.0, 'holidays': []
+                } for month in months
+            }
+            st.session_state.pop('settlement_graph', None)
+            st.session_state.pop('salary_grid_base', None)
+            st.session_state.pop('salary_grid', None)
+            st.rerun()
+    
+    if not selected_months:
+        st.markdown("""
+        <div class="warning-card">
+            ⚠️ Please select at least one month for F&F settlement
+        </div>
+        """, unsafe_allow_html=True)
+        return {}
+    
+    st.markdown("---")
+
+    graph = settlement_graph()
+    graph_begin_run(graph)
+    reference = st.session_state.get('last_working_day', date.today())
+    graph_set_input(graph, 'year', reference.year if hasattr(reference, 'year') else date.today().year)
+    month_nodes = []
+
+    input_mode = st.radio("Input mode", ["📅 Month Tabs", "🧮 Grid"], horizontal=True, key="salary_input_mode",
+                          help="Grid shows all months as rows of one editable table")
+    
+    # Use enhanced tabs for month details
+    tabs = st.tabs([f"📅 {month}" for month in selected_months]) if input_mode == "📅 Month Tabs" else []
+    if input_mode == "🧮 Grid":
+        month_nodes = monthly_salary_grid(selected_months, employee_monthly_salary, epf_profile, graph)
+    for i, month in enumerate(selected_months if tabs else []):
+        with tabs[i]:
+            st.markdown(f"""
+            <div class="employee-card">
+                <h3>📅 {month} Details</h3>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Holiday input section
+            holidays = holiday_input_section(month)
+            st.session_state.monthly_salaries[month]['holidays'] = holidays
+            
+            # Working days calculation with holidays
+            graph_set_input(graph, ('holidays', month), holidays)
+            graph_define(graph, ('working_days', month),
+                         lambda hols, year, m=month: get_total_working_days(m, year, hols),
+                         [('holidays', month), 'year'])
+            total_working_days = graph_get(graph, ('working_days', month))
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="info-card">
+                    <strong>📊 Working Days Information (5-day week)</strong><br>
+                    Total working days: {total_working_days}<br>
+                    Holidays excluded: {len(holidays)}
+                </div>
+                """, unsafe_allow_html=True)
+                
+                # Total salary input
+                default_total_salary = st.session_state.monthly_salaries[month]['total_salary'] or (employee_monthly_salary or 0.0)
+                total_salary = st.number_input(
+                    f"💰 Total Salary (₹)", 
+                    min_value=0.0, 
+                    value=default_total_salary,
+                    key=f"total_salary_{month}",
+                    step=1000.0
+                )
+                
+                # 🔥 FIX: Present days - ensure default value doesn't exceed max_value
+                saved_present_days = st.session_state.monthly_salaries[month]['present_days']
+                
+                # Calculate safe default value
+                if saved_present_days > 0:
+                    # Use saved value, but ensure it doesn't exceed total_working_days
+                    default_present = min(saved_present_days, total_working_days)
+                else:
+                    # Use total working days as default, but ensure it's not greater than max
+                    default_present = total_working_days
+                
+                # Ensure default_present is within valid range
+                default_present = max(0, min(default_present, total_working_days))
+                
+                present_days = st.number_input(
+                    f"📅 Present Days", 
+                    min_value=0, 
+                    max_value=max(total_working_days, 1),  # Ensure max_value is at least 1
+                    value=default_present,
+                    key=f"days_{month}",
+                    help=f"Maximum working days for {month}: {total_working_days}"
+                )
+            
+            with col2:
+                # ESI
+                esi = st.number_input(
+                    f"🏥 ESI Deduction (₹)", 
+                    min_value=0.0,
+                    value=st.session_state.monthly_salaries[month]['esi'],
+                    key=f"esi_{month}",
+                    step=10.0
+                )
+            
+            # Salary breakdown with EPF calculation
+            if total_salary > 0:
+                breakdown = salary_breakdown_input_with_epf(
+                    month, total_salary, present_days, total_working_days, epf_profile=epf_profile,
+                    esi=esi, holidays=holidays, graph=graph
+                )
+                month_nodes.append(('month', month))
+                
+                if breakdown['prorated_salary']:
+                    st.markdown(f"""
+                    <div class="success-card">
+                        ✅ Prorated Total: ₹{breakdown['prorated_salary']:,.2f}
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    st.markdown("""
+                    <div class="warning-card">
+                        ⚠️ No salary calculated (0 present days)
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Update session state with breakdown
+                breakdown.pop('total')
+                st.session_state.monthly_salaries[month].update(breakdown)
+    
+    # Enhanced summary with visual improvements
+    st.markdown("---")
+    st.markdown("""
+    <div class="main-header">
+        <h2>📊 Multi-Month Summary with EPF Details</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    graph_define(graph, 'totals', summarize_settlement_months, month_nodes)
+    summary = graph_get(graph, 'totals')
+    # Copies, so callers persisting/mutating them can't corrupt the cached graph values
+    active_months = {month: dict(record) for month, record in summary['active_months'].items()}
+    
+    if active_months:
+        st.dataframe(summary['summary_df'], use_container_width=True, hide_index=True)
+        
+        # Enhanced EPF Summary with visual cards
+        st.markdown("### 🏦 EPF Calculation Summary")
+        render_metric_grid([
+            metric("Total EPF (prorated)", f"₹{summary['totals']['total_epf']:,.0f}", icon="🏦"),
+            metric("Average Monthly EPF (actual)", f"₹{summary['avg_epf']:,.0f}", icon="📊"),
+            metric("Avg Full-Month EPF (Master)", f"₹{summary['avg_full_epf']:,.0f}", icon="📋"),
+        ])
+        
+        st.caption(f"♻️ Incremental recalculation: {len(graph['recomputed'])} value(s) recomputed this run")
+    
+    return active_months
+
+def fnf_settlement_form_payroll_only():
+    """F&F Settlement Form for Payroll Team - No tax inputs, includes Gratuity"""
+    st.markdown("""
+    <div class="main-header">
+        <h1>📋 Full & Final Settlement Form (Payroll)</h1>
+        <p>Payroll processing - Tax deductions handled by Tax Team</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Load employee data
+    employee_df = load_employee_data()
+    
+    if employee_df.empty:
+        st.error("Could not load employee data")
+        return
+    
+    # Step 1: Enhanced Employee Selection
+    st.markdown("""
+    <div class="employee-card">
+        <h3>🔍 Step 1: Select Employee</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Typed IDs, labels and search index are built once per master version, not on every rerun
+    picker = employee_picker(employee_df)
+    employee_df = picker['frame']
+    emp_query = st.text_input("🔍 Find Employee (ID or Name)", key="fnf_employee_query",
+                              placeholder="Type an employee ID or name...")
+    if emp_query.strip():
+        candidates = employee_df['ID_Name'].iloc[search_employees(picker['index'], emp_query, k=EMPLOYEE_PICKER_TOP_K)].tolist()
+        if not candidates:
+            st.warning(f"No employee matches '{emp_query}'.")
+            return
+    else:
+        candidates = employee_df['ID_Name'].head(EMPLOYEE_PICKER_TOP_K).tolist()
+        if len(employee_df) > EMPLOYEE_PICKER_TOP_K:
+            st.caption(f"Showing the first {EMPLOYEE_PICKER_TOP_K} of {len(employee_df)} employees; type above to search.")
+    selected_emp = st.selectbox("Choose Employee", candidates, index=0 if candidates else None)
+    employee_id = int(selected_emp.split(" - ")[0]) if selected_emp else None
+    employee = employee_df.iloc[picker['positions'][employee_id]] if employee_id in picker['positions'] else None
+    
+    if employee is not None:
+        st.markdown(f"""
+        <div class="success-card">
+            ✅ Employee Found: {employee['Employee Name']}
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.error("❌ Employee not found")
+        return
+
+    # EPF column selection
+    st.caption("💡 If your Employee Master has a specific column for monthly EPF deduction, choose it below.")
+    epf_candidates = detect_epf_fixed_columns(employee_df.columns)
+    epf_col_choice = st.selectbox(
+        "EPF column (Employee Master)",
+        options=(["(Auto-detect)"] + epf_candidates) if epf_candidates else ["(None found)"],
+        index=1 if epf_candidates else 0
+    )
+    chosen_epf_col = None
+    if epf_candidates and epf_col_choice != "(Auto-detect)":
+        chosen_epf_col = epf_col_choice
+
+    # Enhanced Employee Details Display
+    st.markdown("""
+    <div class="employee-card">
+        <h3>👤 Employee Details (Auto-filled)</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h4>📋 Basic Information</h4>
+            <p><strong>Employee ID:</strong> {employee['Employee ID']}</p>
+            <p><strong>Employee Name:</strong> {employee['Employee Name']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h4>💼 Job Information</h4>
+            <p><strong>Designation:</strong> {employee['Designation']}</p>
+            <p><strong>Base Location:</strong> {employee['BaseLocation']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h4>📅 Key Details</h4>
+            <p><strong>DOJ:</strong> {employee['Date of Joining']}</p>
+            <p><strong>PAN No:</strong> {employee['PAN No.']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Step 2: Tax Regime Note (No selection, Tax Team handles this)
+    st.markdown("""
+    <div class="info-card">
+        <h3>🏛️ Tax Processing Note</h3>
+        <p>📋 Tax regime selection and investment deductions will be handled by the Tax Team during review.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # EPF policy for this employee (read from Master)
+    epf_profile = extract_epf_profile(employee, preferred_epf_col=chosen_epf_col, all_cols=list(employee_df.columns))
+    
+    # Step 3: Multi-Month Salary Input (default salary from Employee Master)
+    employee_monthly_salary = float(employee['Salary']) if 'Salary' in employee and pd.notnull(employee['Salary']) else 0.0
+    active_months = enhanced_multi_month_salary_input(employee_monthly_salary=employee_monthly_salary, epf_profile=epf_profile)
+    
+    if not active_months:
+        st.markdown("""
+        <div class="warning-card">
+            ⚠️ Please add salary details for at least one month to proceed
+        </div>
+        """, unsafe_allow_html=True)
+        return
+    
+    # Step 4: Payroll-Only F&F Details (NO TAX INPUTS OR INVESTMENT DEDUCTIONS)
+    st.markdown("""
+    <div class="employee-card">
+        <h3>📝 Step 4: Payroll F&F Details</h3>
+        <p>💡 Tax deductions and investment calculations will be handled by Tax Team</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Form for additional details (no buttons inside)
+    with st.form("fnf_payroll_details"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("### 📅 Important Dates")
+            resignation_date = st.date_input("Resignation Date", value=date.today())
+            last_working_day = st.date_input("Last Working Day", value=date.today())
+            st.session_state['last_working_day'] = last_working_day  # for working-days calc
+
+            # Enhanced Gratuity auto-calc inputs
+            doj_dt = employee_doj(employee)
+            if doj_dt is None:
+                st.warning(f"Could not read Date of Joining '{employee['Date of Joining']}' — gratuity tenure starts from 1 Jan this year.")
+                doj_dt = datetime(date.today().year, 1, 1)
+
+            tenure_years = years_for_gratuity(
+                doj_dt, datetime.combine(last_working_day, datetime.min.time())
+            )
+            last_basic_da = round(employee_monthly_salary / 3.0, 2)
+            auto_gratuity = calculate_gratuity(tenure_years, last_basic_da)
+
+            st.caption("💡 Gratuity uses > 6 months counted as +1 year; Last Basic = Salary ÷ 3")
+            gratuity = st.number_input("🏆 Gratuity (₹)", value=round(auto_gratuity, 2), min_value=0.0, step=100.0)
+
+            # Enhanced Gratuity calculation details
+            with st.expander("🏦 Gratuity Calculation Details", expanded=True):
+                raw_gratuity = round((tenure_years * last_basic_da * 15) / 26, 2)
+                capped_gratuity = round(min(raw_gratuity, 20_00_000), 2)
+                eligible = tenure_years >= 5
+
+                render_metric_grid([
+                    metric("Service (years)", f"{tenure_years:.2f}", icon="📅"),
+                    metric("Last Basic (monthly)", f"₹{last_basic_da:,.2f}", icon="💰"),
+                    metric("Raw Gratuity", f"₹{raw_gratuity:,.2f}", icon="🧮"),
+                ])
+
+                st.markdown(f"""
+                <div class="calculation-box">
+                    <h4>Formula: Gratuity = (Years × Last Basic × 15) ÷ 26</h4>
+                    <p><strong>Computed:</strong> ({tenure_years:.2f} × ₹{last_basic_da:,.2f} × 15) ÷ 26 = <strong>₹{raw_gratuity:,.2f}</strong></p>
+                </div>
+                """, unsafe_allow_html=True)
+    
+                if not eligible:
+                    st.markdown("""
+                    <div class="warning-card">
+                        ❌ Not eligible: service is less than <strong>5 years</strong> → Gratuity = ₹0.00
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    if raw_gratuity > 20_00_000:
+                        st.markdown(f"""
+                        <div class="info-card">
+                            ℹ️ Cap applied: min(₹20,00,000, ₹{raw_gratuity:,.2f}) → <strong>₹{capped_gratuity:,.2f}</strong>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"""
+                        <div class="success-card">
+                            ✅ Eligible and <strong>no cap</strong> needed → <strong>₹{capped_gratuity:,.2f}</strong>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+            # Additional positives  
+            bonus = st.number_input("🎁 Bonus (₹)", value=0.0, min_value=0.0, step=100.0)
+            leave_encashment = st.number_input("🏖️ Leave Encashment (₹)", value=0.0, min_value=0.0, step=100.0)
+
+        with col2:
+            st.markdown("### 📉 Payroll Deductions Only")
+ 
+            # PT only for Chennai and Bangalore
+            pt_enabled = str(employee['BaseLocation']).lower() in ['chennai', 'bangalore']
+            if pt_enabled:
+                pt_total = st.number_input("🏛️ PT - Professional Tax Total (₹)", value=0.0, min_value=0.0, step=50.0)
+                st.markdown("""
+                <div class="success-card">
+                    ✅ PT applicable for Chennai/Bangalore
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                pt_total = 0.0
+                st.markdown("""
+                <div class="info-card">
+                    ℹ️ PT not applicable for this location
+                </div>
+                """, unsafe_allow_html=True)
+
+            salary_advance = st.number_input("💳 Salary Advance (₹)", value=0.0, min_value=0.0, step=100.0)
+            tada_recovery = st.number_input("🚗 TADA Recovery (₹)", value=0.0, min_value=0.0, step=100.0)
+            wfh_recovery = st.number_input("🏠 WFH Recovery (₹)", value=0.0, min_value=0.0, step=100.0)
+            notice_period_recovery = st.number_input("⏰ Notice Period Recovery (₹)", value=0.0, min_value=0.0, step=100.0)
+            other_deductions = st.number_input("📝 Other Deductions (₹)", value=0.0, min_value=0.0, step=100.0)
+
+            # Information about tax calculation
+            st.markdown("""
+            <div class="info-card">
+                📋 <strong>Tax Calculation Note:</strong><br>
+                • TDS and investment deductions will be calculated by Tax Team<br>
+                • Tax regime selection handled during tax review<br>
+                • This form covers payroll components only
+            </div>
+            """, unsafe_allow_html=True)
+
+        # ✅ Submit button MUST be inside this form block
+        calculate_clicked = st.form_submit_button("🧮 Calculate Payroll F&F", use_container_width=True)
+
+    # Process calculation when form is submitted
+    if calculate_clicked:
+        # Store calculation results in session state (PAYROLL ONLY - NO TAX CALCULATIONS)
+        st.session_state.calculation_done = True
+        # Amounts are rounded to the paisa once here; everything downstream adds exact paise
+        payroll_inputs = {
+            'gratuity': gratuity,
+            'bonus': bonus,
+            'leave_encashment': leave_encashment,
+            'pt_total': pt_total,
+            'salary_advance': salary_advance,
+            'tada_recovery': tada_recovery,
+            'wfh_recovery': wfh_recovery,
+            'notice_period_recovery': notice_period_recovery,
+            'other_deductions': other_deductions,
+        }
+        input_paise = to_paise(list(payroll_inputs.values()))
+        st.session_state.calculation_data = {
+            'resignation_date': resignation_date,
+            'last_working_day': last_working_day,
+            **{key: from_paise(p) for key, p in zip(payroll_inputs, input_paise)},
+            'tenure_years': tenure_years,
+            'last_basic_da': last_basic_da
+        }
+
+    # Enhanced calculation results display (PAYROLL VIEW ONLY)
+    if st.session_state.get('calculation_done', False):
+        data = st.session_state.calculation_data
+
+        # ---- Totals from active months + payroll inputs, served by the settlement graph ----
+        graph = settlement_graph()
+        graph_set_input(graph, 'payroll_inputs', {key: data[key] for key in PAYROLL_INPUT_KEYS})
+        graph_define(graph, 'net', compute_payroll_net, ['totals', 'payroll_inputs'])
+        totals = graph_get(graph, 'totals')['totals']
+        net = graph_get(graph, 'net')
+
+        # ---- Payroll calculation (NO TAX CALCULATIONS HERE) ----
+        total_earnings = net['total_earnings']
+
+        # ---- Payroll deductions only ----
+        payroll_deductions = net['payroll_deductions']
+
+        # PT deduction
+        pt_deduction = net['pt_deduction']
+
+        # Net before tax (Tax Team will calculate final TDS)
+        net_before_tax = net['net_before_tax']
+
+        # Enhanced results display
+        st.markdown("---")
+        st.markdown("""
+        <div class="main-header">
+            <h2>📊 Payroll F&F Summary (Tax Team Review Pending)</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("""
+        <div class="info-card">
+            🛈 <strong>Important Note:</strong> This summary shows payroll components only. Tax calculations and final settlement amount will be determined by Tax Team.
+        </div>
+        """, unsafe_allow_html=True)
+
+        # ---- Enhanced Month-wise breakdown ----
+        st.markdown("### 📅 Month-wise Salary Breakdown")
+        month_breakdown = []
+        for month, m in active_months.items():
+            month_breakdown.append({
+                'Month': month,
+                'Total Salary': f"₹{m['total_salary']:,.2f}",
+                'Days': f"{m['present_days']}/{m['total_working_days']}",
+                'Prorated Basic': f"₹{m['prorated_basic']:,.2f}",
+                'Prorated HRA': f"₹{m['prorated_hra']:,.2f}",
+                'Prorated Special': f"₹{m['prorated_special']:,.2f}",
+                'EPF': f"₹{m['epf']:,.2f}",
+                'ESI': f"₹{m['esi']:,.2f}",
+            })
+        month_df = pd.DataFrame(month_breakdown)
+        st.dataframe(month_df, use_container_width=True, hide_index=True)
+
+        # ---- Enhanced Overall Summary (PAYROLL ONLY) ----
+        st.markdown("### 💰 Payroll F&F Summary")
+        colo1, colo2, colo3 = st.columns(3)
+
+        with colo1:
+            render_metric_grid([
+                metric("Basic Salary", f"₹{totals['prorated_basic']:,.2f}", icon="💰"),
+                metric("HRA", f"₹{totals['prorated_hra']:,.2f}", icon="🏠"),
+                metric("Special Allowances", f"₹{totals['prorated_special']:,.2f}", icon="📋"),
+                metric("Gratuity", f"₹{data['gratuity']:,.2f}", icon="🏆"),
+                metric("Bonus", f"₹{data['bonus']:,.2f}", icon="🎁"),
+                metric("Leave Encashment", f"₹{data['leave_encashment']:,.2f}", icon="🏖️"),
+                None,
+                metric("Total Earnings", f"₹{total_earnings:,.2f}", icon="💵"),
+            ], columns=1, header='<div class="success-card"><h3>✅ EARNINGS</h3></div>')
+
+        with colo2:
+            render_metric_grid([
+                metric("Total EPF", f"₹{totals['total_epf']:,.2f}", icon="🏦"),
+                metric("Total ESI", f"₹{totals['total_esi']:,.2f}", icon="🏥"),
+                metric("PT", f"₹{pt_deduction:,.2f}", icon="🏛️"),
+                metric("Salary Advance", f"₹{data['salary_advance']:,.2f}", icon="💳"),
+                metric("TADA Recovery", f"₹{data['tada_recovery']:,.2f}", icon="🚗"),
+                metric("WFH Recovery", f"₹{data['wfh_recovery']:,.2f}", icon="🏠"),
+                metric("Notice Period", f"₹{data['notice_period_recovery']:,.2f}", icon="⏰"),
+                metric("Other", f"₹{data['other_deductions']:,.2f}", icon="📝"),
+                None,
+                metric("Total Payroll Deductions", f"₹{payroll_deductions + pt_deduction:,.2f}", icon="📉"),
+            ], columns=1, header='<div class="warning-card"><h3>📉 PAYROLL DEDUCTIONS</h3></div>')
+
+        with colo3:
+            render_metric_grid([
+                metric("Net Before Tax", f"₹{net_before_tax:,.2f}", delta="Pending Tax Review", icon="💰"),
+            ], columns=1, header='<div class="info-card"><h3>💼 NET (Before Tax)</h3></div>',
+               footer="""
+            <div class="warning-card">
+                ⏳ <strong>Next Steps:</strong><br>
+                • Tax Team will calculate TDS<br>
+                • Investment deductions review<br>
+                • Final settlement amount
+            </div>
+            """)
+
+        # ---- Persist submission (PAYROLL DATA ONLY) ----
+        fnf_data = {
+            'employee_id': int(employee['Employee ID']),
+            'employee_name': employee['Employee Name'],
+            'designation': employee['Designation'],
+            'base_location': employee['BaseLocation'],
+            'doj': employee['Date of Joining'],
+            'resignation_date': data['resignation_date'].strftime('%d/%m/%Y'),
+            'last_working_day': data['last_working_day'].strftime('%d/%m/%Y'),
+            'active_months': active_months,
+            'salary_totals': totals,
+            'gratuity': data['gratuity'],
+            'bonus': data['bonus'],
+            'leave_encashment': data['leave_encashment'],
+            'total_earnings': total_earnings,
+            'pt_total': pt_deduction,
+            'salary_advance': data['salary_advance'],
+            'tada_recovery': data['tada_recovery'],
+            'wfh_recovery': data['wfh_recovery'],
+            'notice_period_recovery': data['notice_period_recovery'],
+            'other_deductions': data['other_deductions'],
+            'payroll_deductions': payroll_deductions,
+            'net_before_tax': net_before_tax,
+            'status': 'Pending Tax Review',
+            'tenure_years': data['tenure_years'],
+            'last_basic_da': data['last_basic_da'],
+            'payroll_calculated': True,
+            'tax_calculated': False,
+            # Tax fields will be populated by Tax Team
+            'tax_regime': None,
+            'investments_data': {},
+            'tds_amount': 0.0,
+            'total_deductions': 0.0,
+            'net_payable': 0.0,
+            'taxable_income': 0.0
+        }
+
+        if 'fnf_submissions' not in st.session_state:
+            st.session_state.fnf_submissions = []
+
+        existing_index = None
+        for i, submission in enumerate(st.session_state.fnf_submissions):
+            if submission['employee_id'] == int(employee['Employee ID']):
+                existing_index = i
+                break
+
+        if existing_index is None:
+            st.session_state.fnf_submissions.append(fnf_data)
+            mark_fnf_submissions_changed(fnf_data)
+        elif st.session_state.fnf_submissions[existing_index] != fnf_data:
+            st.session_state.fnf_submissions[existing_index] = fnf_data
+            mark_fnf_submissions_changed(fnf_data)
+
+        # Enhanced Actions
+        st.markdown("---")
+        st.markdown("### 🎯 Next Steps")
+        c1, c2, c3 = st.columns(3)
+
+        with c1:
+            if st.button("📤 Send to Tax Team", use_container_width=True):
+                fnf_data['status'] = 'Under Tax Review'
+                ensure_regime_comparison(fnf_data)
+                st.session_state.fnf_submissions[existing_index if existing_index is not None else -1] = fnf_data
+                save_fnf_data(fnf_data)
+                st.success("✅ Payroll F&F sent to Tax Team for tax calculation and review!")
+                st.balloons()
+                st.session_state.calculation_done = False
+                st.rerun()
+
+        with c2:
+            if st.button("💾 Save Draft", use_container_width=True):
+                fnf_data['status'] = 'Draft'
+                st.session_state.fnf_submissions[existing_index if existing_index is not None else -1] = fnf_data
+                save_fnf_data(fnf_data)
+                st.info("💾 Payroll F&F saved as draft")
+                st.session_state.calculation_done = False
+                st.rerun()
+
+        with c3:
+            if st.button("📄 Payroll Report", use_container_width=True):
+                st.info("📄 Payroll F&F report generated! Tax calculations pending.")
+                st.download_button(
+                    "📥 Download F&F Statement (HTML)",
+                    data=settlement_letter_html(fnf_data),
+                    file_name=letter_file_name(fnf_data),
+                    mime="text/html",
+                    use_container_width=True,
+                )
@@ -0,0 +1,199 @@
+"""
+BI snapshot of the F&F submission store: submissions flattened to typed columns and written as
+Parquet (CSV when pyarrow isn't installed), partitioned by exit month and status:
+
+    bi_snapshot/exit_month=2026-03/status=Tax%20Approved/part.parquet
+
+Exports are incremental: a manifest keeps a fingerprint per partition and only partitions whose
+rows changed are rewritten. Run on demand from the Admin page, or nightly from cron:
+
+    python -m fnf.snapshot --source fnf_submissions.json --out bi_snapshot
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+from datetime import date, datetime
+from urllib.parse import quote
+
+import pandas as pd
+
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+BI_SNAPSHOT_DIR = "bi_snapshot"
+MANIFEST_FILE = "_manifest.json"
+UNKNOWN_EXIT_MONTH = "unknown"
+
+def _totals(key):
+    return lambda s: (s.get('salary_totals') or {}).get(key)
+
+# column -> (getter, type); exit_month and status are the partition keys (in the path, not the files)
+BI_COLUMNS = {
+    'employee_id': ('employee_id', 'int'),
+    'employee_name': ('employee_name', 'str'),
+    'designation': ('designation', 'str'),
+    'base_location': ('base_location', 'str'),
+    'doj': ('doj', 'date'),
+    'resignation_date': ('resignation_date', 'date'),
+    'last_working_day': ('last_working_day', 'date'),
+    'tax_regime': ('tax_regime', 'str'),
+    'tenure_years': ('tenure_years', 'float'),
+    'last_basic': ('last_basic_da', 'float'),
+    'months': (lambda s: len(s.get('active_months') or {}), 'int'),
+    'prorated_salary': (_totals('prorated_total'), 'float'),
+    'gratuity': ('gratuity', 'float'),
+    'bonus': ('bonus', 'float'),
+    'leave_encashment': ('leave_encashment', 'float'),
+    'total_earnings': ('total_earnings', 'float'),
+    'epf': (_totals('total_epf'), 'float'),
+    'esi': (_totals('total_esi'), 'float'),
+    'pt': ('pt_total', 'float'),
+    'salary_advance': ('salary_advance', 'float'),
+    'tada_recovery': ('tada_recovery', 'float'),
+    'wfh_recovery': ('wfh_recovery', 'float'),
+    'notice_period_recovery': ('notice_period_recovery', 'float'),
+    'other_deductions': ('other_deductions', 'float'),
+    'payroll_deductions': ('payroll_deductions', 'float'),
+    'net_before_tax': ('net_before_tax', 'float'),
+    'taxable_income': ('taxable_income', 'float'),
+    'tds': ('tds_amount', 'float'),
+    'total_deductions': ('total_deductions', 'float'),
+    'net_payable': ('net_payable', 'float'),
+    'tax_reviewed_by': ('tax_reviewed_by', 'str'),
+    'tax_review_date': ('tax_review_date', 'datetime'),
+}
+
+def _exit_date(submission):
+    try:
+        return datetime.strptime(str(submission.get('last_working_day')), '%d/%m/%Y').date()
+    except ValueError:
+        return None
+
+def _typed_frame(rows: list, columns: list) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=columns)
+    for col in columns:
+        kind = BI_COLUMNS[col][1]
+        if kind == 'int':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+        elif kind == 'float':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        elif kind == 'date':
+            df[col] = pd.to_datetime(df[col], format='%d/%m/%Y', errors='coerce').dt.date
+        elif kind == 'datetime':
+            df[col] = pd.to_datetime(df[col], format='%d/%m/%Y %H:%M', errors='coerce')
+        else:
+            df[col] = df[col].astype('string')
+    return df
+
+def _load_manifest(out_dir) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'partitions': {}}
+
+def _remove_partition(out_dir, rel_path):
+    root = os.path.abspath(out_dir)
+    path = os.path.join(root, rel_path)
+    if os.path.exists(path):
+        os.remove(path)
+    folder = os.path.dirname(path)
+    while folder.startswith(root + os.sep) and os.path.isdir(folder) and not os.listdir(folder):
+        os.rmdir(folder)
+        folder = os.path.dirname(folder)
+
+def export_bi_snapshot(submissions, out_dir=BI_SNAPSHOT_DIR, columns=None, start: date = None,
+                       end: date = None, fmt: str = None) -> dict:
+    """
+    Write the snapshot; returns {'format', 'rows', 'written', 'unchanged', 'deleted'}.
+    columns: projection (default all BI_COLUMNS).
+    start/end: exit months to export (widened to whole months, so partitions are always complete);
+    partitions outside the range are left as they are, and submissions without a readable exit date
+    are only exported when no range is given. A different format or column set rewrites everything.
+    """
+    fmt = fmt or ('parquet' if PARQUET_AVAILABLE else 'csv')
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet export needs pyarrow; use fmt='csv'")
+    columns = [c for c in (columns or BI_COLUMNS) if c in BI_COLUMNS]
+    start = start.replace(day=1) if start else None
+    end = (pd.Timestamp(end) + pd.offsets.MonthEnd(0)).date() if end else None
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest = _load_manifest(out_dir)
+    if manifest.get('format') != fmt or manifest.get('columns') != columns:
+        for rel_path in manifest.get('partitions', {}):
+            _remove_partition(out_dir, rel_path)
+        manifest = {'format': fmt, 'columns': columns, 'partitions': {}}
+
+    # Flatten to plain rows grouped by partition; a DataFrame is only built for changed partitions
+    getters = [(g if callable(g) else (lambda s, k=g: s.get(k))) for g, _ in (BI_COLUMNS[c] for c in columns)]
+    partitions = {}
+    for s in submissions:
+        exit_date = _exit_date(s)
+        if start or end:
+            if exit_date is None or (start and exit_date < start) or (end and exit_date > end):
+                continue
+        month = exit_date.strftime('%Y-%m') if exit_date else UNKNOWN_EXIT_MONTH
+        rel_path = os.path.join(f"exit_month={month}", f"status={quote(str(s.get('status')), safe='')}",
+                                f"part.{fmt}")
+        partitions.setdefault(rel_path, []).append([get(s) for get in getters])
+
+    summary = {'format': fmt, 'rows': 0, 'written': 0, 'unchanged': 0, 'deleted': 0}
+    for rel_path, rows in partitions.items():
+        fingerprint = hashlib.sha256(json.dumps(rows, default=str).encode()).hexdigest()
+        summary['rows'] += len(rows)
+        if manifest['partitions'].get(rel_path) == fingerprint and os.path.exists(os.path.join(out_dir, rel_path)):
+            summary['unchanged'] += 1
+            continue
+        path = os.path.join(out_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df = _typed_frame(rows, columns)
+        tmp = path + ".tmp"
+        if fmt == 'parquet':
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        manifest['partitions'][rel_path] = fingerprint
+        summary['written'] += 1
+
+    # Partitions in the exported range that no longer have rows (e.g. every row changed status)
+    months = None if not (start or end) else set(
+        pd.period_range(start or date(2000, 1, 1), end or date.today(), freq='M').strftime('%Y-%m'))
+    for rel_path in list(manifest['partitions']):
+        month = rel_path.split(os.sep)[0].split('=', 1)[1]
+        if rel_path not in partitions and (months is None or month in months):
+            _remove_partition(out_dir, rel_path)
+            del manifest['partitions'][rel_path]
+            summary['deleted'] += 1
+
+    manifest['exported_at'] = datetime.now().isoformat(timespec='seconds')
+    with open(os.path.join(out_dir, MANIFEST_FILE + ".tmp"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(os.path.join(out_dir, MANIFEST_FILE + ".tmp"), os.path.join(out_dir, MANIFEST_FILE))
+    return summary
+
+def zip_bi_snapshot(out_dir=BI_SNAPSHOT_DIR) -> str:
+    """Archive the snapshot folder next to it; returns the ZIP path"""
+    return shutil.make_archive(os.path.abspath(out_dir), "zip", out_dir)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the F&F submission store as a partitioned BI snapshot")
+    parser.add_argument("--source", default="fnf_submissions.json")
+    parser.add_argument("--out", default=BI_SNAPSHOT_DIR)
+    parser.add_argument("--columns", help="comma-separated subset of: " + ", ".join(BI_COLUMNS))
+    parser.add_argument("--start", type=date.fromisoformat, help="first last-working-day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last last-working-day (YYYY-MM-DD)")
+    parser.add_argument("--format", choices=["parquet", "csv"])
+    args = parser.parse_args(argv)
+
+    with open(args.source) as f:
+        submissions = json.load(f).get('submissions', [])
+    summary = export_bi_snapshot(submissions, args.out, args.columns.split(",") if args.columns else None,
+                                 args.start, args.end, args.format)
+    print(f"{summary['rows']} rows as {summary['format']}: {summary['written']} partitions written, "
+          f"{summary['unchanged']} unchanged, {summary['deleted']} deleted -> {args.out}")
+
+if __name__ == "__main__":
+    main()
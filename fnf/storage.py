@@ -0,0 +1,146 @@
+"""F&F submission persistence (JSON files)."""
+import streamlit as st
+import os
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from .aggregates import build_fnf_aggregates, update_fnf_aggregates
+from .monitoring import count, record_latency
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+FNF_STORE_FILE = 'fnf_submissions.json'
+_STORE_LOCK = threading.Lock()   # sessions are threads of one server process: one save at a time
+
+def _store_stamp():
+    """Identity of the store file as last written (None if missing); a save by another session changes it"""
+    try:
+        st_ = os.stat(FNF_STORE_FILE)
+    except OSError:
+        return None
+    return [st_.st_mtime_ns, st_.st_ino, st_.st_size]
+
+def mark_fnf_submissions_changed(*changed):
+    """
+    Give the in-memory submission store a new version token (call after any change) and bring the
+    report aggregates up to date: pass the submissions that changed to update just their
+    contributions; with none, the aggregates are rebuilt from the whole store.
+    """
+    st.session_state.fnf_submissions_version = uuid.uuid4().hex
+    if changed and 'fnf_aggregates' in st.session_state:
+        update_fnf_aggregates(st.session_state.fnf_aggregates, changed)
+    else:
+        st.session_state.fnf_aggregates = build_fnf_aggregates(st.session_state.get('fnf_submissions', []))
+
+def fnf_submissions_version() -> str:
+    """Version token of session_state.fnf_submissions; caches of derived data key on it"""
+    if 'fnf_submissions_version' not in st.session_state:
+        mark_fnf_submissions_changed()
+    return st.session_state.fnf_submissions_version
+
+def fnf_aggregates() -> dict:
+    """Liability aggregates of session_state.fnf_submissions (see aggregates.py)"""
+    if 'fnf_aggregates' not in st.session_state:
+        mark_fnf_submissions_changed()
+    return st.session_state.fnf_aggregates
+
+@traced()
+def load_fnf_data():
+    """Load F&F submissions from JSON file into session_state.fnf_submissions"""
+    try:
+        if os.path.exists(FNF_STORE_FILE):
+            st.session_state.fnf_store_stamp = _store_stamp()   # before reading: a later write then merges on save
+            with open(FNF_STORE_FILE, 'r') as f:
+                data = json.load(f)
+            st.session_state.fnf_submissions = data.get('submissions', [])
+        else:
+            st.session_state.fnf_submissions = []
+    except Exception as e:
+        logger.error("Could not load F&F data: %s", e)
+        st.warning(f"Could not load F&F data: {e}")
+        st.session_state.fnf_submissions = []
+    st.session_state.pop('regime_comparisons_backfilled', None)   # tax_review backfills the loaded store
+    mark_fnf_submissions_changed()
+
+def _merge_submissions(stored: list, changed) -> list:
+    """stored with each changed submission replacing the one for its employee_id (or appended)"""
+    merged = list(stored)
+    position = {str(s.get('employee_id')): i for i, s in enumerate(merged)}
+    for c in changed:
+        key = str(c.get('employee_id'))
+        if key in position:
+            merged[position[key]] = c
+        else:
+            position[key] = len(merged)
+            merged.append(c)
+    return merged
+
+@traced()
+def save_fnf_data(*changed):
+    """
+    Save F&F submissions to the JSON store; changed: the submissions edited. If another session
+    saved since this one loaded, the file is re-read and the changed submissions are merged into it
+    by employee_id (so neither session's edits are lost), and this session takes the merged store.
+    With nothing passed, this session's store is written as it is.
+    """
+    start = time.perf_counter()
+    merged = False
+    try:
+        with _STORE_LOCK:
+            submissions = st.session_state.get('fnf_submissions', [])
+            if changed and _store_stamp() not in (None, st.session_state.get('fnf_store_stamp')):
+                with open(FNF_STORE_FILE, 'r') as f:
+                    submissions = _merge_submissions(json.load(f).get('submissions', []), changed)
+                merged = True
+            payload = {
+                'submissions': submissions,
+                'last_updated': datetime.now().isoformat()
+            }
+            # Written aside and swapped in: readers must never see a partial file
+            tmp = f"{FNF_STORE_FILE}.{uuid.uuid4().hex}.tmp"
+            try:
+                with open(tmp, 'w') as f:
+                    json.dump(payload, f, indent=2, default=str)
+                os.replace(tmp, FNF_STORE_FILE)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            st.session_state.fnf_store_stamp = _store_stamp()
+            st.session_state.fnf_submissions = submissions
+        ms = (time.perf_counter() - start) * 1000
+        record_latency("store.save_fnf_data", ms)
+        if merged:
+            count("store.save_fnf_data.merges")
+        logger.info("Saved %d F&F submissions (%d changed%s)", len(submissions), len(changed),
+                    ", merged with another session's save" if merged else "",
+                    extra={'duration_ms': round(ms, 1),
+                           'changed': [f"{c.get('employee_id')}: {c.get('status')}" for c in changed[:20]]})
+    except Exception as e:
+        count("store.save_fnf_data.errors")
+        logger.error("Could not save F&F data: %s", e)
+        st.warning(f"Could not save F&F data: {e}")
+    count("store.save_fnf_data.calls")
+    if merged:
+        mark_fnf_submissions_changed()   # other sessions' submissions came in: rebuild the aggregates
+    else:
+        mark_fnf_submissions_changed(*changed)
+
+def load_fnf_closed_data():
+    try:
+        if os.path.exists(FNF_CLOSED_FILE):
+            with open(FNF_CLOSED_FILE, "r") as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return []
+
+def save_fnf_closed_data(data):
+    try:
+        with open(FNF_CLOSED_FILE, "w") as f:
+            json.dump(data, f, indent=2, default=str)
+    except Exception as e:
+        st.warning(f"Could not save closed F&F data: {e}")
@@ -0,0 +1,289 @@
+"""Tax recomputation per submission (single and batch) and the Old vs New regime comparison."""
+import pandas as pd
+import numpy as np
+import json
+from datetime import datetime
+import hashlib
+import math
+
+from .calc import (
+    _fy_start_year_from_session, from_paise, paise, tds_new_from_total_income, tds_new_vectorized,
+    tds_old_from_total_income, tds_old_vectorized, to_paise,
+)
+from .monitoring import count
+from .tracing import traced
+
+# Investment heads in recompute_tax_updated()'s breakdown, grouped by section
+INVESTMENT_80C_KEYS = ['ppf','epf_employee','elss','life_insurance','fd_5year','nsc','suknya_samriddhi','tuition_fees']
+INVESTMENT_80D_KEYS = ['health_insurance_self','health_insurance_parents']
+INVESTMENT_OTHER_KEYS = ['section_80dd','section_80ddb','home_loan_interest','education_loan_interest','nps_80ccd_1b','nps_80ccd_2']
+EXEMPT_ALLOWANCE_KEYS = ['conveyance_allowance','helper_allowance','lta','tel_broadband','ld_allowance','hra_exemption']
+INVESTMENT_KEYS = INVESTMENT_80C_KEYS + INVESTMENT_80D_KEYS + INVESTMENT_OTHER_KEYS + EXEMPT_ALLOWANCE_KEYS
+
+@traced()
+def recompute_tax_updated(submission: dict, inv: dict, new_regime: str):
+    """
+    Updated tax computation with New Regime restrictions:
+    - New Regime: Only 80CCD(2) allowed, no other deductions including EPF
+    - Old Regime: All deductions as before
+    Amounts are carried as integer paise and converted back to rupees only in the result.
+    """
+    def _f(x, default=0.0):
+        try: return float(x if x is not None else default)
+        except Exception: return float(default)
+    def _p(x) -> int:
+        x = _f(x)
+        return paise(x) if math.isfinite(x) else 0
+    def _sum(d: dict, keys: list[str]) -> int:
+        return sum(_p(d.get(k, 0.0)) for k in keys)
+    def _r(p: int) -> float:
+        return p / 100.0
+
+    salary_totals = submission.get('salary_totals', {})
+
+    # Earnings used for slab (gratuity excluded)
+    taxable_earnings = (
+        _p(salary_totals.get('prorated_total', 0.0))
+        + _p(submission.get('bonus', 0.0))
+        + _p(submission.get('leave_encashment', 0.0))
+    )
+    pt_deduction = _p(submission.get('pt_total', 0.0))
+
+    # Normalize investments
+    br = (inv or {}).get('breakdown', {})
+    
+    # Standard deduction (FY-aware for New regime)
+    fy_start = _fy_start_year_from_session()
+    std_deduction = paise(75_000.0 if (new_regime == "New Tax Regime" and fy_start >= 2025) else 50_000.0)
+
+    # Regime-specific deduction calculation
+    if new_regime == "New Tax Regime":
+        # NEW REGIME: Only 80CCD(2) allowed
+        inv_80c = 0  # No 80C deductions in new regime
+        inv_80d = 0  # No 80D deductions in new regime
+        inv_other = _p(br.get('nps_80ccd_2', 0.0))  # Only employer NPS contribution
+        exempt_allowances = 0  # No exempt allowances in new regime
+        inv_total_for_tax = inv_other  # Only 80CCD(2)
+        
+        taxable_income = max(0, taxable_earnings - std_deduction - pt_deduction - inv_total_for_tax)
+        tds_amount = paise(tds_new_from_total_income(_r(taxable_income), fy_start))
+        
+    else:
+        # OLD REGIME: All deductions allowed
+        inv_80c_uncapped = _sum(br, INVESTMENT_80C_KEYS)
+        inv_80c = min(inv_80c_uncapped, paise(150000.0))
+        
+        inv_80d = _sum(br, INVESTMENT_80D_KEYS)
+        inv_other = _sum(br, INVESTMENT_OTHER_KEYS)
+        exempt_allowances = _sum(br, EXEMPT_ALLOWANCE_KEYS)
+        inv_total_for_tax = inv_80c + inv_80d + inv_other
+        
+        taxable_income = max(0, taxable_earnings - std_deduction - pt_deduction - inv_total_for_tax - exempt_allowances)
+        tds_amount = paise(tds_old_from_total_income(_r(taxable_income)))
+
+    # Payroll-side deductions (do not affect taxable income)
+    payroll_deductions = (
+        _p(salary_totals.get('total_epf', 0.0))
+        + _p(salary_totals.get('total_esi', 0.0))
+        + _p(submission.get('salary_advance', 0.0))
+        + _p(submission.get('tada_recovery', 0.0))
+        + _p(submission.get('wfh_recovery', 0.0))
+        + _p(submission.get('notice_period_recovery', 0.0))
+        + _p(submission.get('other_deductions', 0.0))
+    )
+
+    # Totals & net
+    total_earnings = _p(submission.get('total_earnings', 0.0))
+    if total_earnings == 0:
+        total_earnings = (
+            _p(salary_totals.get('prorated_total', 0.0))
+            + _p(submission.get('gratuity', 0.0))
+            + _p(submission.get('bonus', 0.0))
+            + _p(submission.get('leave_encashment', 0.0))
+        )
+
+    total_deductions = payroll_deductions + pt_deduction + tds_amount
+    net_payable = total_earnings - total_deductions
+
+    # Build investment data structure
+    if new_regime == "New Tax Regime":
+        investments_data = {
+            '80c_total': 0.0,
+            '80d_total': 0.0,
+            'other_deductions': _r(inv_other),
+            'exempt_allowances': 0.0,
+            'total_deductions': _r(inv_other),
+            'breakdown': {'nps_80ccd_2': _r(_p(br.get('nps_80ccd_2', 0.0)))}
+        }
+    else:
+        investments_data = {
+            '80c_total': _r(inv_80c),
+            '80d_total': _r(inv_80d),
+            'other_deductions': _r(inv_other),
+            'exempt_allowances': _r(exempt_allowances),
+            'total_deductions': _r(inv_total_for_tax),
+            'breakdown': {k: _r(_p(br.get(k, 0.0))) for k in INVESTMENT_KEYS}
+        }
+
+    return {
+        'regime': new_regime,
+        'taxable_earnings': _r(taxable_earnings),
+        'std_deduction': _r(std_deduction),
+        'pt_deduction': _r(pt_deduction),
+        'inv_80c': _r(inv_80c),
+        'inv_80d': _r(inv_80d),
+        'inv_other': _r(inv_other),
+        'exempt_allowances': _r(exempt_allowances),
+        'inv_total_for_tax': _r(inv_total_for_tax),
+        'taxable_income': _r(taxable_income),
+        'tds_amount': _r(tds_amount),
+        'payroll_deductions': _r(payroll_deductions),
+        'total_deductions': _r(total_deductions),
+        'total_earnings': _r(total_earnings),
+        'net_payable': _r(net_payable),
+        'investments_data': investments_data,
+    }
+
+def _submission_amounts(submissions: list, fields: list, nested: str = None) -> dict:
+    """Column arrays (int64 paise) of numeric submission fields, one row per submission"""
+    def _f(x):
+        try: v = float(x if x is not None else 0.0)
+        except Exception: return 0.0
+        return v if math.isfinite(v) else 0.0
+    rows = [(s.get(nested, {}) or {}) if nested else s for s in submissions]
+    return {f: to_paise([_f(r.get(f)) for r in rows]).reshape(-1) for f in fields}
+
+@traced()
+def recompute_tax_batch(submissions: list, inputs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized recompute_tax_updated() for many submissions at once.
+    inputs: one row per submission (same order) with 'Regime', 'PT' and one column per INVESTMENT_KEYS head.
+    Returns rupee amounts per row; all arithmetic is on int64 paise arrays.
+    """
+    n = len(submissions)
+    totals = _submission_amounts(submissions, ['prorated_total', 'total_epf', 'total_esi'], nested='salary_totals')
+    fields = _submission_amounts(submissions, [
+        'bonus', 'leave_encashment', 'gratuity', 'total_earnings', 'salary_advance',
+        'tada_recovery', 'wfh_recovery', 'notice_period_recovery', 'other_deductions',
+    ])
+    inv = {key: to_paise(pd.to_numeric(inputs[key], errors='coerce').fillna(0.0).to_numpy(dtype=float)).reshape(-1)
+           for key in INVESTMENT_KEYS}
+    pt = to_paise(pd.to_numeric(inputs['PT'], errors='coerce').fillna(0.0).to_numpy(dtype=float)).reshape(-1)
+    is_new = (inputs['Regime'] == "New Tax Regime").to_numpy()
+    fy_start = _fy_start_year_from_session()
+
+    taxable_earnings = totals['prorated_total'] + fields['bonus'] + fields['leave_encashment']
+    std_deduction = np.where(is_new & (fy_start >= 2025), to_paise(75_000.0), to_paise(50_000.0))
+
+    def _sum(keys):
+        return np.sum([inv[k] for k in keys], axis=0) if keys else np.zeros(n, dtype=np.int64)
+
+    # NEW REGIME: only 80CCD(2); OLD REGIME: everything (80C capped at 1.5L)
+    inv_80c = np.where(is_new, 0, np.minimum(_sum(INVESTMENT_80C_KEYS), to_paise(150000.0)))
+    inv_80d = np.where(is_new, 0, _sum(INVESTMENT_80D_KEYS))
+    inv_other = np.where(is_new, inv['nps_80ccd_2'], _sum(INVESTMENT_OTHER_KEYS))
+    exempt_allowances = np.where(is_new, 0, _sum(EXEMPT_ALLOWANCE_KEYS))
+    inv_total_for_tax = inv_80c + inv_80d + inv_other
+
+    taxable_income = np.maximum(0, taxable_earnings - std_deduction - pt - inv_total_for_tax - exempt_allowances)
+    tds_amount = to_paise(np.where(
+        is_new,
+        tds_new_vectorized(from_paise(taxable_income), fy_start),
+        tds_old_vectorized(from_paise(taxable_income)),
+    )).reshape(-1)
+
+    payroll_deductions = (
+        totals['total_epf'] + totals['total_esi'] + fields['salary_advance'] + fields['tada_recovery']
+        + fields['wfh_recovery'] + fields['notice_period_recovery'] + fields['other_deductions']
+    )
+    total_earnings = np.where(
+        fields['total_earnings'] == 0,
+        totals['prorated_total'] + fields['gratuity'] + fields['bonus'] + fields['leave_encashment'],
+        fields['total_earnings'],
+    )
+    total_deductions = payroll_deductions + pt + tds_amount
+
+    return pd.DataFrame({
+        'regime': inputs['Regime'].to_numpy(),
+        'taxable_earnings': from_paise(taxable_earnings),
+        'std_deduction': from_paise(std_deduction),
+        'pt_deduction': from_paise(pt),
+        'inv_80c': from_paise(inv_80c),
+        'inv_80d': from_paise(inv_80d),
+        'inv_other': from_paise(inv_other),
+        'exempt_allowances': from_paise(exempt_allowances),
+        'inv_total_for_tax': from_paise(inv_total_for_tax),
+        'taxable_income': from_paise(taxable_income),
+        'tds_amount': from_paise(tds_amount),
+        'payroll_deductions': from_paise(payroll_deductions),
+        'total_deductions': from_paise(total_deductions),
+        'total_earnings': from_paise(total_earnings),
+        'net_payable': from_paise(total_earnings - total_deductions),
+    }, index=inputs.index)
+
+TAX_REGIMES = ["Old Tax Regime", "New Tax Regime"]
+
+# Submission fields that feed recompute_tax_updated(); a change in any of them
+# invalidates the stored regime comparison
+REGIME_INPUT_FIELDS = [
+    'salary_totals', 'bonus', 'leave_encashment', 'gratuity', 'total_earnings', 'pt_total',
+    'salary_advance', 'tada_recovery', 'wfh_recovery', 'notice_period_recovery', 'other_deductions',
+]
+
+def _regime_inputs_key(submission: dict) -> str:
+    """Stable hash of everything the Old/New comparison depends on"""
+    relevant = {k: submission.get(k) for k in REGIME_INPUT_FIELDS}
+    relevant['breakdown'] = (submission.get('investments_data') or {}).get('breakdown', {})
+    relevant['fy_start'] = _fy_start_year_from_session()
+    raw = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def compute_regime_comparison(submission: dict) -> dict:
+    """
+    Compute Old and New regime results together from the submission's saved inputs.
+    EPF (employee) defaults to the EPF deducted in the settlement months, same as the review form.
+    """
+    breakdown = dict((submission.get('investments_data') or {}).get('breakdown', {}))
+    if breakdown.get('epf_employee') is None:
+        breakdown['epf_employee'] = float(submission.get('salary_totals', {}).get('total_epf', 0.0))
+    inv = {'breakdown': breakdown}
+
+    results = {}
+    for regime in TAX_REGIMES:
+        r = recompute_tax_updated(submission, inv, regime)
+        results[regime] = {
+            'std_deduction': r['std_deduction'],
+            'inv_total_for_tax': r['inv_total_for_tax'],
+            'exempt_allowances': r['exempt_allowances'],
+            'taxable_income': r['taxable_income'],
+            'tds_amount': r['tds_amount'],
+            'total_deductions': r['total_deductions'],
+            'net_payable': r['net_payable'],
+        }
+
+    old_tds = results["Old Tax Regime"]['tds_amount']
+    new_tds = results["New Tax Regime"]['tds_amount']
+    if old_tds < new_tds:
+        recommended = "Old Tax Regime"
+    elif new_tds < old_tds:
+        recommended = "New Tax Regime"
+    else:
+        recommended = None  # both regimes cost the same
+
+    return {
+        'inputs_key': _regime_inputs_key(submission),
+        'computed_at': datetime.now().strftime('%d/%m/%Y %H:%M'),
+        'recommended': recommended,
+        'tds_saving': round(abs(old_tds - new_tds), 2),
+        'results': results,
+    }
+
+def ensure_regime_comparison(submission: dict) -> bool:
+    """Refresh submission['regime_comparison'] if its inputs changed. Returns True if recomputed."""
+    cached = submission.get('regime_comparison') or {}
+    count("cache.regime_comparison.calls")
+    if cached.get('inputs_key') == _regime_inputs_key(submission):
+        return False
+    count("cache.regime_comparison.misses")
+    submission['regime_comparison'] = compute_regime_comparison(submission)
+    return True
@@ -0,0 +1,570 @@
+"""Tax Team dashboard: review queue, per-submission review panel and bulk grid editor."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+from .ui import (
+    create_status_badge, metric, pagination_controls, render_metric_grid, rerun_fragment,
+    st_fragment,
+)
+from .calc import from_paise, to_paise
+from .tax import (
+    INVESTMENT_KEYS, TAX_REGIMES, ensure_regime_comparison, recompute_tax_batch,
+    recompute_tax_updated,
+)
+from .storage import save_fnf_data
+
+def render_regime_comparison(comparison: dict):
+    """Side-by-side Old vs New regime table with the cheaper regime highlighted"""
+    results = comparison.get('results', {})
+    if not results:
+        return
+
+    rows = [
+        ('Standard Deduction', 'std_deduction'),
+        ('Investment Deductions', 'inv_total_for_tax'),
+        ('Exempt Allowances', 'exempt_allowances'),
+        ('Taxable Income', 'taxable_income'),
+        ('TDS', 'tds_amount'),
+        ('Total Deductions', 'total_deductions'),
+        ('Net Payable', 'net_payable'),
+    ]
+    comparison_df = pd.DataFrame(
+        {regime: [results[regime][key] for _, key in rows] for regime in TAX_REGIMES},
+        index=[label for label, _ in rows],
+    )
+
+    recommended = comparison.get('recommended')
+    styled = comparison_df.style.format("₹{:,.2f}")
+    if recommended:
+        styled = styled.set_properties(
+            subset=[recommended], **{'background-color': '#d4f5e9', 'font-weight': 'bold'}
+        )
+    st.dataframe(styled, use_container_width=True)
+
+    if recommended:
+        st.markdown(f"""
+        <div class="success-card">
+            ✅ <strong>{recommended}</strong> is cheaper — saves ₹{comparison.get('tds_saving', 0):,.2f} in TDS
+            <br><small>Computed {comparison.get('computed_at', '')} from saved inputs</small>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="info-card">
+            ℹ️ Both regimes result in the same TDS
+        </div>
+        """, unsafe_allow_html=True)
+
+TAX_REVIEW_STATUSES = ['Under Tax Review', 'Pending Tax Review', 'Tax Approved', 'Tax Rejected']
+PENDING_TAX_STATUSES = ['Under Tax Review', 'Pending Tax Review']
+
+def _parse_ddmmyyyy(value):
+    try:
+        return datetime.strptime(str(value), '%d/%m/%Y').date()
+    except Exception:
+        return None
+
+def filter_tax_review_queue(review_submissions: list) -> list:
+    """Status / location / last-working-day filters for the tax review queue"""
+    locations = sorted({str(s.get('base_location', '')) for s in review_submissions if s.get('base_location')})
+    lwd_dates = [d for d in (_parse_ddmmyyyy(s.get('last_working_day')) for s in review_submissions) if d]
+
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        status_filter = st.multiselect("Status", TAX_REVIEW_STATUSES, default=PENDING_TAX_STATUSES, key="tax_q_status")
+    with f2:
+        location_filter = st.multiselect("Location", locations, key="tax_q_location", placeholder="All locations")
+    with f3:
+        date_range = st.date_input(
+            "Last working day between",
+            value=(min(lwd_dates), max(lwd_dates)),
+            key="tax_q_dates",
+        ) if lwd_dates else None
+
+    date_from = date_to = None
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        date_from, date_to = date_range
+
+    queue = []
+    for s in review_submissions:
+        if status_filter and s['status'] not in status_filter:
+            continue
+        if location_filter and str(s.get('base_location', '')) not in location_filter:
+            continue
+        lwd = _parse_ddmmyyyy(s.get('last_working_day'))
+        if date_from and lwd and not (date_from <= lwd <= date_to):
+            continue
+        queue.append(s)
+    return queue
+
+def tax_review_grid_frame(submissions: list) -> pd.DataFrame:
+    """Editable grid rows for the bulk editor: one row per submission, one column per investment head"""
+    rows = []
+    for s in submissions:
+        br = (s.get('investments_data') or {}).get('breakdown', {}) or {}
+        row = {
+            'Select': False,
+            'Employee': s['employee_name'],
+            'Regime': "Old Tax Regime" if s.get('tax_regime') == "Old Tax Regime" else "New Tax Regime",
+            'PT': round(float(s.get('pt_total', 0.0) or 0.0), 2),
+        }
+        for key in INVESTMENT_KEYS:
+            row[key] = round(float(br.get(key, 0.0) or 0.0), 2)
+        if br.get('epf_employee') is None:
+            row['epf_employee'] = round(float(s.get('salary_totals', {}).get('total_epf', 0.0)), 2)
+        row['Comments'] = s.get('tax_comments', '')
+        rows.append(row)
+    return pd.DataFrame(rows, index=pd.Index([s['employee_id'] for s in submissions], name='Employee ID'))
+
+def clean_tax_review_grid(grid: pd.DataFrame) -> pd.DataFrame:
+    """Grid with cleared (NaN) or non-numeric amount cells as 0.0, as recompute_tax_batch reads them"""
+    money = ['PT', *INVESTMENT_KEYS]
+    return grid.assign(**{c: pd.to_numeric(grid[c], errors='coerce').fillna(0.0) for c in money})
+
+def apply_bulk_tax_review(submissions: list, grid: pd.DataFrame, results: pd.DataFrame, decision: str) -> list:
+    """Write grid inputs and recomputed tax back to the selected submissions; returns the updated ones"""
+    grid = clean_tax_review_grid(grid)
+    selected = grid.index[grid['Select'].fillna(False).astype(bool)]
+    by_id = {s['employee_id']: s for s in submissions}
+    reviewer = st.session_state.get('username', 'Tax Team')
+    reviewed_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+    for sid in selected:
+        submission, row, r = by_id[sid], grid.loc[sid], results.loc[sid]
+        regime = row['Regime']
+        if regime == "New Tax Regime":
+            breakdown = {key: 0.0 for key in INVESTMENT_KEYS}
+            breakdown['nps_80ccd_2'] = round(float(row['nps_80ccd_2']), 2)
+        else:
+            breakdown = {key: round(float(row[key]), 2) for key in INVESTMENT_KEYS}
+
+        submission['tax_regime'] = regime
+        submission['pt_total'] = round(float(row['PT']), 2)
+        submission['investments_data'] = {
+            '80c_total': float(r['inv_80c']),
+            '80d_total': float(r['inv_80d']),
+            'other_deductions': float(r['inv_other']),
+            'exempt_allowances': float(r['exempt_allowances']),
+            'total_deductions': float(r['inv_total_for_tax']),
+            'breakdown': breakdown,
+        }
+        # Grid has no manual TDS override; previously added tax deductions are carried over
+        addl_paise = to_paise(submission.get('additional_deductions', 0.0))
+        deductions_paise = to_paise(r['total_deductions']) + addl_paise
+        submission['taxable_income'] = float(r['taxable_income'])
+        submission['tds_amount'] = float(r['tds_amount'])
+        submission['total_deductions'] = from_paise(deductions_paise)
+        submission['net_payable'] = from_paise(to_paise(r['total_earnings']) - deductions_paise)
+
+        submission['tax_comments'] = row['Comments'] or ''
+        submission['tax_reviewed_by'] = reviewer
+        submission['tax_review_date'] = reviewed_at
+        submission['status'] = 'Tax Approved' if decision == "Approve" else 'Tax Rejected'
+        submission['tax_calculated'] = True
+        ensure_regime_comparison(submission)
+    return [by_id[sid] for sid in selected]
+
+def bulk_tax_review_editor(submissions: list):
+    """
+    Spreadsheet-style review of many pending submissions at once.
+    Every edit recomputes tax for all rows in one vectorized pass; approve / send back apply to the
+    selected rows and are saved together.
+    """
+    if not submissions:
+        st.info("No pending submissions match the selected filters.")
+        return
+
+    st.markdown("""
+    <div class="info-card">
+        🧮 <strong>Bulk Review:</strong> edit regime, PT and deductions inline, tick <em>Select</em> on the rows
+        to decide, then approve or send them back together. Under the New regime only NPS 80CCD(2) is applied.
+    </div>
+    """, unsafe_allow_html=True)
+
+    money = {'PT': st.column_config.NumberColumn("PT", min_value=0.0, step=100.0, format="%.2f")}
+    for key in INVESTMENT_KEYS:
+        money[key] = st.column_config.NumberColumn(key.replace('_', ' ').title(), min_value=0.0, step=100.0, format="%.2f")
+    grid = st.data_editor(
+        tax_review_grid_frame(submissions),
+        key="tax_bulk_grid",
+        use_container_width=True,
+        disabled=['Employee'],
+        column_config={
+            'Select': st.column_config.CheckboxColumn("Select", default=False),
+            'Regime': st.column_config.SelectboxColumn("Regime", options=TAX_REGIMES, required=True),
+            'Comments': st.column_config.TextColumn("Comments"),
+            **money,
+        },
+    )
+    grid = clean_tax_review_grid(grid)
+
+    results = recompute_tax_batch(submissions, grid)
+    old_tds = recompute_tax_batch(submissions, grid.assign(Regime="Old Tax Regime"))['tds_amount']
+    new_tds = recompute_tax_batch(submissions, grid.assign(Regime="New Tax Regime"))['tds_amount']
+
+    st.markdown("### 🧾 Recomputed Tax")
+    summary = pd.DataFrame({
+        'Employee': grid['Employee'],
+        'Regime': results['regime'],
+        'Taxable Income': results['taxable_income'],
+        'TDS': results['tds_amount'],
+        'Net Payable': results['net_payable'],
+        'Cheaper Regime': np.where(old_tds < new_tds, "Old Tax Regime",
+                                   np.where(new_tds < old_tds, "New Tax Regime", "Same")),
+    })
+    st.dataframe(summary.style.format({'Taxable Income': "₹{:,.2f}", 'TDS': "₹{:,.2f}", 'Net Payable': "₹{:,.2f}"}),
+                 use_container_width=True)
+
+    n_selected = int(grid['Select'].fillna(False).astype(bool).sum())
+    st.caption(f"{n_selected} of {len(grid)} row(s) selected")
+    b1, b2 = st.columns(2)
+    with b1:
+        approve = st.button("✅ Approve selected", key="tax_bulk_approve", use_container_width=True, disabled=n_selected == 0)
+    with b2:
+        send_back = st.button("↩️ Send back selected", key="tax_bulk_send_back", use_container_width=True, disabled=n_selected == 0)
+
+    if approve or send_back:
+        updated = apply_bulk_tax_review(submissions, grid, results, "Approve" if approve else "Send Back")
+        save_fnf_data(*updated)
+        st.session_state.pop('tax_bulk_grid', None)
+        st.success(f"✅ {len(updated)} submission(s) {'approved' if approve else 'sent back to Payroll'}.")
+        st.rerun()
+
+def tax_review_dashboard_updated():
+    """Updated Tax Review Dashboard with regime-specific deduction inputs and proper tax calculations"""
+    st.markdown("""
+    <div class="main-header">
+        <h1>🔍 Tax Review Dashboard</h1>
+        <p>Review and approve F&F settlements with comprehensive tax analysis</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if 'fnf_submissions' not in st.session_state or not st.session_state.fnf_submissions:
+        st.info("No F&F submissions for review yet.")
+        return
+
+    review_submissions = [
+        s for s in st.session_state.fnf_submissions
+        if s['status'] in TAX_REVIEW_STATUSES
+    ]
+    if not review_submissions:
+        st.info("Nothing pending for tax review.")
+        return
+
+    # Send to Tax and review saves keep regime_comparison current; only submissions stored before
+    # it existed need it filled in, once per load of the store (one save for the batch)
+    if not st.session_state.get('regime_comparisons_backfilled'):
+        refreshed = [
+            s for s in review_submissions
+            if s['status'] in PENDING_TAX_STATUSES and ensure_regime_comparison(s)
+        ]
+        if refreshed:
+            save_fnf_data(*refreshed)
+        st.session_state.regime_comparisons_backfilled = True
+
+    # Queue overview
+    pending = sum(1 for s in review_submissions if s['status'] in PENDING_TAX_STATUSES)
+    render_metric_grid([
+        metric("Pending Review", pending, icon="⏳"),
+        metric("Tax Approved", sum(1 for s in review_submissions if s['status'] == 'Tax Approved'), icon="✅"),
+        metric("Sent Back", sum(1 for s in review_submissions if s['status'] == 'Tax Rejected'), icon="↩️"),
+    ])
+
+    queue = filter_tax_review_queue(review_submissions)
+    mode = st.radio("Review mode", ["📋 Queue", "🧮 Bulk Grid"], horizontal=True, key="tax_review_mode")
+    if mode == "🧮 Bulk Grid":
+        bulk_tax_review_editor([s for s in queue if s['status'] in PENDING_TAX_STATUSES])
+        return
+
+    if not queue:
+        st.info("No submissions match the selected filters.")
+        return
+
+    start, end = pagination_controls(len(queue), key="tax_queue")
+    open_id = st.session_state.get('tax_review_open')
+
+    # Only the opened row builds its review widgets; the rest are one summary line each
+    for submission in queue[start:end]:
+        sid = submission['employee_id']
+        is_open = open_id == sid
+        c1, c2, c3, c4, c5 = st.columns([3, 2, 2, 2, 1])
+        with c1:
+            st.markdown(f"**{submission['employee_name']}** (ID: {sid})<br><small>LWD: {submission.get('last_working_day', '—')}</small>",
+                        unsafe_allow_html=True)
+        with c2:
+            st.markdown(create_status_badge(submission['status']), unsafe_allow_html=True)
+        with c3:
+            st.markdown(f"🌍 {submission.get('base_location', '—')}")
+        with c4:
+            st.markdown(f"💰 ₹{submission.get('net_before_tax', 0):,.2f}")
+        with c5:
+            if st.button("Close" if is_open else "Open", key=f"tax_open_{sid}", use_container_width=True):
+                st.session_state['tax_review_open'] = None if is_open else sid
+                st.rerun()
+        if is_open:
+            with st.container():
+                render_tax_review_panel(submission)
+        st.markdown("---")
+
+@st_fragment
+def render_tax_review_panel(submission: dict):
+    """
+    Review panel for one submission: regime comparison, deduction inputs, live preview and decision.
+    Runs as a fragment: editing inputs reruns only this panel; a status change reruns the whole app.
+    """
+    sid = submission['employee_id']
+    def k(base): return f"{base}_{sid}"
+
+    # Header metrics
+    render_metric_grid([
+        metric("Net Before Tax", f"₹{submission.get('net_before_tax', 0):,.2f}", icon="💰"),
+        metric("Current TDS", f"₹{submission.get('tds_amount', 0):,.2f}", icon="🏛️"),
+        metric("Final Net Payable", f"₹{submission.get('net_payable', 0):,.2f}", icon="💼"),
+    ])
+
+    inv_saved = submission.get('investments_data', {}) or {}
+    breakdown_saved = inv_saved.get('breakdown', {})
+
+    if submission.get('regime_comparison'):
+        st.markdown("### ⚖️ Old vs New Regime Comparison")
+        render_regime_comparison(submission['regime_comparison'])
+
+    st.markdown("### 🏛️ Tax Regime Selection & Investment Deductions")
+    # Regime selection
+    new_tax_regime = st.selectbox(
+        "Tax Regime",
+        ["Old Tax Regime", "New Tax Regime"],
+        index=0 if submission.get('tax_regime') == "Old Tax Regime" else 1,
+        key=k("regime")
+    )
+    
+    # Show regime-specific information
+    if new_tax_regime == "New Tax Regime":
+        st.markdown("""
+        <div class="warning-card">
+            ⚠️ <strong>New Tax Regime Restrictions:</strong><br>
+            • Only 80CCD(2) deduction allowed<br>
+            • No EPF employee contribution deduction<br>
+            • No other investment deductions<br>
+            • No exempt allowances
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="success-card">
+            ✅ <strong>Old Tax Regime:</strong><br>
+            • All investment deductions available<br>
+            • EPF employee contribution deductible<br>
+            • Exempt allowances applicable
+        </div>
+        """, unsafe_allow_html=True)
+
+    # 🔥 Initialize all variables first to avoid UnboundLocalError
+    # Initialize all variables with default values
+    ppf = elss = life = fd5 = nsc = suk = tuition = 0.0
+    hi_self = hi_par = sec_dd = sec_ddb = 0.0
+    hli = eli = nps1b = 0.0
+    conv = helper = lta = tel = ld = hra_ex = 0.0
+    epf_employee = 0.0
+    nps2 = 0.0
+
+    # Regime-specific input sections
+    if new_tax_regime == "New Tax Regime":
+        # NEW REGIME: Only 80CCD(2)
+        st.markdown("#### 🏦 Available Deductions (New Tax Regime)")
+        nps2 = st.number_input(
+            "🏢 NPS 80CCD(2) Employer Contribution", 
+            0.0, step=1000.0, 
+            value=round(float(breakdown_saved.get('nps_80ccd_2', 0.0)), 2), 
+            key=k("nps2")
+        )
+        
+        # Create investment dict for NEW regime (only NPS 80CCD(2))
+        inv_dict = {
+            'breakdown': {
+                'nps_80ccd_2': round(nps2, 2),
+                # All other fields set to 0
+                'ppf': 0.0, 'epf_employee': 0.0, 'elss': 0.0, 'life_insurance': 0.0,
+                'fd_5year': 0.0, 'nsc': 0.0, 'suknya_samriddhi': 0.0, 'tuition_fees': 0.0,
+                'health_insurance_self': 0.0, 'health_insurance_parents': 0.0,
+                'section_80dd': 0.0, 'section_80ddb': 0.0,
+                'home_loan_interest': 0.0, 'education_loan_interest': 0.0, 'nps_80ccd_1b': 0.0,
+                'conveyance_allowance': 0.0, 'helper_allowance': 0.0, 'lta': 0.0,
+                'tel_broadband': 0.0, 'ld_allowance': 0.0, 'hra_exemption': 0.0
+            }
+        }
+        
+    else:
+        # OLD REGIME: All deductions
+        st.markdown("#### 📊 Section 80C (Max ₹1,50,000)")
+        c80c1, c80c2 = st.columns(2)
+        with c80c1:
+            ppf = st.number_input("💰 PPF", 0.0, step=1000.0, value=round(float(breakdown_saved.get('ppf', 0.0)), 2), key=k("ppf"))
+            epf_default = breakdown_saved.get('epf_employee')
+            if epf_default is None:
+                epf_default = float(submission.get('salary_totals', {}).get('total_epf', 0.0))
+            epf_employee = st.number_input("🏦 EPF (Employee)", 0.0, step=100.0, value=round(float(epf_default), 2), key=k("epfemp"))
+            elss = st.number_input("📈 ELSS", 0.0, step=1000.0, value=round(float(breakdown_saved.get('elss', 0.0)), 2), key=k("elss"))
+            life = st.number_input("🛡️ Life Insurance", 0.0, step=500.0, value=round(float(breakdown_saved.get('life_insurance', 0.0)), 2), key=k("life"))
+        with c80c2:
+            fd5 = st.number_input("🏛️ 5-Year FD", 0.0, step=1000.0, value=round(float(breakdown_saved.get('fd_5year', 0.0)), 2), key=k("fd5"))
+            nsc = st.number_input("📜 NSC", 0.0, step=1000.0, value=round(float(breakdown_saved.get('nsc', 0.0)), 2), key=k("nsc"))
+            suk = st.number_input("👧 Sukanya Samriddhi", 0.0, step=1000.0, value=round(float(breakdown_saved.get('suknya_samriddhi', 0.0)), 2), key=k("suk"))
+            tuition = st.number_input("🎓 Tuition Fees", 0.0, step=1000.0, value=round(float(breakdown_saved.get('tuition_fees', 0.0)), 2), key=k("tuition"))
+
+        # 80D & Others
+        st.markdown("#### 🏥 Health & Other Deductions")
+        d1, d2 = st.columns(2)
+        with d1:
+            hi_self = st.number_input("👨‍👩‍👧 Self & Family (80D)", 0.0, step=1000.0, value=round(float(breakdown_saved.get('health_insurance_self', 0.0)), 2), key=k("hi_self"))
+            hi_par = st.number_input("👴👵 Parents (80D)", 0.0, step=1000.0, value=round(float(breakdown_saved.get('health_insurance_parents', 0.0)), 2), key=k("hi_par"))
+            sec_dd = st.number_input("♿ 80DD", 0.0, step=1000.0, value=round(float(breakdown_saved.get('section_80dd', 0.0)), 2), key=k("80dd"))
+            sec_ddb = st.number_input("🏥 80DDB", 0.0, step=1000.0, value=round(float(breakdown_saved.get('section_80ddb', 0.0)), 2), key=k("80ddb"))
+        with d2:
+            hli = st.number_input("🏠 Home Loan Interest", 0.0, step=5000.0, value=round(float(breakdown_saved.get('home_loan_interest', 0.0)), 2), key=k("hli"))
+            eli = st.number_input("📚 Education Loan Interest", 0.0, step=2000.0, value=round(float(breakdown_saved.get('education_loan_interest', 0.0)), 2), key=k("eli"))
+            nps1b = st.number_input("🏦 NPS 80CCD(1B)", 0.0, step=1000.0, value=round(float(breakdown_saved.get('nps_80ccd_1b', 0.0)), 2), key=k("nps1b"))
+            nps2 = st.number_input("🏢 NPS 80CCD(2) Employer", 0.0, step=1000.0, value=round(float(breakdown_saved.get('nps_80ccd_2', 0.0)), 2), key=k("nps2"))
+
+        # Exempt allowances
+        st.markdown("#### 🚗 Exempt Allowances (Old Regime Only)")
+        a1, a2 = st.columns(2)
+        with a1:
+            conv = st.number_input("🚗 Conveyance", 0.0, step=1000.0, value=round(float(breakdown_saved.get('conveyance_allowance', 0.0)), 2), key=k("conv"))
+            helper = st.number_input("🏠 Helper", 0.0, step=500.0, value=round(float(breakdown_saved.get('helper_allowance', 0.0)), 2), key=k("helper"))
+            lta = st.number_input("✈️ LTA", 0.0, step=5000.0, value=round(float(breakdown_saved.get('lta', 0.0)), 2), key=k("lta"))
+        with a2:
+            tel = st.number_input("📞 Telephone/Broadband", 0.0, step=500.0, value=round(float(breakdown_saved.get('tel_broadband', 0.0)), 2), key=k("tel"))
+            ld = st.number_input("📚 L&D Allowance", 0.0, step=1000.0, value=round(float(breakdown_saved.get('ld_allowance', 0.0)), 2), key=k("ld"))
+            hra_ex = st.number_input("🏠 HRA Exemption", 0.0, step=2000.0, value=round(float(breakdown_saved.get('hra_exemption', 0.0)), 2), key=k("hraex"))
+
+        # Create investment dict for OLD regime (all deductions)
+        inv_dict = {
+            'breakdown': {
+                'ppf': round(ppf, 2), 'epf_employee': round(epf_employee, 2), 'elss': round(elss, 2), 'life_insurance': round(life, 2),
+                'fd_5year': round(fd5, 2), 'nsc': round(nsc, 2), 'suknya_samriddhi': round(suk, 2), 'tuition_fees': round(tuition, 2),
+                'health_insurance_self': round(hi_self, 2), 'health_insurance_parents': round(hi_par, 2),
+                'section_80dd': round(sec_dd, 2), 'section_80ddb': round(sec_ddb, 2),
+                'home_loan_interest': round(hli, 2), 'education_loan_interest': round(eli, 2),
+                'nps_80ccd_1b': round(nps1b, 2), 'nps_80ccd_2': round(nps2, 2),
+                'conveyance_allowance': round(conv, 2), 'helper_allowance': round(helper, 2), 'lta': round(lta, 2),
+                'tel_broadband': round(tel, 2), 'ld_allowance': round(ld, 2), 'hra_exemption': round(hra_ex, 2)
+            }
+        }
+
+    # PT editable by tax team
+    pt_edit = st.number_input("🏛️ PT (u/s 16(iii))", 0.0, step=100.0,
+                              value=round(float(submission.get('pt_total', 0.0)), 2), key=k("pt"))
+
+    # Live preview with updated calculation
+    sub_preview = dict(submission)
+    sub_preview['pt_total'] = pt_edit
+    preview = recompute_tax_updated(sub_preview, inv_dict, new_tax_regime)
+
+    # Tax calculation breakdown display
+    st.markdown("### 🧮 Live Tax Calculation Preview")
+    
+    # Show detailed tax calculation
+    tax_calc_col1, tax_calc_col2 = st.columns(2)
+    
+    with tax_calc_col1:
+        st.markdown(f"""
+        <div class="calculation-box">
+            <h4>📊 Taxable Income Calculation</h4>
+            <p><strong>Taxable Earnings:</strong> ₹{preview['taxable_earnings']:,.2f}</p>
+            <p><em>(Salary + Bonus + Leave Encashment, excludes Gratuity)</em></p>
+            <p><strong>Less: Standard Deduction:</strong> -₹{preview['std_deduction']:,.2f}</p>
+            <p><strong>Less: PT u/s 16(iii):</strong> -₹{preview['pt_deduction']:,.2f}</p>
+            <p><strong>Less: Investment Deductions:</strong> -₹{preview['inv_total_for_tax']:,.2f}</p>
+            <p><strong>Less: Exempt Allowances:</strong> -₹{preview['exempt_allowances']:,.2f}</p>
+            <hr>
+            <p><strong>Final Taxable Income:</strong> ₹{preview['taxable_income']:,.2f}</p>
+            <p><strong>TDS ({preview['regime']}):</strong> ₹{preview['tds_amount']:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with tax_calc_col2:
+        st.markdown(f"""
+        <div class="calculation-box">
+            <h4>💰 Final Settlement Calculation</h4>
+            <p><strong>Total Earnings:</strong> ₹{preview['total_earnings']:,.2f}</p>
+            <p><strong>Less: Payroll Deductions:</strong> -₹{preview['payroll_deductions']:,.2f}</p>
+            <p><strong>Less: PT:</strong> -₹{preview['pt_deduction']:,.2f}</p>
+            <p><strong>Less: TDS:</strong> -₹{preview['tds_amount']:,.2f}</p>
+            <hr>
+            <p><strong>Net Payable:</strong> ₹{preview['net_payable']:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Summary cards (live)
+    st.markdown("### 📋 Investment & Deduction Summary")
+    render_metric_grid([
+        metric("80C (cap ₹1.5L)", f"₹{preview['inv_80c']:,.2f}", icon="📊"),
+        metric("80D", f"₹{preview['inv_80d']:,.2f}", icon="🏥"),
+        metric("Other Deductions", f"₹{preview['inv_other']:,.2f}", icon="📋"),
+        metric("Exempt Allowances", f"₹{preview['exempt_allowances']:,.2f}", icon="🚗"),
+    ])
+
+    # TDS override & additional tax deductions (live)
+    tds_auto = preview['tds_amount']
+    new_tds = st.number_input("Revised TDS (manual override)", 0.0, step=500.0, value=round(tds_auto, 2), key=k("tds"))
+    addl_tax_ded = st.number_input("Additional Tax Deductions (if any)", 0.0, step=500.0,
+                                   value=round(float(submission.get('additional_deductions', 0.0)), 2), key=k("addtax"))
+
+    revised_deductions_paise = (to_paise(preview['total_deductions']) - to_paise(preview['tds_amount'])
+                                + to_paise(new_tds) + to_paise(addl_tax_ded))
+    revised_total_deductions = from_paise(revised_deductions_paise)
+    revised_net_payable = from_paise(to_paise(preview['total_earnings']) - revised_deductions_paise)
+
+    st.markdown("### 🧮 Final Calculation Summary")
+    delta_tds = new_tds - tds_auto
+    delta_text = f"{delta_tds:+,.2f}" if delta_tds != 0 else "No change"
+    delta_net = revised_net_payable - preview['net_payable']
+    delta_net_text = f"{delta_net:+,.2f}" if delta_net != 0 else "No change"
+    render_metric_grid([
+        metric("Taxable Income", f"₹{preview['taxable_income']:,.2f}", icon="🧾"),
+        metric("TDS (Final)", f"₹{new_tds:,.2f}", delta=delta_text, icon="🏛️"),
+        metric("Total Deductions", f"₹{revised_total_deductions:,.2f}", icon="📉"),
+        metric("Net Payable", f"₹{revised_net_payable:,.2f}", delta=delta_net_text, icon="💼"),
+    ])
+
+    # --- Submit section: a form with an actual submit button ---
+    with st.form(k("submit_form"), clear_on_submit=False):
+        decision = st.selectbox("Decision", ["Approve", "Send Back for Revision"], key=k("decision"))
+        comments = st.text_area("Comments", value=submission.get('tax_comments', ''), key=k("comments"))
+        submit_btn = st.form_submit_button("📋 Submit Tax Review", use_container_width=True)
+
+    if submit_btn:
+        previous_status = submission['status']
+        # Persist current widget values with proper rounding
+        submission['tax_regime'] = new_tax_regime
+        submission['pt_total'] = round(pt_edit, 2)
+
+        inv_save = dict(preview['investments_data'])
+        inv_save['breakdown'] = inv_dict['breakdown']
+        submission['investments_data'] = inv_save
+
+        submission['taxable_income'] = round(preview['taxable_income'], 2)
+        submission['tds_amount'] = round(new_tds, 2)
+        submission['additional_deductions'] = round(addl_tax_ded, 2)
+        submission['total_deductions'] = revised_total_deductions
+        submission['net_payable'] = revised_net_payable
+
+        submission['tax_comments'] = comments
+        submission['tax_reviewed_by'] = st.session_state.get('username', 'Tax Team')
+        submission['tax_review_date'] = datetime.now().strftime('%d/%m/%Y %H:%M')
+        submission['status'] = 'Tax Approved' if decision == "Approve" else 'Tax Rejected'
+        submission['tax_calculated'] = True
+        ensure_regime_comparison(submission)
+
+        save_fnf_data(submission)
+        if decision == "Approve":
+            st.success("✅ Tax calculation completed and approved!")
+            st.balloons()
+        else:
+            st.error("❌ Sent back to Payroll for revision.")
+        if submission['status'] != previous_status:
+            st.session_state.pop('tax_review_open', None)
+            st.rerun()  # queue, counts and sidebar stats change
+        rerun_fragment()
@@ -0,0 +1,126 @@
+"""
+Per-rerun timing of hot functions. dashboard.main() runs each rerun inside trace_rerun(); functions
+decorated with @traced (and span() blocks) called during it are recorded as a tree of spans with
+wall time, and per-function call counts/totals; span times also feed the latency percentiles in
+monitoring. Finished reruns go to a ring buffer per session and can be exported as Chrome
+trace-event JSON (chrome://tracing, Perfetto).
+
+Off unless FNF_TRACE=1 or set_tracing_enabled(True): then a traced call costs one context-variable
+lookup. Standard library only (auth.load_users is traced on the login path).
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from .monitoring import record_latency
+
+TRACE_RERUNS = 20            # reruns kept per session
+TRACE_MAX_SPANS = 5000       # spans kept in one rerun's tree; later calls still count in 'calls'
+
+_enabled = os.environ.get("FNF_TRACE", "").lower() in ("1", "true", "yes")
+_current = contextvars.ContextVar('fnf_trace_rerun', default=None)   # rerun traced on this script thread
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+def set_tracing_enabled(enabled: bool):
+    """Switch tracing for the whole server process (takes effect from the next rerun)"""
+    global _enabled
+    _enabled = bool(enabled)
+
+def new_trace_buffer() -> deque:
+    return deque(maxlen=TRACE_RERUNS)
+
+def _open(rerun, name):
+    span = {'name': name, 'start': time.perf_counter_ns(), 'dur': 0, 'children': []}
+    if rerun['spans'] < TRACE_MAX_SPANS:
+        rerun['stack'][-1]['children'].append(span)
+        rerun['spans'] += 1
+    rerun['stack'].append(span)
+    return span
+
+def _close(rerun, span):
+    span['dur'] = time.perf_counter_ns() - span['start']
+    rerun['stack'].pop()
+    calls = rerun['calls'].setdefault(span['name'], [0, 0])
+    calls[0] += 1
+    calls[1] += span['dur']
+    record_latency(span['name'], span['dur'] / 1e6)
+
+def traced(name: str = None):
+    """Decorator: record each call as a span of the current rerun (no-op outside a traced rerun)"""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rerun = _current.get()
+            if rerun is None:
+                return fn(*args, **kwargs)
+            span = _open(rerun, label)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _close(rerun, span)
+        return wrapper
+    return decorate
+
+@contextlib.contextmanager
+def span(name: str):
+    """Record a block as a span of the current rerun"""
+    rerun = _current.get()
+    if rerun is None:
+        yield
+        return
+    s = _open(rerun, name)
+    try:
+        yield
+    finally:
+        _close(rerun, s)
+
+@contextlib.contextmanager
+def trace_rerun(buffer: deque, name: str = "rerun"):
+    """Trace one script run into buffer (st.rerun()/st.stop() exceptions still record it)"""
+    if not _enabled or _current.get() is not None:
+        yield
+        return
+    root = {'name': name, 'start': time.perf_counter_ns(), 'dur': 0, 'children': []}
+    rerun = {'stack': [root], 'spans': 0, 'calls': {}}
+    token = _current.set(rerun)
+    started_at = time.time()
+    try:
+        yield
+    finally:
+        root['dur'] = time.perf_counter_ns() - root['start']
+        _current.reset(token)
+        record_latency(name, root['dur'] / 1e6)
+        buffer.append({
+            'started_at': started_at,
+            'thread': threading.get_ident(),
+            'root': root,
+            'calls': rerun['calls'],
+            'spans': rerun['spans'],
+        })
+
+def chrome_trace(reruns) -> dict:
+    """Trace-event JSON object ('X' complete events, microseconds) for the given reruns"""
+    events = []
+    for n, rerun in enumerate(reruns, 1):
+        stack = [(rerun['root'], 0)]
+        while stack:
+            s, depth = stack.pop()
+            events.append({
+                'name': s['name'], 'cat': 'rerun' if depth == 0 else 'fnf', 'ph': 'X',
+                'ts': s['start'] / 1000, 'dur': s['dur'] / 1000,
+                'pid': os.getpid(), 'tid': rerun['thread'], 'args': {'rerun': n},
+            })
+            stack.extend((child, depth + 1) for child in s['children'])
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+def chrome_trace_json(reruns) -> str:
+    return json.dumps(chrome_trace(reruns))
@@ -0,0 +1,324 @@
+"""Shared UI pieces: CSS, metric cards, status badges, pagination and fragment helpers."""
+import streamlit as st
+import functools
+
+from .assets import style_tag
+
+# Enhanced CSS Styling
+# Cards, buttons and inputs (the login page uses these too)
+BASE_CSS = """
+    .info-card {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        margin: 1rem 0;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    .success-card {
+        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        margin: 1rem 0;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    .warning-card {
+        background: linear-gradient(135deg, #fa709a 0%, #fee140 100%);
+        color: #2d3436;
+        padding: 1.5rem;
+        border-radius: 15px;
+        margin: 1rem 0;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    .employee-card {
+        background: white;
+        border: 1px solid #e9ecef;
+        border-radius: 15px;
+        padding: 2rem;
+        margin: 1rem 0;
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+        border-left: 5px solid #667eea;
+    }
+    
+    .login-container {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 3rem;
+        border-radius: 20px;
+        color: white;
+        text-align: center;
+        box-shadow: 0 10px 20px rgba(0, 0, 0, 0.2);
+    }
+    
+    .feature-highlight {
+        background: rgba(255, 255, 255, 0.1);
+        border-radius: 10px;
+        padding: 1rem;
+        margin: 0.5rem 0;
+        backdrop-filter: blur(10px);
+    }
+    
+    /* Button Styling */
+    .stButton > button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        border-radius: 10px;
+        padding: 0.75rem 1.5rem;
+        font-weight: bold;
+        transition: all 0.3s;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+    }
+    
+    /* Form Styling */
+    .stTextInput > div > div > input {
+        border-radius: 10px;
+        border: 2px solid #e9ecef;
+        transition: border-color 0.3s;
+    }
+    
+    .stTextInput > div > div > input:focus {
+        border-color: #667eea;
+        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
+    }
+    
+    .stSelectbox > div > div > select {
+        border-radius: 10px;
+        border: 2px solid #e9ecef;
+    }
+    
+    .stNumberInput > div > div > input {
+        border-radius: 10px;
+        border: 2px solid #e9ecef;
+    }
+"""
+
+# Headers, metrics, badges and sidebar styles for the signed-in dashboards
+DASHBOARD_CSS = """
+    /* Main App Styling */
+    .main-header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 2rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        text-align: center;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    .metric-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+        border-left: 4px solid #667eea;
+        margin: 1rem 0;
+        transition: transform 0.2s;
+    }
+    
+    .metric-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
+    }
+    
+    .status-badge {
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        font-weight: bold;
+        font-size: 0.9rem;
+        display: inline-block;
+        margin: 0.2rem;
+    }
+    
+    .status-draft { background-color: #ffeaa7; color: #2d3436; }
+    .status-review { background-color: #fab1a0; color: #2d3436; }
+    .status-approved { background-color: #00b894; color: white; }
+    .status-rejected { background-color: #e17055; color: white; }
+    .status-processed { background-color: #0984e3; color: white; }
+    
+    .calculation-box {
+        background: #f8f9fa;
+        border: 1px solid #e9ecef;
+        border-radius: 10px;
+        padding: 1.5rem;
+        margin: 1rem 0;
+        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
+    }
+    
+    .sidebar-metric {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+        text-align: center;
+    }
+    
+    .data-table {
+        border-radius: 10px;
+        overflow: hidden;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    /* Sidebar Styling */
+    .sidebar-content {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 1rem 0;
+    }
+    
+    /* Progress Bar Styling */
+    .progress-bar {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        height: 10px;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    
+    /* Animation */
+    @keyframes fadeIn {
+        from { opacity: 0; transform: translateY(20px); }
+        to { opacity: 1; transform: translateY(0); }
+    }
+    
+    .fade-in {
+        animation: fadeIn 0.5s ease-in;
+    }
+    
+    /* Enhanced Metrics */
+    .enhanced-metric {
+        background: white;
+        border-radius: 15px;
+        padding: 1.5rem;
+        text-align: center;
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+        border-left: 5px solid #667eea;
+        margin: 1rem 0;
+        transition: transform 0.2s;
+    }
+    
+    .enhanced-metric:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 8px 16px rgba(0, 0, 0, 0.15);
+    }
+    
+    .metric-value {
+        font-size: 2rem;
+        font-weight: bold;
+        color: #667eea;
+        margin: 0.5rem 0;
+    }
+    
+    .metric-label {
+        font-size: 1rem;
+        color: #6c757d;
+        font-weight: 500;
+    }
+    
+    .metric-grid {
+        display: grid;
+        gap: 0 1rem;
+    }
+    
+    .sidebar-metric-grid {
+        display: grid;
+        grid-template-columns: repeat(2, minmax(0, 1fr));
+        gap: 0 0.5rem;
+    }
+    
+"""
+
+def load_custom_css(dashboard: bool = True):
+    """Inject the app CSS; the login page skips the dashboard-only rules"""
+    st.markdown(style_tag(BASE_CSS, DASHBOARD_CSS) if dashboard else style_tag(BASE_CSS), unsafe_allow_html=True)
+
+@functools.lru_cache(maxsize=1024)
+def metric_card_html(title, value, delta=None, delta_color="normal", icon="📊") -> str:
+    """HTML for one metric card (memoized by its values)"""
+    delta_html = ""
+    if delta is not None:
+        color = "#00b894" if delta_color == "normal" else "#e17055" if delta_color == "inverse" else "#636e72"
+        delta_html = f'<div style="color: {color}; font-size: 0.9rem; margin-top: 0.5rem;">{delta}</div>'
+    
+    return f"""
+    <div class="enhanced-metric">
+        <div style="font-size: 1.5rem;">{icon}</div>
+        <div class="metric-value">{value}</div>
+        <div class="metric-label">{title}</div>
+        {delta_html}
+    </div>
+    """
+
+def create_enhanced_metric_card(title, value, delta=None, delta_color="normal", icon="📊"):
+    """Create an enhanced metric card with custom styling"""
+    st.markdown(metric_card_html(title, value, delta, delta_color, icon), unsafe_allow_html=True)
+
+def metric(title, value, delta=None, delta_color="normal", icon="📊") -> tuple:
+    """One card for render_metric_grid() (same arguments as create_enhanced_metric_card)"""
+    return (title, value, delta, delta_color, icon)
+
+@functools.lru_cache(maxsize=512)
+def _metric_grid_html(cards: tuple, columns: int, header: str, footer: str) -> str:
+    body = "".join('<hr>' if card is None else metric_card_html(*card) for card in cards)
+    return (f'{header}<div class="metric-grid" style="grid-template-columns: repeat({columns}, minmax(0, 1fr));">'
+            f'{body}</div>{footer}')
+
+def render_metric_grid(cards, columns: int = None, header: str = "", footer: str = ""):
+    """
+    A group of metric cards as a single element (one delta instead of one per card and column).
+    cards: metric(...) tuples, None for a divider; columns defaults to one row.
+    The HTML is memoized by the card values, so an unchanged group costs a dict lookup.
+    """
+    cards = tuple(cards)
+    html = _metric_grid_html(cards, columns or max(len(cards), 1), header, footer)
+    st.markdown(html, unsafe_allow_html=True)
+
+def create_status_badge(status):
+    """Create a status badge with appropriate styling"""
+    status_classes = {
+        'Draft': 'status-draft',
+        'Under Tax Review': 'status-review',
+        'Pending Tax Review': 'status-review',
+        'Tax Approved': 'status-approved',
+        'Tax Rejected': 'status-rejected',
+        'Payment Processed': 'status-processed'
+    }
+    
+    class_name = status_classes.get(status, 'status-draft')
+    return f'<span class="status-badge {class_name}">{status}</span>'
+
+# st.fragment (Streamlit >= 1.37) reruns only the decorated function on widget changes;
+# older versions fall back to normal full-app reruns
+st_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda fn: fn)
+
+def rerun_fragment():
+    """Rerun just the current fragment where supported, else the whole app"""
+    try:
+        st.rerun(scope="fragment")
+    except TypeError:
+        st.rerun()
+
+def pagination_controls(total: int, key: str, page_sizes=(10, 25, 50)):
+    """Rows-per-page and page selectors; returns (start, end) bounds for slicing"""
+    c1, c2, c3 = st.columns([1, 1, 2])
+    with c1:
+        page_size = st.selectbox("Rows per page", list(page_sizes), key=f"{key}_page_size")
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with c2:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start = (int(page) - 1) * page_size
+    end = min(start + page_size, total)
+    with c3:
+        st.caption(f"Showing {start + 1}–{end} of {total} (page {int(page)} of {pages})")
+    return start, end
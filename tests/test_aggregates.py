@@ -0,0 +1,48 @@
+"""Incremental report aggregates against a full rebuild of the same store."""
+import copy
+import random
+
+from fnf.aggregates import build_fnf_aggregates, update_fnf_aggregates
+
+STATUSES = ['Draft', 'Under Tax Review', 'Tax Approved', 'Tax Rejected', 'Payment Processed']
+LOCATIONS = ['Delhi', 'Bangalore', 'Dubai', None]
+REGIMES = ['Old Tax Regime', 'New Tax Regime', None]
+
+def _submission(rng, employee_id):
+    return {
+        'employee_id': employee_id,
+        'status': rng.choice(STATUSES),
+        'base_location': rng.choice(LOCATIONS),
+        'tax_regime': rng.choice(REGIMES),
+        'last_working_day': rng.choice([f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026", 'n/a']),
+        'gratuity': round(rng.uniform(0, 500_000), 2),
+        'leave_encashment': round(rng.uniform(0, 80_000), 2),
+        'salary_totals': {'total_epf': round(rng.uniform(0, 20_000), 2)},
+        'tax_calculated': rng.random() < 0.5,
+        'tds_amount': round(rng.uniform(0, 90_000), 2),
+        'net_payable': round(rng.uniform(-5_000, 900_000), 2),
+        'net_before_tax': round(rng.uniform(0, 950_000), 2),
+    }
+
+def test_incremental_updates_match_rebuild():
+    rng = random.Random(45)
+    store = [_submission(rng, 1000 + i) for i in range(300)]
+    aggregates = build_fnf_aggregates(store)
+    for _ in range(500):
+        s = rng.choice(store)
+        change = rng.choice(['status', 'location', 'regime', 'amounts', 'new'])
+        if change == 'status':
+            s['status'] = rng.choice(STATUSES)
+            s['tax_calculated'] = s['status'] in ('Tax Approved', 'Payment Processed')
+        elif change == 'location':
+            s['base_location'] = rng.choice(LOCATIONS)
+        elif change == 'regime':
+            s['tax_regime'] = rng.choice(REGIMES)
+        elif change == 'amounts':
+            s['net_payable'] = round(rng.uniform(0, 900_000), 2)
+            s['tds_amount'] = round(rng.uniform(0, 90_000), 2)
+        else:
+            s = _submission(rng, 5000 + len(store))
+            store.append(s)
+        update_fnf_aggregates(aggregates, [s])
+    assert aggregates == build_fnf_aggregates(copy.deepcopy(store))
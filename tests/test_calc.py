@@ -0,0 +1,59 @@
+"""Scalar TDS functions against the vectorized ones they mirror."""
+import numpy as np
+import pytest
+
+from fnf import calc
+
+EDGE_OFFSETS = [-1.0, -0.01, -0.005, 0.0, 0.005, 0.01, 1.0]
+
+def _incomes(slabs, rebate_limit):
+    bounds = [lower for lower, _ in slabs] + [rebate_limit, 0.0]
+    edges = [b + d for b in bounds for d in EDGE_OFFSETS]
+    rng = np.random.default_rng(33)
+    return edges + list(rng.uniform(-10_000, 6_000_000, 2000)) + [-5.0, 123_456_789.0]
+
+def test_tds_old_scalar_matches_vectorized():
+    incomes = _incomes(calc.OLD_REGIME_SLABS, calc.OLD_REGIME_REBATE_LIMIT)
+    vector = calc.tds_old_vectorized(incomes)
+    assert [calc.tds_old_from_total_income(x) for x in incomes] == list(vector)
+
+@pytest.mark.parametrize("fy_start", [2024, 2025, 2026])
+def test_tds_new_scalar_matches_vectorized(fy_start):
+    regime_year = 2025 if fy_start >= 2025 else 2024
+    incomes = _incomes(calc.NEW_REGIME_SLABS[regime_year], calc.NEW_REGIME_REBATE_LIMIT[regime_year])
+    vector = calc.tds_new_vectorized(incomes, fy_start)
+    assert [calc.tds_new_from_total_income(x, fy_start) for x in incomes] == list(vector)
+
+def test_paise_matches_to_paise():
+    amounts = [0.0, 0.005, -0.005, 2.675, 267.495, -267.495, 1e-9, 12_345_678.905] + \
+        list(np.random.default_rng(29).uniform(-1e7, 1e7, 5000).round(3))
+    assert [calc.paise(a) for a in amounts] == list(calc.to_paise(amounts))
+
+def test_gratuity_years_vectorized_matches_scalar():
+    rng = np.random.default_rng(45)
+    doj = np.datetime64('1990-01-01') + rng.integers(0, 13_000, 3000).astype('timedelta64[D]')
+    lwd = doj + rng.integers(0, 12_000, 3000).astype('timedelta64[D]')
+    # month-end and leap-day joiners, and exits on or around the 6-month boundary
+    edge_doj = np.array(['2020-01-31', '2020-02-29', '2019-08-31', '2021-03-31', '2018-06-15', '2018-06-15'],
+                        dtype='datetime64[D]')
+    edge_lwd = np.array(['2025-07-31', '2025-08-29', '2025-02-28', '2026-09-30', '2023-12-15', '2023-12-16'],
+                        dtype='datetime64[D]')
+    doj, lwd = np.concatenate([doj, edge_doj]), np.concatenate([lwd, edge_lwd])
+    expected = [calc.years_for_gratuity(d.item(), l.item()) for d, l in zip(doj, lwd)]
+    assert calc.gratuity_years_vectorized(doj, lwd).tolist() == expected
+
+@pytest.mark.parametrize("profile", [
+    None,
+    {'applicable': False},
+    {'fixed_full_month_epf': 10_248},
+    {'applicable': True, 'capped': True, 'rate': 0.12, 'cap_wage': 15_000, 'wages': None},
+    {'applicable': True, 'capped': False, 'rate': 0.12, 'cap_wage': 15_000, 'wages': 22_500},
+])
+def test_epf_prorated_vectorized_matches_scalar(profile):
+    rng = np.random.default_rng(27)
+    basic = rng.uniform(0, 80_000, 500).round(2)
+    working = rng.integers(0, 27, 500)
+    present = np.minimum(rng.integers(0, 27, 500), working)
+    epf, full, ratio = calc.calculate_epf_prorated_vectorized(basic, present, working, profile)
+    scalar = [calc.calculate_epf_prorated(b, int(p), int(w), profile)[:3] for b, p, w in zip(basic, present, working)]
+    assert list(zip(epf.tolist(), full.tolist(), ratio.tolist())) == scalar
@@ -0,0 +1,47 @@
+"""Employee Master import: row validation and the rejects file."""
+import pandas as pd
+
+from fnf.employee_import import REJECT_REASON_COL, import_employee_master, reject_reasons
+
+def _chunk(rows):
+    return pd.DataFrame(rows, columns=['Employee ID', 'Employee Name', 'Salary'])
+
+def test_reject_reasons():
+    chunk = _chunk([
+        ['101', 'Asha Rao', '50,000'],
+        ['', 'No Id', '1000'],
+        ['abc', 'Text Id', '1000'],
+        ['0', 'Zero Id', '1000'],
+        ['-7', 'Negative Id', '1000'],
+        ['12.5', 'Fractional Id', '1000'],
+        ['102', '  ', '1000'],
+        ['103', 'No Salary', ''],
+        ['104', 'Negative Salary', '-1'],
+        ['101', 'Repeated In Chunk', '1000'],
+        ['55', 'Imported Earlier', '1000'],
+    ])
+    assert reject_reasons(chunk, seen_ids={55}).tolist() == [
+        '',
+        "Employee ID missing",
+        "Employee ID is not a number",
+        "Employee ID is not a valid ID",
+        "Employee ID is not a valid ID",
+        "Employee ID is not a valid ID",
+        "Employee Name missing",
+        "Salary missing or not a number",
+        "Salary is negative",
+        "Duplicate Employee ID",
+        "Duplicate Employee ID",
+    ]
+
+def test_rejects_file_has_one_header(tmp_path):
+    rows = [[str(i), f"Employee {i}", '1000'] for i in range(1, 9)] + [['-1', 'Bad', '1000'], ['x', 'Bad', '1000']]
+    source = tmp_path / "master.csv"
+    _chunk(rows).to_csv(source, index=False)
+    rejects = tmp_path / "rejects.csv"
+    summary = import_employee_master(str(source), target=str(tmp_path / "snapshot.csv"),
+                                     rejects_path=str(rejects), chunk_rows=3)
+    assert (summary['imported'], summary['rejected']) == (8, 2)
+    lines = rejects.read_text().splitlines()
+    assert lines[0].endswith(REJECT_REASON_COL) and len(lines) == 3
+    assert len(pd.read_csv(tmp_path / "snapshot.csv")) == 8
@@ -0,0 +1,40 @@
+"""Employee Master search index."""
+import pandas as pd
+
+from fnf import employees
+from fnf.employees import build_employee_search_index, employee_master_version, search_employees
+
+MASTER = pd.DataFrame({
+    'Employee ID': ['1203', '120', '12', '455', '3120', 'n/a'],
+    'Employee Name': ['Priya Sharma', 'Rahul Verma', 'Priyanka Shah', 'Sharmila Priyadarshini', 'Arjun Rao', 'Priya Nair'],
+})
+
+def _names(query, k=None):
+    index = build_employee_search_index("test", MASTER)
+    return MASTER['Employee Name'].iloc[search_employees(index, query, k)].tolist()
+
+def test_id_exact_match_ranks_before_prefix():
+    assert _names("120") == ['Rahul Verma', 'Priya Sharma']
+    assert _names("12")[0] == 'Priyanka Shah'
+
+def test_name_tokens_are_prefix_matched_in_any_order():
+    assert _names("nair priya")[0] == 'Priya Nair'
+    assert set(_names("sharm priya")[:2]) == {'Priya Sharma', 'Sharmila Priyadarshini'}
+    assert set(_names("priy")) >= {'Priya Sharma', 'Priyanka Shah', 'Sharmila Priyadarshini', 'Priya Nair'}
+
+def test_fuzzy_name_and_top_k():
+    assert _names("rahull")[:1] == ['Rahul Verma']
+    assert len(_names("priy", k=2)) == 2
+    assert _names("") == [] and _names("zzzz") == []
+
+def test_master_version_is_not_inherited_by_edited_copies():
+    loaded = employees._claim_master_version(employees._stamp_master_version(MASTER.copy()))
+    version = employee_master_version(loaded)
+    assert employees._MASTER_VERSIONS[id(loaded)] == version
+    assert employee_master_version(loaded.copy()) == version
+    edited = loaded.copy()
+    edited.loc[0, 'Employee Name'] = 'Priya Sharma-Iyer'
+    assert len(edited) == len(loaded) and employee_master_version(edited) != version
+    key = id(loaded)
+    del loaded
+    assert key not in employees._MASTER_VERSIONS
@@ -0,0 +1,34 @@
+"""Incremental BI snapshot export."""
+import os
+
+from fnf.snapshot import export_bi_snapshot
+
+def _store():
+    return [{'employee_id': i, 'employee_name': f"Employee {i}", 'status': status,
+             'last_working_day': f"15/{month:02d}/2026", 'net_payable': 1000.0 * i}
+            for i, (month, status) in enumerate([(m, s) for m in (1, 2, 3) for s in ('Tax Approved', 'Draft')] * 2)]
+
+def _files(out_dir):
+    return {os.path.relpath(os.path.join(root, f), out_dir): os.stat(os.path.join(root, f)).st_mtime_ns
+            for root, _, files in os.walk(out_dir) for f in files if not f.startswith('_manifest')}
+
+def test_export_rewrites_only_changed_partitions(tmp_path):
+    out = str(tmp_path / "bi")
+    store = _store()
+    first = export_bi_snapshot(store, out, fmt='csv')
+    assert (first['rows'], first['written'], first['unchanged'], first['deleted']) == (12, 6, 0, 0)
+    before = _files(out)
+
+    again = export_bi_snapshot(store, out, fmt='csv')
+    assert (again['written'], again['unchanged']) == (0, 6)
+    assert _files(out) == before
+
+    store[0]['net_payable'] = 1.0     # one row changes within its partition
+    store[1]['status'] = 'Tax Approved'   # one row moves: Draft 2026-01 -> Tax Approved 2026-01
+    store[7]['status'] = 'Tax Approved'   # the last Draft 2026-01 row: that partition empties
+    changed = export_bi_snapshot(store, out, fmt='csv')
+    assert (changed['written'], changed['unchanged'], changed['deleted']) == (1, 4, 1)
+    after = _files(out)
+    touched = {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+    assert touched == {os.path.join("exit_month=2026-01", "status=Tax%20Approved", "part.csv"),
+                       os.path.join("exit_month=2026-01", "status=Draft", "part.csv")}
@@ -0,0 +1,29 @@
+"""Batch tax recompute and the bulk review grid with missing or cleared amounts."""
+import math
+
+import numpy as np
+import pandas as pd
+
+from fnf.tax import INVESTMENT_KEYS, recompute_tax_batch
+from fnf.tax_review import clean_tax_review_grid
+
+def _submission(prorated_total, bonus=0.0):
+    return {'employee_id': 'E1', 'bonus': bonus,
+            'salary_totals': {'prorated_total': prorated_total, 'total_epf': 21_600.0, 'total_esi': 0.0}}
+
+def _grid(pt, investment):
+    return pd.DataFrame({'Regime': ["Old Tax Regime"], 'PT': [pt], **{k: [investment] for k in INVESTMENT_KEYS}})
+
+def test_non_finite_submission_amounts_count_as_zero():
+    clean = recompute_tax_batch([_submission(900_000.0)], _grid(2_400.0, 0.0))
+    for bad in (float('nan'), float('inf'), 'n/a', None):
+        result = recompute_tax_batch([_submission(900_000.0, bonus=bad)], _grid(2_400.0, 0.0))
+        assert result.equals(clean)
+
+def test_cleared_grid_cells_save_as_zero():
+    grid = clean_tax_review_grid(_grid(np.nan, np.nan))
+    assert grid['PT'].tolist() == [0.0]
+    assert all(grid[k].tolist() == [0.0] for k in INVESTMENT_KEYS)
+    result = recompute_tax_batch([_submission(900_000.0)], grid)
+    assert all(math.isfinite(v) for v in result.select_dtypes('number').iloc[0])
+    assert result.equals(recompute_tax_batch([_submission(900_000.0)], _grid(np.nan, np.nan)))